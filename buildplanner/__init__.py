@@ -57,6 +57,7 @@ bp = BPBlender.cutter_data
 bp["bp_cutter_state"] = {"CLOSED":True,"RUNNING":False,"HAS_DATA":False}
 bp["progress_step"] = [0,0,0,0,0]
 bp["progress"] = ["","","","",""]
+bp["bp_cutter_previous"] = None
 bp["bp_status_icon"] = ["bp_icon_status_none","bp_icon_status_yellow","bp_icon_status_green","bp_icon_status_red"]
 
 auto_load.init()
@@ -23,6 +23,10 @@
 #------------------------------------------------------------------------------
 
 from .bp_cutter import BPCutter
+from .bp_profile_cutter import BPProfileCutter
+from .bp_streaming_cutter import BPStreamingCutter
+from .bp_cache import BPCache
+from .bp_cancel_token import BPCancelToken
 from .bp_data_classes import *
 from .bp_defs import *
 from .bp_utils import *
@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2023-2024 Magnus Pettersson
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#------------------------------------------------------------------------------
+#
+# File: bp_bounds.py
+# Author: Magnus Pettersson
+#
+# This module provides lower bounds for the one dimensional cutting stock
+# problem, used to prove that a result is optimal and to report how far from
+# optimal a result may be.
+#
+# The bounds are given on the used stock length, the total length of all stock
+# pieces used, which is the demanded length plus the waste. The cut width is
+# handled by adding it to every piece and to every stock piece, as the last
+# piece needs no cut if it reaches the end of the stock.
+#
+#------------------------------------------------------------------------------
+
+import math
+from bisect import bisect_left, bisect_right
+
+
+def continuous_bound(stock: dict, lengths: list, demand: list, cut_width: float) -> float:
+    """
+    Calculate the continuous bound, where stock pieces may be used fractionally.
+    The stock with the most capacity per used length, the shortest, is used first.
+
+    Args:
+        stock (dict): The available amount of each stock length.
+        lengths (list): The demanded lengths.
+        demand (list): The demanded amount of each length.
+        cut_width (float): The width of a cut.
+
+    Returns:
+        float: The bound on the used stock length, or math.inf if the stock is
+            not long enough for the demand.
+    """
+    needed = sum((length + cut_width) * amount for length, amount in zip(lengths, demand))
+    used = 0.0
+    for stock_length in sorted(stock.keys()):
+        if needed <= 0.0:
+            break
+        amount = min(stock[stock_length], needed / (stock_length + cut_width))
+        used += amount * stock_length
+        needed -= amount * (stock_length + cut_width)
+    return used if needed <= 1e-9 * used else math.inf
+
+
+def l2_bound(capacity: float, sizes: list, counts: list) -> int:
+    """
+    Calculate the L2 bound of Martello and Toth on the number of bins of equal
+    capacity needed for the items. For each threshold, the items larger than half
+    the capacity need a bin each, the items that can not share a bin with any item
+    above the threshold need a bin each, and the items from the threshold up to
+    half the capacity need at least the bins their size does not fit in the space
+    left in the bins of the larger items.
+
+    Args:
+        capacity (float): The capacity of a bin.
+        sizes (list): The item sizes, none larger than the capacity.
+        counts (list): The amount of each item size.
+
+    Returns:
+        int: The bound on the number of bins.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    ascending = [sizes[i] for i in order]
+    # Prefix amounts and sizes, prefix[k] is for the k smallest sizes
+    prefix_count = [0]
+    prefix_size = [0.0]
+    for i in order:
+        prefix_count.append(prefix_count[-1] + counts[i])
+        prefix_size.append(prefix_size[-1] + sizes[i] * counts[i])
+    half = bisect_right(ascending, capacity / 2.0)
+    bound = 0
+    for threshold in [0.0] + ascending[:half]:
+        large = bisect_right(ascending, capacity - threshold)
+        small = bisect_left(ascending, threshold)
+        count_j1 = prefix_count[-1] - prefix_count[large]
+        count_j2 = prefix_count[large] - prefix_count[half]
+        size_j2 = prefix_size[large] - prefix_size[half]
+        size_j3 = prefix_size[half] - prefix_size[small]
+        overflow = size_j3 - (count_j2 * capacity - size_j2)
+        bound = max(bound, count_j1 + count_j2 + max(0, math.ceil(overflow / capacity - 1e-9)))
+    return bound
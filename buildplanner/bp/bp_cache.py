@@ -0,0 +1,192 @@
+# SPDX-FileCopyrightText: 2023-2024 Magnus Pettersson
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#------------------------------------------------------------------------------
+#
+# File: bp_cache.py
+# Author: Magnus Pettersson
+#
+# This module provides a persistent cache of cutter results, so that cutting
+# an unchanged problem again, such as when exporting the same plan several
+# times, returns the previous result at once.
+#
+# The results are stored in a SQLite file, keyed by a canonical hash of the
+# problem: the stock, the demand, the cut width, the method, the precision,
+# the units and the settings of the cutter. Every entry is stamped with the
+# engine version, a hash of the source of the engines, so that entries made
+# by other versions of the engines are never returned. The number of entries
+# is bounded, and the least recently used entries are evicted first.
+#
+# The cache only holds the path of the file, and connects for each operation,
+# so that it can be sent to, and used by, the processes of a process pool.
+#
+#------------------------------------------------------------------------------
+
+import hashlib
+import json
+import pickle
+import sqlite3
+from pathlib import Path
+
+from bp.bp_data_classes import BPDataStockPieces, BPDataCutterResult
+from bp.bp_log import BPLog
+
+from bp.bp_type_check import type_check_class
+
+# The modules whose source decides the results of the cutter
+_ENGINE_SOURCES = ("bp_cutter.py", "bp_column_generation.py", "bp_bounds.py", "bp_data_classes")
+
+def engine_version() -> str:
+    """
+    Return the engine version, a hash of the source of the modules producing the
+    results of the cutter.
+    """
+    digest = hashlib.sha256()
+    root = Path(__file__).parent
+    for name in _ENGINE_SOURCES:
+        path = root / name
+        for source in sorted(path.glob("*.py")) if path.is_dir() else [path]:
+            digest.update(source.name.encode())
+            digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+@type_check_class
+class BPCache:
+    """
+    Class for a persistent, size bounded, cache of cutter results.
+    """
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    @property
+    def version(self) -> str:
+        return self.__version
+
+    def __init__(self, path: str, max_entries: int = 256, version: str = "") -> None:
+        """
+        Initializes the BPCache instance, creating the file if it does not exist.
+
+        Args:
+            path (str): The path of the SQLite file.
+            max_entries (int, optional): The maximum number of results kept. Defaults to 256.
+            version (str, optional): The version stamp of the entries. Defaults to "",
+                meaning the engine version.
+        """
+        self.__path = path
+        self.__max_entries = max_entries
+        self.__version = engine_version() if version == "" else version
+        self.__log = BPLog()
+        with self.__connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, version TEXT NOT NULL, used INTEGER NOT NULL, result BLOB NOT NULL)"
+            )
+        connection.close()
+
+    def __connect(self) -> sqlite3.Connection:
+        """Connect to the file, waiting for other processes writing to it."""
+        return sqlite3.connect(self.__path, timeout=10.0)
+
+    @staticmethod
+    def key(
+            stock: BPDataStockPieces,
+            demand: BPDataStockPieces,
+            cut_width: float,
+            method: str,
+            precision: int,
+            length_unit: str,
+            original_length_unit: str,
+            options: dict
+            ) -> str:
+        """
+        Create the canonical key of a problem, independent of the order of the stock
+        and the demand.
+
+        Args:
+            stock (BPDataStockPieces): The available stock pieces.
+            demand (BPDataStockPieces): The demand for stock pieces.
+            cut_width (float): The width of a cut.
+            method (str): The name of the cutting method.
+            precision (int): The precision of the result.
+            length_unit (str): The unit of length of the result.
+            original_length_unit (str): The original unit of length.
+            options (dict): Any other settings deciding the result, with values that
+                can be written as JSON.
+
+        Returns:
+            str: The key.
+        """
+        canonical = json.dumps({
+            "stock": sorted((float(length), count) for length, count in stock.iter_runs()),
+            "demand": sorted((float(length), count) for length, count in demand.iter_runs()),
+            "cut_width": float(cut_width),
+            "method": method,
+            "precision": precision,
+            "length_unit": length_unit,
+            "original_length_unit": original_length_unit,
+            "options": options
+        }, sort_keys=True)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> BPDataCutterResult:
+        """
+        Get the result of a key, and mark it as the most recently used.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            BPDataCutterResult: The result, or None if there is no result of this
+                version for the key.
+        """
+        with self.__connect() as connection:
+            row = connection.execute("SELECT result FROM results WHERE key = ? AND version = ?", (key, self.__version)).fetchone()
+            if row is not None:
+                connection.execute("UPDATE results SET used = (SELECT MAX(used) FROM results) + 1 WHERE key = ?", (key,))
+        connection.close()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0])
+        except (pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+            self.__log.warning("Could not read cached result " + key)
+            return None
+
+    def put(self, key: str, result: BPDataCutterResult) -> None:
+        """
+        Store the result of a key, as the most recently used, evicting entries of
+        other versions and the least recently used entries above the maximum.
+
+        Args:
+            key (str): The key.
+            result (BPDataCutterResult): The result.
+        """
+        with self.__connect() as connection:
+            connection.execute("DELETE FROM results WHERE version != ?", (self.__version,))
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, version, used, result) "
+                "VALUES (?, ?, (SELECT COALESCE(MAX(used), 0) FROM results) + 1, ?)",
+                (key, self.__version, pickle.dumps(result))
+            )
+            connection.execute(
+                "DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY used DESC LIMIT ?)",
+                (self.__max_entries,)
+            )
+        connection.close()
+        return None
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self.__connect() as connection:
+            connection.execute("DELETE FROM results")
+        connection.close()
+        return None
+
+    def __len__(self) -> int:
+        with self.__connect() as connection:
+            count = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        connection.close()
+        return count
@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2023-2024 Magnus Pettersson
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#------------------------------------------------------------------------------
+#
+# File: bp_cancel_token.py
+# Author: Magnus Pettersson
+#
+# This module defines the BPCancelToken class, used to cancel a running cut.
+# The token is given to BPCutter.cut() or BPCutter.cut_iter(), and is checked
+# by the engines in their inner loops. When cancelled, from a UI callback or
+# from another thread, the engine stops and returns the best result so far,
+# with the demand not yet cut as remaining demand.
+#
+# A shared token is backed by a multiprocessing Event, so that it can be given
+# to the worker processes of a pool, when they are started, and cancelled by
+# the parent process.
+#
+#------------------------------------------------------------------------------
+
+import multiprocessing
+
+from bp.bp_type_check import type_check_class
+
+@type_check_class
+class BPCancelToken:
+    """
+    Class for cooperative cancellation of a cut.
+    """
+
+    @property
+    def cancelled(self) -> bool:
+        return self.__cancelled or (self.__event is not None and self.__event.is_set())
+
+    def __init__(self, shared: bool = False) -> None:
+        """
+        Initializes the BPCancelToken instance.
+
+        Args:
+            shared (bool, optional): Whether the token is shared with worker processes.
+                A shared token can only be sent to a process when it is started.
+                Defaults to False.
+        """
+        self.__cancelled = False
+        self.__event = multiprocessing.Event() if shared else None
+
+    def cancel(self) -> None:
+        """Request the cut to stop, as soon as the engine checks the token."""
+        self.__cancelled = True
+        if self.__event is not None:
+            self.__event.set()
+        return None
@@ -0,0 +1,276 @@
+# SPDX-FileCopyrightText: 2023-2024 Magnus Pettersson
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#------------------------------------------------------------------------------
+#
+# File: bp_column_generation.py
+# Author: Magnus Pettersson
+#
+# This module provides the building blocks of an exact solver for the one
+# dimensional cutting stock problem, using Gilmore-Gomory column generation.
+#
+# A pattern is a tuple (stock length, counts), where counts holds the number
+# of pieces of each demanded length cut from one stock piece. The master
+# problem selects how many times each pattern is used, minimizing the total
+# stock length used, and is solved as a linear program while new patterns are
+# generated, and finally as an integer program. New patterns are found by
+# solving a bounded knapsack problem priced with the duals of the master.
+#
+# The master problem is solved with PuLP and its bundled CBC solver. PuLP is
+# only needed by the exact solver, and is therefore imported optionally.
+#
+#------------------------------------------------------------------------------
+
+import time
+
+try:
+    import pulp
+except ImportError:
+    pulp = None
+
+
+def knapsack(capacity: float, weights: list, values: list, bounds: list, node_limit: int = 100000) -> tuple:
+    """
+    Solve a bounded knapsack problem with depth first branch and bound, using
+    the fractional relaxation as bound.
+
+    Args:
+        capacity (float): The capacity of the knapsack.
+        weights (list): The weight of each item.
+        values (list): The value of each item.
+        bounds (list): The maximum number of each item.
+        node_limit (int, optional): The maximum number of search nodes. If
+            reached, the best solution found so far is returned. Defaults to 100000.
+
+    Returns:
+        tuple: The best value, a list with the number of each item, and True if the
+            search was completed, so that the value is optimal.
+    """
+    n = len(weights)
+    items = [i for i in range(n) if values[i] > 0.0 and bounds[i] > 0 and 0.0 < weights[i] <= capacity]
+    items.sort(key=lambda i: values[i] / weights[i], reverse=True)
+    counts = [0] * n
+    best = {"value": 0.0, "counts": [0] * n, "nodes": 0}
+
+    def upper_bound(k, remaining_capacity):
+        bound = 0.0
+        for i in items[k:]:
+            take = min(bounds[i], remaining_capacity / weights[i])
+            bound += take * values[i]
+            remaining_capacity -= take * weights[i]
+            if remaining_capacity <= 0.0:
+                break
+        return bound
+
+    # Depth first search with an explicit stack, as the depth is the number of items.
+    # Each frame is [item index, remaining capacity, value, amount taken of the item],
+    # where the amount is None until the node is visited, and the amounts are tried
+    # from the most to none.
+    stack = [[0, capacity, 0.0, None]]
+    while len(stack) > 0:
+        frame = stack[-1]
+        k, remaining_capacity, value, take = frame
+        if take is None:
+            best["nodes"] += 1
+            if value > best["value"]:
+                best["value"] = value
+                best["counts"] = counts.copy()
+            if k == len(items) or best["nodes"] > node_limit:
+                stack.pop()
+                continue
+            if value + upper_bound(k, remaining_capacity) <= best["value"] * (1.0 + 1e-12):
+                stack.pop()
+                continue
+            i = items[k]
+            take = min(bounds[i], int(remaining_capacity // weights[i]))
+        else:
+            take -= 1
+        i = items[k]
+        if take < 0:
+            counts[i] = 0
+            stack.pop()
+            continue
+        frame[3] = take
+        counts[i] = take
+        stack.append([k + 1, remaining_capacity - take * weights[i], value + take * values[i], None])
+
+    return best["value"], best["counts"], best["nodes"] <= node_limit
+
+
+def homogeneous_patterns(stock: dict, lengths: list, demand: list, cut_width: float) -> list:
+    """
+    Create the initial patterns, cutting as many pieces as possible of a single
+    demanded length from each stock length.
+
+    Args:
+        stock (dict): The available amount of each stock length.
+        lengths (list): The demanded lengths.
+        demand (list): The demanded amount of each length.
+        cut_width (float): The width of a cut.
+
+    Returns:
+        list: The patterns, as (stock length, counts) tuples.
+    """
+    patterns = []
+    for stock_length in stock:
+        for i in range(len(lengths)):
+            fit = min(demand[i], int((stock_length + cut_width) // (lengths[i] + cut_width))) if lengths[i] + cut_width > 0.0 else 0
+            if fit > 0:
+                counts = [0] * len(lengths)
+                counts[i] = fit
+                patterns.append((stock_length, tuple(counts)))
+    return patterns
+
+
+def solve_master(stock: dict, lengths: list, demand: list, patterns: list, integer: bool, time_limit: float = None) -> dict:
+    """
+    Solve the master problem over the given patterns. Demand that can not be met
+    is allowed at a penalty larger than the cost of any stock piece.
+
+    Args:
+        stock (dict): The available amount of each stock length.
+        lengths (list): The demanded lengths.
+        demand (list): The demanded amount of each length.
+        patterns (list): The patterns, as (stock length, counts) tuples.
+        integer (bool): True to solve the integer problem, False for the linear relaxation.
+        time_limit (float, optional): Time limit for the solver in seconds. Defaults to None.
+
+    Returns:
+        dict: "usage" with the number of times each pattern is used, "unmet" with
+            the unmet amount of each length, "objective" with the objective value, 
+            "demand_duals" and "stock_duals" with the duals of the linear relaxation, 
+            or None if no solution was found.
+    """
+    if pulp is None:
+        raise ImportError("The exact cutter requires PuLP")
+    category = pulp.LpInteger if integer else pulp.LpContinuous
+    penalty = 2.0 * max(stock.keys())
+    problem = pulp.LpProblem("cutting_stock", pulp.LpMinimize)
+    usage = [pulp.LpVariable(f"x_{j}", lowBound=0, cat=category) for j in range(len(patterns))]
+    unmet = [pulp.LpVariable(f"u_{i}", lowBound=0, cat=category) for i in range(len(lengths))]
+    problem += pulp.lpSum(patterns[j][0] * usage[j] for j in range(len(patterns))) + pulp.lpSum(penalty * unmet[i] for i in range(len(lengths)))
+    demand_constraints = []
+    for i in range(len(lengths)):
+        constraint = pulp.lpSum(patterns[j][1][i] * usage[j] for j in range(len(patterns)) if patterns[j][1][i] > 0) + unmet[i] >= demand[i]
+        problem += (constraint, f"demand_{i}")
+        demand_constraints.append(constraint)
+    stock_constraints = {}
+    for k, stock_length in enumerate(stock):
+        used = [usage[j] for j in range(len(patterns)) if patterns[j][0] == stock_length]
+        if len(used) > 0:
+            constraint = pulp.lpSum(used) <= stock[stock_length]
+            problem += (constraint, f"stock_{k}")
+            stock_constraints[stock_length] = constraint
+    solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit)
+    problem.solve(solver)
+    if any(variable.value() is None for variable in usage + unmet):
+        return None
+    return {
+        "usage": [variable.value() for variable in usage],
+        "unmet": [variable.value() for variable in unmet],
+        "objective": pulp.value(problem.objective),
+        "demand_duals": [constraint.pi or 0.0 for constraint in demand_constraints],
+        "stock_duals": {stock_length: (stock_constraints[stock_length].pi or 0.0) if stock_length in stock_constraints else 0.0 for stock_length in stock}
+    }
+
+
+def price_patterns(stock: dict, lengths: list, demand: list, cut_width: float, demand_duals: list, stock_duals: dict) -> tuple:
+    """
+    Find the best new pattern for each stock length, and return those with a
+    negative reduced cost.
+
+    Args:
+        stock (dict): The available amount of each stock length.
+        lengths (list): The demanded lengths.
+        demand (list): The demanded amount of each length.
+        cut_width (float): The width of a cut.
+        demand_duals (list): The duals of the demand constraints.
+        stock_duals (dict): The duals of the stock constraints.
+
+    Returns:
+        tuple: The new patterns, as (stock length, counts) tuples, and True if all
+            knapsack problems were solved to optimality, so that no new patterns 
+            means that the linear relaxation is optimal.
+    """
+    patterns = []
+    exact = True
+    weights = [length + cut_width for length in lengths]
+    for stock_length in stock:
+        # The last piece needs no cut if it reaches the end of the stock
+        value, counts, optimal = knapsack(stock_length + cut_width, weights, demand_duals, demand)
+        exact = exact and optimal
+        if stock_length - stock_duals[stock_length] - value < -1e-9 * stock_length:
+            patterns.append((stock_length, tuple(counts)))
+    return patterns, exact
+
+
+def relaxation_bound(stock: dict, lengths: list, demand: list, cut_width: float, time_limit: float = None) -> float:
+    """
+    Solve the linear relaxation of the master problem over all patterns by column
+    generation, a lower bound on the used stock length of any result meeting all
+    demand.
+
+    Args:
+        stock (dict): The available amount of each stock length.
+        lengths (list): The demanded lengths.
+        demand (list): The demanded amount of each length.
+        cut_width (float): The width of a cut.
+        time_limit (float, optional): Time limit in seconds. Defaults to None.
+
+    Returns:
+        float: The bound, or None if the relaxation was not solved to optimality 
+            within the time limit.
+    """
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    patterns = homogeneous_patterns(stock, lengths, demand, cut_width)
+    while deadline is None or time.monotonic() < deadline:
+        relaxation = solve_master(stock, lengths, demand, patterns, False, None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if relaxation is None or (deadline is not None and time.monotonic() >= deadline):
+            return None
+        new_patterns, exact = price_patterns(stock, lengths, demand, cut_width, relaxation["demand_duals"], relaxation["stock_duals"])
+        new_patterns = [pattern for pattern in new_patterns if pattern not in patterns]
+        if len(new_patterns) == 0:
+            return relaxation["objective"] if exact else None
+        patterns += new_patterns
+    return None
+
+
+def remove_surplus(plan: list, lengths: list, demand: list) -> list:
+    """
+    Remove pieces produced in excess of the demand from a plan, turning them into
+    waste, and drop stock pieces left without any cuts.
+
+    Args:
+        plan (list): The plan, as [stock length, counts, amount] lists.
+        lengths (list): The demanded lengths.
+        demand (list): The demanded amount of each length to be met by the plan.
+
+    Returns:
+        list: The plan without surplus.
+    """
+    for i in range(len(lengths)):
+        surplus = sum(counts[i] * amount for _, counts, amount in plan) - demand[i]
+        index = 0
+        while surplus > 0 and index < len(plan):
+            stock_length, counts, amount = plan[index]
+            if counts[i] > 0:
+                stripped = list(counts)
+                if surplus >= counts[i] * amount:
+                    surplus -= counts[i] * amount
+                    stripped[i] = 0
+                    plan[index] = [stock_length, tuple(stripped), amount]
+                else:
+                    full = surplus // counts[i]
+                    rest = surplus % counts[i]
+                    stripped[i] = 0
+                    partial = list(counts)
+                    partial[i] = counts[i] - rest
+                    split = [[stock_length, tuple(stripped), full]] if full > 0 else []
+                    split += [[stock_length, tuple(partial), 1]] if rest > 0 else []
+                    left = amount - full - (1 if rest > 0 else 0)
+                    split += [[stock_length, counts, left]] if left > 0 else []
+                    plan[index:index + 1] = split
+                    surplus = 0
+            index += 1
+    return [item for item in plan if item[2] > 0 and sum(item[1]) > 0]
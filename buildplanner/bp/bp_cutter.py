@@ -7,41 +7,92 @@
 # File: bp_cutter.py
 # Author: Magnus Pettersson
 #
-# This module provides a class for cutting stock pieces to fulfill demand. 
-# It's commonly used in manufacturing and logistics to optimize the use of 
+# This module provides a class for cutting stock pieces to fulfill demand.
+# It's commonly used in manufacturing and logistics to optimize the use of
 # available stock material while meeting the requirements of customer demand.
 #
-# The BPCutter class includes methods for performing cutting operations using 
-# different algorithms such as optimal, greedy, and experimental. These algorithms 
-# determine the most efficient way to cut stock pieces to minimize waste and 
+# The BPCutter class includes methods for performing cutting operations using
+# different algorithms such as optimal, greedy, best fit decreasing and experimental. These algorithms
+# determine the most efficient way to cut stock pieces to minimize waste and
 # fulfill demand.
 #
-# The cutting process involves taking a set of available stock pieces and a 
-# corresponding demand for stock pieces. The goal is to find the optimal way 
-# to cut the available stock pieces to meet the demand, considering factors 
+# The cutting process involves taking a set of available stock pieces and a
+# corresponding demand for stock pieces. The goal is to find the optimal way
+# to cut the available stock pieces to meet the demand, considering factors
 # such as stock dimensions, demand quantities, and cutting width.
 #
 # The module includes the following classes and enums:
 # - BPCutter: The main class for performing cutting operations.
-# - METHOD Enum: An enumeration of available cutting methods (OPT, GREEDY, EXPERIMENTAL).
+# - METHOD Enum: An enumeration of available cutting methods (OPT, GREEDY, EXPERIMENTAL, EXACT, BFD, DP_GREEDY, ANYTIME,
+#   MULTISTART).
 # - BPDataStockPieces: A class representing a collection of stock pieces.
 # - BPDataCutStock: A class representing a cut piece of stock material.
 # - BPDataCutterResult: A class representing the result of a cutting operation.
 #
 #------------------------------------------------------------------------------
 
+import copy
+import functools
+import math
+import os
+import random
+import time
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from enum import Enum, auto
 
 from bp.bp_data_classes import (
     BPDataStockPieces,
+    BPDataStockPiecesArray,
     BPDataCutStock,
     BPDataCutterResult,
 )
 
+from bp import bp_bounds, bp_column_generation
+from bp.bp_cache import BPCache
+from bp.bp_cancel_token import BPCancelToken
+from bp.bp_defs import length_unit_scale_factor
 from bp.bp_log import BPLog
 
 from bp.bp_type_check import type_check_class
 
+# The cutter of a worker process in a parallel portfolio, and the shared token
+# cancelling its cuts, set once per process
+_portfolio_cutter = None
+_portfolio_cancel = None
+
+def _portfolio_init(cutter: 'BPCutter', cancel: BPCancelToken) -> None:
+    """Set the cutter and the shared cancellation token of a worker process."""
+    global _portfolio_cutter, _portfolio_cancel
+    _portfolio_cutter = cutter
+    _portfolio_cancel = cancel
+
+def _portfolio_cut(method: 'BPCutter.METHOD', seed: int = None, deadline: float = math.inf) -> BPDataCutterResult:
+    """Cut with one method, and optionally a seed, before a deadline in a worker process, and return the result."""
+    if seed is None:
+        _portfolio_cutter.cut(method, deadline=deadline, cancel=_portfolio_cancel)
+    else:
+        _portfolio_cutter.cut(method, seed=seed, deadline=deadline, cancel=_portfolio_cancel)
+    return _portfolio_cutter.result
+
+# The shared token cancelling the cuts of a worker process of BPCutter.cut_many()
+_cut_many_cancel = None
+
+def _cut_many_init(cancel: BPCancelToken) -> None:
+    """Set the shared cancellation token of a worker process."""
+    global _cut_many_cancel
+    _cut_many_cancel = cancel
+
+def _cut_many_cut(settings: dict, problem: tuple) -> BPDataCutterResult:
+    """Cut one (stock, demand, cut_width) problem of a batch, in a worker process, and return the result."""
+    stock, demand, cut_width = problem
+    cutter = BPCutter(stock, demand, cut_width, **settings)
+    if _cut_many_cancel is None:
+        cutter.cut()
+    else:
+        cutter.cut(cancel=_cut_many_cancel)
+    return cutter.result
+
 @type_check_class
 class BPCutter:
     """
@@ -52,155 +103,889 @@ class BPCutter:
         OPT = auto()
         GREEDY = auto()
         EXPERIMENTAL = auto()
+        EXACT = auto()
+        BFD = auto()
+        DP_GREEDY = auto()
+        ANYTIME = auto()
+        MULTISTART = auto()
+
+    # The methods run by METHOD.OPT in parallel
+    __PORTFOLIO = (METHOD.GREEDY, METHOD.EXPERIMENTAL, METHOD.BFD, METHOD.DP_GREEDY)
+    # The methods with a randomized variant, run with a seed
+    __SEEDED = (METHOD.GREEDY, METHOD.EXPERIMENTAL)
 
     @property
     def result(self) -> BPDataCutterResult:
         return self.__result
 
+    @property
+    def statistics(self) -> list:
+        """The statistics of each run of the last METHOD.MULTISTART cut, in run order."""
+        return self.__statistics
+
     def __init__(
-            self, 
-            stock: BPDataStockPieces, 
-            demand: BPDataStockPieces, 
-            cut_width: float = 0.0, 
-            method: METHOD = METHOD.OPT, 
-            length_unit: str = "NONE", 
+            self,
+            stock,
+            demand,
+            cut_width: float = 0.0,
+            method: METHOD = METHOD.OPT,
+            length_unit: str = "NONE",
             original_length_unit: str = "NONE",
-            precision: int = 0
+            precision: int = 0,
+            tick: bool = False,
+            time_limit: float = None,
+            restarts: int = 8,
+            seed: int = 0,
+            presolve: bool = True,
+            cache: BPCache = None
             ) -> None:
         """
         Initializes the BPCutter instance.
 
         Args:
-            stock (BPDataStockPieces): The available stock pieces.
-            demand (BPDataStockPieces): The demand for stock pieces.
+            stock (BPDataStockPieces or BPDataStockPiecesArray): The available stock pieces.
+            demand (BPDataStockPieces or BPDataStockPiecesArray): The demand for stock
+                pieces. Columnar stock pieces are converted once, with the tick
+                quantization done on their arrays.
             cut_width (float, optional): The width to be cut from stock pieces. Defaults to 0.0.
             method (METHOD, optional): The cutting method to be used. Defaults to METHOD.OPT.
             length_unit (str, optional): The unit of length for stock pieces. Defaults to "NONE".
             original_length_unit (str, optional): The original unit of length for stock pieces. Defaults to "NONE".
             precision (int, optional): The precision for calculations. Defaults to 0.
+            tick (bool, optional): If True, all lengths are quantized once into integer
+                ticks of the output precision, and the cutting is done without any
+                rounding. The result is converted back when presented. Defaults to False.
+            time_limit (float, optional): The time limit in seconds for METHOD.EXACT and
+                METHOD.ANYTIME. Defaults to None, meaning no limit for METHOD.EXACT and
+                one second for METHOD.ANYTIME. For METHOD.OPT it is the time limit for
+                the LP bound, which is only calculated when a time limit is given.
+            restarts (int, optional): The number of randomized runs of each method for
+                METHOD.MULTISTART. Defaults to 8.
+            seed (int, optional): The first seed of the randomized runs of
+                METHOD.MULTISTART, the following runs use the next seeds. Defaults to 0.
+            presolve (bool, optional): If True, pieces exactly matching a stock length,
+                and pairs of pieces exactly filling a stock length, are cut before any
+                method runs, and pieces longer than all stock lengths are set aside as
+                remaining demand. The methods only cut the rest. Defaults to True.
+            cache (BPCache, optional): A cache of results. If given, a problem cut
+                before with the same stock, demand and settings returns the cached
+                result at once, and new results are stored. Defaults to None.
         """
-        self.__stock = stock.copy()
-        self.__demand = demand.copy()
+        if tick:
+            tick_factor = length_unit_scale_factor[length_unit] / length_unit_scale_factor[original_length_unit] * 10**precision
+            stock = self.__to_ticks(stock, tick_factor)
+            demand = self.__to_ticks(demand, tick_factor)
+            cut_width = float(round(cut_width * tick_factor))
+        else:
+            tick_factor = 1.0
+            if isinstance(stock, BPDataStockPiecesArray):
+                stock = stock.to_stock_pieces()
+            if isinstance(demand, BPDataStockPiecesArray):
+                demand = demand.to_stock_pieces()
+        # The problem is never modified, every engine works on its own copies
+        self.__problem_stock = stock.copy().freeze()
+        self.__problem_demand = demand.copy().freeze()
         self.__cut_width = cut_width
+        self.__tick = tick
         self.__result = BPDataCutterResult(
             precision=precision,
             length_unit=length_unit,
             original_length_unit=original_length_unit,
-            available_stock=stock.copy()
+            available_stock=stock.copy(),
+            tick_factor=tick_factor
         )
         self.__method = method
+        self.__time_limit = time_limit
+        self.__restarts = restarts
+        self.__seed = seed
+        self.__use_presolve = presolve
+        self.__cache = cache
+        self.__statistics = []
+        self.__lower_bound = None
         self.__log = BPLog()
+        self.__set_controls(math.inf, -math.inf, BPCancelToken())
+        # The engines only cut the stock and demand left by the presolve
+        self.__stock = self.__problem_stock
+        self.__demand = self.__problem_demand
+        self.__presolved = []
+        self.__unplaceable = BPDataStockPieces().freeze()
+        if presolve:
+            self.__presolve()
+
+    def __to_ticks(self, stock_pieces, tick_factor: float) -> BPDataStockPieces:
+        """
+        Quantize lengths into integer ticks. The ticks are kept as integral floats,
+        which are exact in all additions and subtractions made by the engines and
+        hash identically for equal lengths.
+
+        Args:
+            stock_pieces (BPDataStockPieces or BPDataStockPiecesArray): The stock pieces to quantize.
+            tick_factor (float): The number of ticks per length unit.
+
+        Returns:
+            BPDataStockPieces: The stock pieces with lengths in ticks.
+        """
+        if isinstance(stock_pieces, BPDataStockPiecesArray):
+            return stock_pieces.quantized(tick_factor).to_stock_pieces()
+        stock_pieces_ticks = {}
+        for key, value in stock_pieces.items():
+            tick_key = float(round(key * tick_factor))
+            stock_pieces_ticks[tick_key] = stock_pieces_ticks.get(tick_key, 0) + value
+        return BPDataStockPieces.from_counts(stock_pieces_ticks.keys(), stock_pieces_ticks.values())
+
+    def __presolve(self) -> None:
+        """
+        Cut what can be decided without search. Pieces longer than all stock lengths
+        are set aside as remaining demand, pieces matching a stock length are cut
+        from it, and then pairs of pieces that fill a stock length exactly, including
+        the cut between them. Leaves the rest of the stock and demand to the engines.
+        """
+        stock = dict(self.__stock.iter_runs())
+        demand = dict(self.__demand.iter_runs())
+        max_length = max(stock.keys(), default=0.0)
+        unplaceable = {length: count for length, count in demand.items() if length > max_length}
+        for length in unplaceable:
+            del demand[length]
+        cut_width = self.__cut_width
+        presolved = []
+        for stock_length in sorted(stock.keys(), reverse=True):
+            amount = min(stock[stock_length], demand.get(stock_length, 0))
+            if amount > 0:
+                presolved.append((BPDataCutStock(stock_length, cut_width, BPDataStockPieces.from_counts([stock_length], [1])), amount))
+                stock[stock_length] -= amount
+                demand[stock_length] -= amount
+            for length in sorted(demand.keys(), reverse=True):
+                other = stock_length - cut_width - length
+                if stock[stock_length] == 0 or other > length:
+                    continue
+                if other <= 0.0 or demand[length] == 0 or demand.get(other, 0) == 0:
+                    continue
+                amount = min(stock[stock_length], demand[length] // 2 if other == length else min(demand[length], demand[other]))
+                if amount == 0:
+                    continue
+                pieces = BPDataStockPieces.from_counts([length], [2]) if other == length else BPDataStockPieces.from_sorted_pairs([(length, 1), (other, 1)])
+                cut_stock = BPDataCutStock(stock_length, cut_width, pieces)
+                if not cut_stock.is_valid:
+                    continue
+                presolved.append((cut_stock, amount))
+                stock[stock_length] -= amount
+                demand[length] -= amount
+                demand[other] -= amount
+        # The stock can not meet the demand if it is too short, with a cut after every piece
+        needed = sum((length + cut_width) * count for length, count in demand.items())
+        available = sum((length + cut_width) * count for length, count in stock.items())
+        if needed > available:
+            self.__log.warning("The stock is too short for the demand, some demand will remain")
+        self.__presolved = presolved
+        self.__unplaceable = BPDataStockPieces.from_counts(unplaceable.keys(), unplaceable.values()).freeze()
+        self.__stock = BPDataStockPieces.from_counts(
+            [length for length in stock if stock[length] > 0], [count for count in stock.values() if count > 0]
+        ).freeze()
+        self.__demand = BPDataStockPieces.from_counts(
+            [length for length in demand if demand[length] > 0], [count for count in demand.values() if count > 0]
+        ).freeze()
+        if len(presolved) > 0 or len(unplaceable) > 0:
+            self.__log.debug("Presolved: " + str(presolved) + ", unplaceable: " + str(self.__unplaceable))
 
-    def cut(self, method: METHOD = None) -> None:
+    def __new_result(self) -> BPDataCutterResult:
+        """
+        Create an empty result for an engine, holding the presolved stock pieces.
+
+        Returns:
+            BPDataCutterResult: The result.
+        """
+        result = BPDataCutterResult(
+            precision=self.__result.precision,
+            length_unit=self.__result.length_unit,
+            original_length_unit=self.__result.original_length_unit,
+            available_stock=self.__problem_stock,
+            tick_factor=self.__result.tick_factor
+        )
+        for cut_stock, amount in self.__presolved:
+            result.append(cut_stock, amount)
+        return result
+
+    def __set_controls(self, deadline: float, waste_target: float, cancel: BPCancelToken) -> None:
+        """
+        Set the controls of a cut, checked by every engine, see cut().
+
+        Args:
+            deadline (float): The deadline from time.monotonic(), or math.inf.
+            waste_target (float): The acceptable total waste, or -math.inf.
+            cancel (BPCancelToken): The cancellation token.
+        """
+        self.__deadline = deadline
+        self.__waste_target = waste_target
+        self.__cancel = cancel
+        self.__stopped = False
+
+    def __stop_requested(self) -> bool:
+        """
+        Check if the cut is cancelled or past its deadline. Once stopped, the cut
+        stays stopped, so that every engine and method of it stops.
+
+        Returns:
+            bool: True if the engines should stop.
+        """
+        if not self.__stopped and (self.__cancel.cancelled or time.monotonic() >= self.__deadline):
+            self.__log.debug("Cut stopped, " + ("cancelled" if self.__cancel.cancelled else "deadline reached"))
+            self.__stopped = True
+        return self.__stopped
+
+    def __target_reached(self, result: BPDataCutterResult) -> bool:
+        """
+        Check if a result meets all demand that fits the stock, with a total waste
+        within the waste target.
+
+        Args:
+            result (BPDataCutterResult): The result to check.
+
+        Returns:
+            bool: True if no better result is needed.
+        """
+        return len(result.raw_remaining_demand) == len(self.__unplaceable) and result.total_waste <= self.__waste_target
+
+    def __stopped_result(self, method: str) -> BPDataCutterResult:
+        """
+        Create the result of a cut stopped before any engine produced a result,
+        with only the presolved stock pieces.
+
+        Args:
+            method (str): The method name of the result.
+
+        Returns:
+            BPDataCutterResult: The result.
+        """
+        result = self.__new_result()
+        result.remaining_demand = self.__demand + self.__unplaceable
+        result.method = method
+        return result
+
+    def __cache_key(self, method: METHOD, parallel: bool, seed: int) -> str:
+        """
+        Create the cache key of cutting the problem with a method.
+
+        Args:
+            method (METHOD): The cutting method.
+            parallel (bool): True if cut in parallel processes.
+            seed (int): The seed of the cut, -1 for none.
+
+        Returns:
+            str: The key.
+        """
+        if method not in self.__SEEDED:
+            seed = -1
+        return BPCache.key(
+            self.__problem_stock,
+            self.__problem_demand,
+            self.__cut_width,
+            method.name,
+            self.__result.precision,
+            self.__result.length_unit,
+            self.__result.original_length_unit,
+            {
+                "tick_factor": self.__result.tick_factor,
+                "time_limit": self.__time_limit,
+                "restarts": self.__restarts,
+                "seed": self.__seed,
+                "presolve": self.__use_presolve,
+                "parallel": parallel,
+                "cut_seed": seed,
+                # A cut may stop early at the waste target, with another result
+                "waste_target": self.__waste_target
+            }
+        )
+
+    def cut(
+            self,
+            method: METHOD = None,
+            parallel: bool = False,
+            workers: int = None,
+            seed: int = None,
+            deadline: float = None,
+            waste_target: float = None,
+            cancel: BPCancelToken = None
+            ) -> None:
         """
         Performs the cutting operation based on the specified method, which can be
         one of the following:
         - BPCutter.METHOD.GREEDY
         - BPCutter.METHOD.EXPERIMENTAL
-        - BPCutter.METHOD.OPT - Which uses both the methods above, returning the 
+        - BPCutter.METHOD.OPT - Which uses both the methods above, returning the
           best result based on minimized waste
+        - BPCutter.METHOD.EXACT - Column generation solved with PuLP, returning a
+          provably near optimal result, or the best found within the time limit
+        - BPCutter.METHOD.BFD - Best fit decreasing, the fastest method, with a
+          result close to the others for most demands
+        - BPCutter.METHOD.DP_GREEDY - Like the greedy method, but every stock piece
+          is filled with the pattern of least waste, found by dynamic programming
+        - BPCutter.METHOD.ANYTIME - The greedy method followed by local search,
+          returning the best result found within the time limit
+        - BPCutter.METHOD.MULTISTART - The greedy and experimental methods, followed
+          by randomized variants of both, returning the best result
 
         Args:
             method (METHOD, optional): The cutting method to be used. Defaults to None.
-            
+            parallel (bool, optional): If True, METHOD.OPT runs its methods in parallel
+                processes, together with METHOD.BFD and METHOD.DP_GREEDY, and
+                METHOD.MULTISTART runs its runs in parallel processes. Other methods
+                are not affected. Defaults to False.
+            workers (int, optional): The number of processes when parallel. Defaults
+                to None, meaning one per method, at most the number of CPUs.
+            seed (int, optional): If given, METHOD.GREEDY and METHOD.EXPERIMENTAL run
+                a randomized variant with this seed. Defaults to None.
+            deadline (float, optional): The time, from time.monotonic(), when every
+                engine stops. Defaults to None, meaning no deadline.
+            waste_target (float, optional): An acceptable total waste. The methods
+                running several engines, or improving a result, stop as soon as a
+                result meets all demand within it. Defaults to None.
+            cancel (BPCancelToken, optional): A token to cancel the cut. Defaults to None.
+
+        When stopped by the deadline or the token, the best result so far is kept,
+        which may be partial, with the demand not yet cut as remaining demand. Its
+        method ends with " (stopped)", and it is not cached.
         """
-        self.__log.debug("Stock: " + str(self.__stock))
-        self.__log.debug("Demand: " + str(self.__demand))
-        if len(self.__demand) == 0:
-            return None
-        if len(self.__stock) == 0:
-            self.__result.remaining_demand = self.__demand
-            return None
+        self.__set_controls(
+            math.inf if deadline is None else deadline,
+            -math.inf if waste_target is None else waste_target,
+            BPCancelToken() if cancel is None else cancel
+        )
         method = self.__method if method == None else method
-        if method == self.METHOD.OPT:
-            results = []
-            results.append(self.__greedy_cut())
-            results.append(self.__experimental_cut())
-            min_waste = None
-            for result in results:
-                if result != None:
-                    self.__log.debug("Waste from " + result.method + ": " + str(result.total_waste))
-                    if min_waste == None or result.total_waste < min_waste:
-                        min_waste = result.total_waste
-                        self.__result = result
-        elif method == self.METHOD.GREEDY:
-            self.__result = self.__greedy_cut()
-        elif method == self.METHOD.EXPERIMENTAL:
-            self.__result = self.__experimental_cut()
+        key = self.__cut_start(method, parallel, -1 if seed is None else seed)
+        if key is None:
+            return None
+        self.__result = self.__run(self.__cut_method(method, parallel, 0 if workers is None else workers, -1 if seed is None else seed))
+        self.__cut_finish(key)
         return None
-    
-    def cut_iter(self, method: METHOD = None) -> None:
+
+    def cut_iter(
+            self,
+            method: METHOD = None,
+            deadline: float = None,
+            waste_target: float = None,
+            cancel: BPCancelToken = None,
+            yield_interval_ms: float = 0.0,
+            yield_every: int = 1
+            ) -> None:
         """
-        Performs the cutting operation iteratively based on the specified method.
+        Performs the cutting operation iteratively based on the specified method,
+        yielding steps of (done, name, result, progress), where the progress is an
+        estimate of the fraction complete, from 0.0 to 1.0. The result is None,
+        except for the result of each engine of METHOD.OPT, an improved result,
+        and the last step, which holds the final result.
+
+        The engines are the same as for cut(), run in the thread of the caller.
+        They report every step to a progress callback, which only lets them yield
+        a step without a result when both yield_every engine steps and
+        yield_interval_ms have passed since the last step yielded, so that a caller
+        updating a user interface is not called more often than needed. Closing the
+        generator stops the cut, keeping the best result so far.
 
         Args:
             method (METHOD, optional): The cutting method to be used. Defaults to None.
+            deadline (float, optional): The time, from time.monotonic(), when every
+                engine stops, see cut(). Defaults to None.
+            waste_target (float, optional): An acceptable total waste, see cut().
+                Defaults to None.
+            cancel (BPCancelToken, optional): A token to cancel the cut, see cut().
+                Defaults to None.
+            yield_interval_ms (float, optional): The least time between the steps
+                yielded, in milliseconds. Defaults to 0.0.
+            yield_every (int, optional): The least number of engine steps between
+                the steps yielded. Defaults to 1.
+        """
+        self.__set_controls(
+            math.inf if deadline is None else deadline,
+            -math.inf if waste_target is None else waste_target,
+            BPCancelToken() if cancel is None else cancel
+        )
+        method = self.__method if method == None else method
+        key = self.__cut_start(method, False, -1)
+        if key is None:
+            # Only a cached result is yielded, there are no steps when nothing is left to cut
+            if len(self.__stock) > 0 and len(self.__demand) > 0:
+                yield (True, self.__result.method, self.__result, 1.0)
+            return None
+
+        interval = yield_interval_ms / 1000.0
+        last_yield = time.monotonic()
+        batched = 0
+        step = None
+        last_name = ""
+
+        def progress(name, fraction, result=None):
+            # Every result is yielded, and a step without one when the batch is full
+            nonlocal batched, step, last_name
+            batched += 1
+            last_name = name
+            if result is None and (batched < yield_every or time.monotonic() - last_yield < interval):
+                return False
+            step = (False, name, result, fraction)
+            return True
+
+        engine = self.__cut_method(method, False, 0, -1, progress)
+        try:
+            while True:
+                try:
+                    next(engine)
+                except StopIteration as stop:
+                    self.__result = stop.value
+                    break
+                yield step
+                batched = 0
+                last_yield = time.monotonic()
+        except GeneratorExit:
+            # Closing the generator before the cut is done stops the engine, keeping its result
+            self.__stopped = True
+            self.__result = self.__run(engine)
+            self.__cut_finish(key)
+            raise
+        self.__cut_finish(key)
+        yield (True, last_name if last_name != "" else self.__result.method, self.__result, 1.0)
+
+    @staticmethod
+    def __run(engine) -> BPDataCutterResult:
+        """
+        Run an engine to the end. The engines are generators, only yielding when
+        their progress callback asks for a step to be yielded, so without one, the
+        engine runs to the end in the first call.
+
+        Args:
+            engine (generator): The engine.
+
+        Returns:
+            BPDataCutterResult: The result of the engine.
+        """
+        while True:
+            try:
+                next(engine)
+            except StopIteration as stop:
+                return stop.value
+
+    def __cut_start(self, method: METHOD, parallel: bool, seed: int) -> str:
+        """
+        Start the cutting operation, setting the result when there is nothing left
+        to cut after the presolve, or when the result is cached.
+
+        Args:
+            method (METHOD): The cutting method.
+            parallel (bool): If the cut is made in parallel processes.
+            seed (int): The seed, or -1 for none.
+
+        Returns:
+            str: The cache key of the cut, "" without a cache, or None if the result
+                is already set.
         """
         self.__log.debug("Stock: " + str(self.__stock))
         self.__log.debug("Demand: " + str(self.__demand))
-        if len(self.__demand) == 0:
+        if len(self.__problem_demand) == 0:
             return None
-        if len(self.__stock) == 0:
-            self.__result.set_remaining_demand(self.__demand)
+        if len(self.__stock) == 0 or len(self.__demand) == 0:
+            self.__result = self.__new_result()
+            self.__result.remaining_demand = self.__demand + self.__unplaceable
+            if len(self.__presolved) > 0:
+                self.__result.method = "Presolve"
+            self.__result.lower_bound = self.__waste_lower_bound(False)
             return None
-        method = self.__method if method == None else method
+        if self.__cache is None:
+            return ""
+        key = self.__cache_key(method, parallel, seed)
+        result = self.__cache.get(key)
+        if result is not None:
+            self.__log.debug("Cached result from " + result.method)
+            self.__result = result
+            return None
+        return key
+
+    def __cut_method(self, method: METHOD, parallel: bool, workers: int, seed: int, progress=None) -> BPDataCutterResult:
+        """
+        Cut with a method. The engines, and this method, are generators, which only
+        yield when the progress callback returns True, to let cut_iter() yield a
+        step, and return their result. Without a callback they never yield, and
+        are run to the end by __run(), without any step objects.
+
+        Args:
+            method (METHOD): The cutting method.
+            parallel (bool): If True, METHOD.OPT and METHOD.MULTISTART use parallel
+                processes, see cut().
+            workers (int): The number of processes, or 0 for the default.
+            seed (int): The seed of METHOD.GREEDY and METHOD.EXPERIMENTAL, or -1 for none.
+            progress (callable, optional): Called by the engines as progress(name,
+                fraction) at every step, and as progress(name, fraction, result)
+                with every result before the last one, returning True when the
+                engine should yield, see cut_iter(). Defaults to None.
+
+        Returns:
+            BPDataCutterResult: The result of the cutting operation.
+        """
+        # The seed is ignored by the methods without a randomized variant
+        rng = random.Random(seed) if seed >= 0 and method in self.__SEEDED else None
         if method == self.METHOD.OPT:
-            results = []
-            for step in self.__greedy_cut_iter():
-                yield step
-            results.append(step[2])
-            for step in self.__experimental_cut_iter():
-                yield step
-            results.append(step[2])
+            if parallel:
+                results = self.__portfolio_cut(min(len(self.__PORTFOLIO), os.cpu_count() or 1) if workers == 0 else workers)
+                if len(results) == 0:
+                    results = [self.__stopped_result("Optimal Cut")]
+            else:
+                results = []
+                engines = ((self.__greedy_cut, "Greedy Cut"), (self.__experimental_cut, "Experimental Cut"))
+                for index, (engine, name) in enumerate(engines):
+                    engine_progress = None if progress is None else (
+                        lambda name, fraction, index=index: progress(name, (index + fraction) / len(engines))
+                    )
+                    results.append((yield from engine(None, engine_progress)))
+                    if progress is not None and progress(name, (index + 1) / len(engines), results[-1]):
+                        yield
+                    if self.__is_optimal(results[-1]) or self.__target_reached(results[-1]) or self.__stop_requested():
+                        self.__log.debug("Final result from " + results[-1].method + ", skipping remaining methods")
+                        break
             min_waste = None
             for result in results:
                 if result != None:
                     self.__log.debug("Waste from " + result.method + ": " + str(result.total_waste))
                     if min_waste == None or result.total_waste < min_waste:
                         min_waste = result.total_waste
-                        self.__result = result
+                        best_result = result
+            result = best_result
         elif method == self.METHOD.GREEDY:
-            for step in self.__greedy_cut_iter():
-                yield step
-            self.__result = step[2]
+            result = yield from self.__greedy_cut(rng, progress)
         elif method == self.METHOD.EXPERIMENTAL:
-            for step in self.__experimental_cut_iter():
-                yield step
-            self.__result = step[2]
+            result = yield from self.__experimental_cut(rng, progress)
+        elif method == self.METHOD.EXACT:
+            result = yield from self.__exact_cut(progress)
+        elif method == self.METHOD.BFD:
+            result = yield from self.__bfd_cut(progress)
+        elif method == self.METHOD.DP_GREEDY:
+            result = yield from self.__dp_greedy_cut(progress)
+        elif method == self.METHOD.ANYTIME:
+            result = yield from self.__anytime_cut(progress)
+        elif method == self.METHOD.MULTISTART:
+            if parallel:
+                result = self.__multistart_parallel_cut((os.cpu_count() or 1) if workers == 0 else workers)
+            else:
+                result = yield from self.__multistart_cut(progress)
+        if rng is not None:
+            result.method += f" (seed {seed})"
+        return result
+
+    def __cut_finish(self, key: str) -> None:
+        """
+        Finish the cutting operation, adding the lower bound to the result, and
+        marking a stopped result, or caching the result under the key.
+
+        Args:
+            key (str): The cache key of the cut, or "" without a cache.
+        """
+        self.__result.lower_bound = self.__waste_lower_bound(False)
+        if self.__stopped:
+            self.__result.method += " (stopped)"
+        elif self.__cache is not None:
+            self.__cache.put(key, self.__result)
+        return None
 
-    # ******** Experimental Cut ******** 
+    def __worker_cutter(self) -> 'BPCutter':
+        """
+        Return a copy of the cutter to send to worker processes, without the cache,
+        as only the final result is cached, and without the cancellation token, which
+        would only be a copy. The workers are given a shared token instead, see
+        __shutdown_pool(). The deadline is kept, as the clock is the same.
+        """
+        cutter = copy.copy(self)
+        cutter.__cache = None
+        cutter.__cancel = BPCancelToken()
+        return cutter
 
-    def __experimental_cut_iteration(self, stock, demand, stock_in_use) -> bool:
+    @staticmethod
+    def __shutdown_pool(executor: ProcessPoolExecutor, cancel: BPCancelToken) -> None:
         """
-        Perform one iteration of the experimental cutting algorithm.
+        Shut down a pool of processes whose results are no longer needed. The
+        methods not yet started are cancelled, and the running ones are stopped by
+        the shared token given to the processes, and waited for, so that no process
+        is left running after the cut.
 
         Args:
-            stock ([type]): [description]
-            demand ([type]): [description]
-            stock_in_use ([type]): [description]
+            executor (ProcessPoolExecutor): The pool.
+            cancel (BPCancelToken): The shared token of the processes.
+        """
+        cancel.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+        return None
+
+    def __portfolio_cut(self, workers: int) -> list:
+        """
+        Run the methods of METHOD.OPT, together with METHOD.BFD and METHOD.DP_GREEDY,
+        in a pool of processes. The cutter is sent once to every process. When a
+        result is proven optimal, the remaining methods are cancelled and stopped.
+        The same is done when a result reaches the waste target, or the cut is
+        stopped, as the processes do not see the cancellation token.
+
+        Args:
+            workers (int): The number of processes.
 
         Returns:
-            bool: [description]
+            list: The results received, in the order of the methods.
+        """
+        methods = self.__PORTFOLIO
+        results = [None] * len(methods)
+        stop = BPCancelToken(shared=True)
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_portfolio_init, initargs=(self.__worker_cutter(), stop))
+        try:
+            futures = {executor.submit(_portfolio_cut, method, None, self.__deadline): index for index, method in enumerate(methods)}
+            pending = set(futures.keys())
+            while len(pending) > 0 and not self.__stop_requested():
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[futures[future]] = future.result()
+                if any(self.__is_optimal(future.result()) or self.__target_reached(future.result()) for future in done):
+                    self.__log.debug("Final result received, cancelling remaining methods")
+                    break
+        finally:
+            self.__shutdown_pool(executor, stop)
+        return [result for result in results if result is not None]
+
+    def __waste_lower_bound(self, lp: bool) -> float:
+        """
+        Calculate a lower bound on the total waste of any result meeting all demand
+        that fits the stock, as the best of the continuous bound and the L2 bound,
+        and the LP bound if requested. The bounds are calculated once and kept.
+
+        Args:
+            lp (bool): True to include the LP bound, if PuLP is available and a time
+                limit is given.
+
+        Returns:
+            float: The bound on the total waste.
+        """
+        stock = {key: value for key, value in self.__problem_stock.iter_runs() if key > 0.0}
+        if len(stock) == 0:
+            return 0.0
+        max_length = max(stock.keys())
+        runs = [(length, count) for length, count in self.__problem_demand.iter_runs() if length <= max_length]
+        lengths = [length for length, count in runs]
+        demand = [count for length, count in runs]
+        demand_length = sum(length * count for length, count in runs)
+        cut_width = self.__cut_width
+        if self.__lower_bound is None:
+            used = bp_bounds.continuous_bound(stock, lengths, demand, cut_width)
+            # The bins needed with the longest stock, each at least as long as the shortest stock
+            bins = bp_bounds.l2_bound(max_length + cut_width, [length + cut_width for length in lengths], demand)
+            used = max(used, bins * min(stock.keys()))
+            self.__lower_bound = [used, False]
+        if lp and not self.__lower_bound[1] and bp_column_generation.pulp is not None and self.__time_limit is not None:
+            self.__lower_bound[1] = True
+            relaxation = bp_column_generation.relaxation_bound(stock, lengths, demand, cut_width, self.__time_limit)
+            if relaxation is not None:
+                if len(stock) == 1:
+                    relaxation = math.ceil(relaxation / max_length - 1e-9) * max_length
+                self.__lower_bound[0] = max(self.__lower_bound[0], relaxation)
+        return max(0.0, self.__lower_bound[0] - demand_length)
+
+    def __is_optimal(self, result: BPDataCutterResult) -> bool:
+        """
+        Check if a result is proven optimal, by comparing it to the lower bound.
+        The LP bound is only calculated if the other bounds are not enough.
+
+        Args:
+            result (BPDataCutterResult): The result to check.
+
+        Returns:
+            bool: True if the result is optimal.
+        """
+        result.lower_bound = self.__waste_lower_bound(False)
+        if result.optimality_gap is not None and result.optimality_gap > 0.0:
+            result.lower_bound = self.__waste_lower_bound(True)
+        return result.optimality_gap == 0.0
+
+    def resolve(self, previous_result: BPDataCutterResult, new_demand: BPDataStockPieces, method: METHOD = None) -> None:
+        """
+        Cuts a changed demand, starting from a previous result. Every stock piece of
+        the previous result whose pieces are all still demanded is kept as it is,
+        stock pieces holding removed pieces are released, and only the demand not met
+        by the kept stock pieces is cut, from the stock not used by them. The result
+        is for the new demand, and much faster than cutting it from scratch when only
+        a few pieces have changed.
+
+        Args:
+            previous_result (BPDataCutterResult): The previous result, produced by this
+                instance, or by another instance with the same stock and settings.
+            new_demand (BPDataStockPieces): The new demand for stock pieces.
+            method (METHOD, optional): The cutting method to be used for the changed
+                demand. Defaults to None.
+        """
+        if self.__tick:
+            new_demand = self.__to_ticks(new_demand, self.__result.tick_factor)
+        needed = dict(new_demand.iter_runs())
+        available = dict(self.__problem_stock.iter_runs())
+        kept = []
+        for cut_stock, amount in previous_result.raw_cut_stock_list:
+            repeat = min(amount, available.get(cut_stock.stock_length, 0))
+            for length, count in cut_stock.stock_pieces.iter_runs():
+                repeat = min(repeat, needed.get(length, 0) // count)
+            if repeat > 0:
+                kept.append((cut_stock, repeat))
+                available[cut_stock.stock_length] -= repeat
+                for length, count in cut_stock.stock_pieces.iter_runs():
+                    needed[length] -= count * repeat
+        stock = BPDataStockPieces.from_counts(
+            [length for length in available if available[length] > 0], [count for count in available.values() if count > 0]
+        )
+        demand = BPDataStockPieces.from_counts(
+            [length for length in needed if needed[length] > 0], [count for count in needed.values() if count > 0]
+        )
+        self.__log.debug("Resolve keeps " + str(sum(amount for cut_stock, amount in kept)) + " stock pieces, cutting " + str(demand))
+        # The lengths are already in ticks, if in tick mode
+        options = {} if self.__time_limit is None else {"time_limit": self.__time_limit}
+        delta_cutter = BPCutter(stock, demand, self.__cut_width, self.__method if method is None else method, restarts=self.__restarts, seed=self.__seed, **options)
+        delta_cutter.cut()
+        result = BPDataCutterResult(
+            precision=self.__result.precision,
+            length_unit=self.__result.length_unit,
+            original_length_unit=self.__result.original_length_unit,
+            available_stock=self.__problem_stock,
+            tick_factor=self.__result.tick_factor
+        )
+        for cut_stock, amount in kept + delta_cutter.result.raw_cut_stock_list:
+            result.append(cut_stock, amount)
+        result.remaining_demand = delta_cutter.result.raw_remaining_demand
+        result.method = (delta_cutter.result.method or previous_result.method) + " (resolved)"
+        self.__result = result
+        return None
+
+    def improve(self, result: BPDataCutterResult, time_budget_s: float = 1.0, seed: int = 0) -> BPDataCutterResult:
+        """
+        Improves a result by local search, within a time budget. The result must
+        have been produced by this instance, or by another instance with the same
+        stock, demand and settings.
+
+        Args:
+            result (BPDataCutterResult): The result to improve.
+            time_budget_s (float, optional): The time budget in seconds. Defaults to 1.0.
+            seed (int, optional): The seed of the random moves. Defaults to 0.
+
+        Returns:
+            BPDataCutterResult: The best result found, which is the given result if
+                no improvement was found.
+        """
+        self.__set_controls(math.inf, -math.inf, BPCancelToken())
+        return self.__run(self.__improve(result, time_budget_s, seed, result.method + " + Local Search"))
+
+    @staticmethod
+    def cut_many(
+            problems,
+            workers: int = 0,
+            method: METHOD = METHOD.OPT,
+            length_unit: str = "NONE",
+            original_length_unit: str = "NONE",
+            precision: int = 0,
+            chunksize: int = 0
+            ) -> None:
         """
-        min_waste = max(self.__stock)
+        Cuts many independent problems with the same settings, yielding the result
+        of each problem in the order of the problems, as soon as it and all problems
+        before it are done.
+
+        Identical problems, with the same stock, demand and cut width in any order,
+        are only cut once, and share the same result object. The problems are sent
+        in chunks to a pool of processes, with the settings, so that the overhead
+        of each problem is small.
+
+        Args:
+            problems (iterable): The problems, as (stock, demand, cut_width) tuples of
+                BPDataStockPieces, BPDataStockPieces and float.
+            workers (int, optional): The number of processes. Defaults to 0, meaning
+                the number of CPUs. With 1 process, or only one distinct problem, the
+                problems are cut in this process.
+            method (METHOD, optional): The cutting method. Defaults to METHOD.OPT.
+            length_unit (str, optional): The unit of length for stock pieces. Defaults to "NONE".
+            original_length_unit (str, optional): The original unit of length for stock pieces. Defaults to "NONE".
+            precision (int, optional): The precision for calculations. Defaults to 0.
+            chunksize (int, optional): The number of problems sent to a process at a
+                time. Defaults to 0, meaning about four chunks per process.
+
+        Yields:
+            BPDataCutterResult: The result of each problem.
+        """
+        settings = {
+            "method": method,
+            "length_unit": length_unit,
+            "original_length_unit": original_length_unit,
+            "precision": precision
+        }
+        # The distinct problems, in the order of their first occurrence
+        unique = {}
+        order = []
+        for stock, demand, cut_width in problems:
+            key = BPCache.key(stock, demand, float(cut_width), method.name, precision, length_unit, original_length_unit, {})
+            if key not in unique:
+                unique[key] = (stock, demand, float(cut_width))
+            order.append(key)
+        keys = list(unique.keys())
+        workers = (os.cpu_count() or 1) if workers == 0 else workers
+        if workers == 1 or len(keys) <= 1:
+            results = map(functools.partial(_cut_many_cut, settings), unique.values())
+            executor = None
+        else:
+            workers = min(workers, len(keys))
+            chunksize = max(1, len(keys) // (4 * workers)) if chunksize == 0 else chunksize
+            stop = BPCancelToken(shared=True)
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_cut_many_init, initargs=(stop,))
+            results = executor.map(functools.partial(_cut_many_cut, settings), unique.values(), chunksize=chunksize)
+        try:
+            done = {}
+            for key in order:
+                # The first occurrences are in order, so every problem waits at most for its own result
+                while key not in done:
+                    done[keys[len(done)]] = next(results)
+                yield done[key]
+        finally:
+            if executor is not None:
+                BPCutter.__shutdown_pool(executor, stop)
+
+    # ******** Experimental Cut ********
+
+    def __experimental_cut_iteration(self, stock, demand, stock_in_use, open_boards, rng=None) -> bool:
+        """
+        Perform one iteration of the experimental cutting algorithm, placing the
+        demanded piece that leaves the least waste on its tightest fitting board.
+
+        Args:
+            stock (BPDataStockPieces): The stock not yet in use.
+            demand (BPDataStockPieces): The remaining demand.
+            stock_in_use (list): The boards in use, as [stock length, remaining, pieces, used].
+            open_boards (list): Sorted (remaining, index) of the boards in stock_in_use
+                that can still fit a piece.
+            rng (random.Random, optional): For a randomized variant, the waste of each
+                piece is perturbed by up to 25% before comparison. Defaults to None.
+
+        Returns:
+            bool: True if a piece was placed.
+        """
+        min_waste = self.__stock.max_length() if rng is None else math.inf
         demand.clean()
+        # Retire boards with a remainder shorter than any remaining demand, they can not be used again
+        del open_boards[:bisect_left(open_boards, (demand.min_length(), -1))]
         result = None
         for piece in demand.keys():
-            for i in range(len(stock_in_use)):
-                if piece <= stock_in_use[i][1]:
-                    waste = stock_in_use[i][1] - (self.__cut_width + piece)
-                    if waste < min_waste:
-                        result = (piece, i)
-                        min_waste = waste
+            # The tightest fitting board, i.e. the least remainder that fits the piece, lowest index first
+            position = bisect_left(open_boards, (piece, -1))
+            if position < len(open_boards):
+                waste = open_boards[position][0] - (self.__cut_width + piece)
+                if rng is not None:
+                    waste *= rng.uniform(1.0, 1.25)
+                if waste < min_waste:
+                    result = (piece, open_boards[position][1], position)
+                    min_waste = waste
         if result != None:
+            del open_boards[result[2]]
             original_stock_length = stock_in_use[result[1]][0]
             if not stock_in_use[result[1]][3]:
                 if stock[original_stock_length] > 0:
                     stock_in_use.append([original_stock_length, original_stock_length, [], False])
+                    insort(open_boards, (original_stock_length, len(stock_in_use) - 1))
                     stock[original_stock_length] -= 1
             stock_in_use[result[1]][1] = max(0.0, stock_in_use[result[1]][1] - (result[0] + self.__cut_width))
             stock_in_use[result[1]][2].append(result[0])
             stock_in_use[result[1]][3] = True
+            insort(open_boards, (stock_in_use[result[1]][1], result[1]))
             demand[result[0]] -= 1
             return True
         else:
@@ -220,40 +1005,38 @@ class BPCutter:
         is_available = False
         for key, value in stock.items():
             if value > 0:
-                is_available = True 
+                is_available = True
                 stock[key] -= 1
                 stock_in_use.append([key, key, [], False])
         return is_available
-            
-    def __experimental_cut(self) -> BPDataCutterResult:
+           
+    def __experimental_cut(self, rng=None, progress=None) -> BPDataCutterResult:
         """
-        Perform the experimental cutting operation.
+        Perform the experimental cutting operation. A randomized variant
+        also shuffles the preference of the initial stock.
 
-        Returns:
-            BPDataCutterResult: [description]
-        """
-        return max(self.__experimental_cut_iter())[2]
-
-    def __experimental_cut_iter(self) -> BPDataCutterResult:
-        """
-        Perform the experimental cutting operation iteratively.
+        Args:
+            rng (random.Random, optional): The random generator of a randomized variant.
+                Defaults to None.
+            progress (callable, optional): Called as progress(name, fraction) at every
+                step, see cut_iter(). Defaults to None.
 
-        Yields:
-            BPDataCutterResult: [description]
+        Returns:
+            BPDataCutterResult: The result of the cutting operation.
         """
         demand = self.__demand.copy()
         stock = self.__stock.copy()
-        experimental_result = BPDataCutterResult(
-            precision=self.__result.precision,
-            length_unit=self.__result.length_unit,
-            original_length_unit=self.__result.original_length_unit,
-            available_stock=self.__stock
-        )
+        experimental_result = self.__new_result()
         stock_in_use = []
         self.__experimental_cut_add_stock(stock, stock_in_use)
+        if rng is not None:
+            rng.shuffle(stock_in_use)
+        open_boards = sorted((stock_to_use[1], i) for i, stock_to_use in enumerate(stock_in_use))
+        total = max(1, len(demand))
         while True:
-            yield (False, "Experimental Cut", None, len(demand))
-            if not self.__experimental_cut_iteration(stock, demand, stock_in_use):
+            if progress is not None and progress("Experimental Cut", 1.0 - len(demand) / total):
+                yield
+            if self.__stop_requested() or not self.__experimental_cut_iteration(stock, demand, stock_in_use, open_boards, rng):
                 break
 
         for stock_to_use in stock_in_use:
@@ -262,111 +1045,859 @@ class BPCutter:
                     BPDataCutStock(
                         stock_to_use[0],
                         self.__cut_width,
-                        BPDataStockPieces(stock_to_use[2])
+                        BPDataStockPieces.from_iterable(stock_to_use[2])
                     )
                 )
 
-        experimental_result.remaining_demand = demand
+        experimental_result.remaining_demand = demand + self.__unplaceable
         experimental_result.method = "Experimental"
 
-        yield (True, "Experimental Cut", experimental_result, len(demand))
+        return experimental_result
 
-    # ******** Greedy Cut ******** 
+    # ******** Greedy Cut ********
 
-    def __greedy_cut_iteration(self, stock: float, demand: BPDataStockPieces, cut: float):
+    def __greedy_cut_iteration(self, stock: float, lengths: list, counts: list, cut: float, undo_log: list) -> float:
         """
-        Perform one iteration of the greedy cutting algorithm.
+        Perform one iteration of the greedy cutting algorithm, filling one stock piece
+        with the longest demanded lengths first. The demand counts are decremented in
+        place, and every change is recorded in the undo log as (index, taken), so
+        that the caller can roll back the iteration without any copying.
 
         Args:
-            stock (float): [description]
-            demand (BPDataStockPieces): [description]
-            cut (float): [description]
+            stock (float): The length of the stock piece to fill.
+            lengths (list): The demanded lengths, in descending order.
+            counts (list): The demanded count for each length, decremented in place.
+            cut (float): The width of a cut.
+            undo_log (list): The list to record the changes to counts in.
 
         Returns:
-            [type]: [description]
+            float: The total waste, remaining stock and cuts.
         """
-        result = BPDataStockPieces()
         cut_waste = 0.0
-        number_of_cuts = 0
-        remaining_demand = demand.copy()
         remanining_stock = stock
-        for length in remaining_demand.keys():
-            while True:
-                if remaining_demand[length] > 0:
-                    if remanining_stock >= length:
-                        remanining_stock = remanining_stock - length - min(cut, (remanining_stock - length))
-                        remaining_demand[length] -= 1
-                        result.append(length)
-                        cut_waste += cut
-                        number_of_cuts += 1
-                    else:
-                        break
-                else:
-                    break
-        return {
-            "result": result,
-            "waste": remanining_stock,
-            "remaining_demand": remaining_demand,
-            "tot_waste": remanining_stock + cut_waste,
-            "number_of_cuts": number_of_cuts
-        }
+        for index in range(len(lengths)):
+            length = lengths[index]
+            taken = 0
+            while counts[index] > 0 and remanining_stock >= length:
+                remanining_stock = remanining_stock - length - min(cut, (remanining_stock - length))
+                counts[index] -= 1
+                cut_waste += cut
+                taken += 1
+            if taken > 0:
+                undo_log.append((index, taken))
+        return remanining_stock + cut_waste
+
+    def __greedy_cut_rollback(self, counts: list, undo_log: list) -> None:
+        """
+        Roll back the changes of a greedy iteration.
+
+        Args:
+            counts (list): The demanded count for each length.
+            undo_log (list): The changes recorded by the greedy iteration.
+        """
+        for index, taken in undo_log:
+            counts[index] += taken
 
-    def __greedy_cut(self) -> BPDataCutterResult:
+    def __greedy_cut_repeat(self, available: int, counts: list, undo_logs: dict, optimal_length: float) -> int:
         """
-        Perform the greedy cutting operation.
+        Calculate how many times in a row the greedy algorithm would select the
+        same pattern. The pattern is repeated as long as there is stock for it, and
+        as long as the reduced demand leaves the pattern of every evaluated stock
+        length unchanged, so that the outcome is identical to one round per board.
+
+        Args:
+            available (int): The number of available stock pieces of the optimal length.
+            counts (list): The demanded count for each length, before the pattern is applied.
+            undo_logs (dict): The pattern, as an undo log, for each evaluated stock length.
+            optimal_length (float): The stock length of the selected pattern.
 
         Returns:
-            BPDataCutterResult: [description]
+            int: The number of times the pattern can be applied.
         """
-        return max(self.__greedy_cut_iter())[2]
+        repeat = available
+        for index, used in undo_logs[optimal_length]:
+            for undo_log in undo_logs.values():
+                candidate_used = next((taken for candidate_index, taken in undo_log if candidate_index == index), 0)
+                repeat = min(repeat, (counts[index] - candidate_used) // used + 1)
+        return max(1, repeat)
 
-    def __greedy_cut_iter(self) -> BPDataCutterResult:
+    def __greedy_cut(self, rng=None, progress=None) -> BPDataCutterResult:
         """
-        Perform the greedy cutting operation iteratively.
+        Perform the greedy cutting operation. The demand is kept as flat
+        lists of lengths and counts, and only the selected pattern of each round is
+        turned into a BPDataStockPieces.
 
-        Yields:
-            BPDataCutterResult: [description]
+        A randomized variant walks the lengths in a perturbed order, with each length
+        weighted by up to 20% either way, evaluates the stock lengths in a shuffled
+        order, and breaks ties between equal waste at random.
+
+        Args:
+            rng (random.Random, optional): The random generator of a randomized variant.
+                Defaults to None.
+            progress (callable, optional): Called as progress(name, fraction) at every
+                step, see cut_iter(). Defaults to None.
+
+        Returns:
+            BPDataCutterResult: The result of the cutting operation.
         """
-        demand = self.__demand.copy()
+        lengths = self.__demand.keys()
+        counts = self.__demand.values()
+        stock_lengths = self.__stock.keys()
+        if rng is not None:
+            order = sorted(range(len(lengths)), key=lambda index: lengths[index] * rng.uniform(0.8, 1.2), reverse=True)
+            lengths = [lengths[index] for index in order]
+            counts = [counts[index] for index in order]
+            rng.shuffle(stock_lengths)
+        remaining = sum(counts)
+        total = max(1, remaining)
         stock = self.__stock.copy()
-        greedy_result = BPDataCutterResult(
-            precision=self.__result.precision,
-            length_unit=self.__result.length_unit,
-            original_length_unit=self.__result.original_length_unit,
-            available_stock=self.__stock
-        )
+        greedy_result = self.__new_result()
 
         while True:
-            if len(stock) <= 0:
+            if len(stock) <= 0 or self.__stop_requested():
                 break
-            result = {}
-            min_waste = max(stock)
+            undo_logs = {}
+            min_waste = math.inf
             optimal_length = None
-            for stock_length in stock.keys():
+            for stock_length in stock_lengths:
                 if stock[stock_length] > 0:
-                    result[stock_length] = self.__greedy_cut_iteration(stock_length, demand, self.__cut_width)
-                    if result[stock_length]["tot_waste"] < min_waste: 
-                        min_waste = result[stock_length]["tot_waste"]
+                    undo_log = []
+                    tot_waste = self.__greedy_cut_iteration(stock_length, lengths, counts, self.__cut_width, undo_log)
+                    self.__greedy_cut_rollback(counts, undo_log)
+                    undo_logs[stock_length] = undo_log
+                    if tot_waste < min_waste or (rng is not None and tot_waste == min_waste and rng.random() < 0.5):
+                        min_waste = tot_waste
                         optimal_length = stock_length
-                yield (False, "Greedy Cut", None, len(demand))
+                if progress is not None and progress("Greedy Cut", 1.0 - remaining / total):
+                    yield
             if optimal_length == None:
                 break
-            if len(result[optimal_length]["result"]) == 0:
+            if len(undo_logs[optimal_length]) == 0:
                 break
-            demand = result[optimal_length]["remaining_demand"]
+            repeat = self.__greedy_cut_repeat(stock[optimal_length], counts, undo_logs, optimal_length)
+            for index, taken in undo_logs[optimal_length]:
+                counts[index] -= taken * repeat
+                remaining -= taken * repeat
             cut_stock = BPDataCutStock(
                 optimal_length,
                 self.__cut_width,
-                result[optimal_length]["result"]
+                BPDataStockPieces.from_counts(
+                    [lengths[index] for index, taken in undo_logs[optimal_length]],
+                    [taken for index, taken in undo_logs[optimal_length]]
+                ) if rng is not None else
+                BPDataStockPieces.from_sorted_pairs((lengths[index], taken) for index, taken in undo_logs[optimal_length])
+            )
+            greedy_result.append(cut_stock, repeat)
+            stock[optimal_length] -= repeat
+
+        if rng is not None:
+            remaining_demand = BPDataStockPieces.from_counts(
+                [length for length, count in zip(lengths, counts) if count > 0],
+                [count for count in counts if count > 0]
             )
-            greedy_result.append(cut_stock)
-            stock[optimal_length] -= 1
-
-        remaining_demand = BPDataStockPieces()
-        for key in demand.keys():
-            if demand[key] > 0:
-                remaining_demand[key] = demand[key]
-        greedy_result.remaining_demand = remaining_demand
-        
+        else:
+            remaining_demand = BPDataStockPieces.from_sorted_pairs(
+                (length, count) for length, count in zip(lengths, counts) if count > 0
+            )
+        greedy_result.remaining_demand = remaining_demand + self.__unplaceable
+       
         greedy_result.method = "Greedy Cut"
-        yield (True, "Greedy Cut", greedy_result, len(demand))
\ No newline at end of file
+        return greedy_result
+
+    # ******** Multistart Cut ********
+
+    def __multistart_runs(self) -> list:
+        """
+        Get the runs of the multistart cutting operation, the greedy and experimental
+        methods, followed by their randomized variants for each seed.
+
+        Returns:
+            list: The runs, as (method, seed) tuples, where the seed is None for the
+                deterministic methods.
+        """
+        runs = [(self.METHOD.GREEDY, None), (self.METHOD.EXPERIMENTAL, None)]
+        for seed in range(self.__seed, self.__seed + self.__restarts):
+            runs += [(self.METHOD.GREEDY, seed), (self.METHOD.EXPERIMENTAL, seed)]
+        return runs
+
+    def __multistart_reduce(self, runs: list, results: list) -> BPDataCutterResult:
+        """
+        Select the best result of the multistart cutting operation, the one with the
+        least remaining demand, then the least waste, then the first run, so that the
+        same seeds always give the same result. The statistics of each run are kept.
+
+        Args:
+            runs (list): The runs, as (method, seed) tuples.
+            results (list): The result of each run.
+
+        Returns:
+            BPDataCutterResult: The best result.
+        """
+        self.__statistics = [
+            {
+                "method": method.name,
+                "seed": seed,
+                "total_waste": result.total_waste,
+                "used_stock": result.used_stock.count(),
+                "remaining_demand": result.remaining_demand.count()
+            }
+            for (method, seed), result in zip(runs, results)
+        ]
+        best = min(range(len(results)), key=lambda index: (len(results[index].raw_remaining_demand), results[index].total_waste, index))
+        self.__log.debug("Best multistart run: " + str(self.__statistics[best]))
+        results[best].method = "Multistart " + results[best].method
+        return results[best]
+
+    def __multistart_run(self, method: METHOD, seed: int, progress=None) -> BPDataCutterResult:
+        """
+        Perform one run of the multistart cutting operation.
+
+        Args:
+            method (METHOD): METHOD.GREEDY or METHOD.EXPERIMENTAL.
+            seed (int): The seed of the randomized variant, or -1 for the deterministic method.
+            progress (callable, optional): Called as progress(name, fraction) at every
+                step, see cut_iter(). Defaults to None.
+
+        Returns:
+            BPDataCutterResult: The result of the run.
+        """
+        engine = self.__greedy_cut if method == self.METHOD.GREEDY else self.__experimental_cut
+        result = yield from engine(None if seed < 0 else random.Random(seed), progress)
+        if seed >= 0:
+            result.method += f" (seed {seed})"
+        return result
+
+    def __multistart_cut(self, progress=None) -> BPDataCutterResult:
+        """
+        Perform the multistart cutting operation, one run at a time, until all runs
+        are done, a result reaches the waste target, or the cut is stopped.
+
+        Args:
+            progress (callable, optional): Called as progress(name, fraction) at every
+                step, see cut_iter(). Defaults to None.
+
+        Returns:
+            BPDataCutterResult: The result of the cutting operation.
+        """
+        runs = self.__multistart_runs()
+        results = []
+        for index, (method, seed) in enumerate(runs):
+            run_progress = None if progress is None else (
+                lambda name, fraction, index=index: progress("Multistart Cut", (index + fraction) / len(runs))
+            )
+            results.append((yield from self.__multistart_run(method, -1 if seed is None else seed, run_progress)))
+            if self.__target_reached(results[-1]) or self.__stop_requested():
+                break
+        return self.__multistart_reduce(runs, results)
+
+    def __multistart_parallel_cut(self, workers: int) -> BPDataCutterResult:
+        """
+        Perform the multistart cutting operation with the runs in a pool of processes.
+        The cutter is sent once to every process, and all runs are completed, so that
+        the result is the same as without processes, unless a result reaches the waste
+        target or the cut is stopped, when the runs not completed are stopped and ignored.
+
+        Args:
+            workers (int): The number of processes.
+
+        Returns:
+            BPDataCutterResult: The result of the cutting operation.
+        """
+        runs = self.__multistart_runs()
+        stop = BPCancelToken(shared=True)
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_portfolio_init, initargs=(self.__worker_cutter(), stop))
+        try:
+            futures = [executor.submit(_portfolio_cut, method, seed, self.__deadline) for method, seed in runs]
+            pending = set(futures)
+            while len(pending) > 0 and not self.__stop_requested():
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                if any(self.__target_reached(future.result()) for future in done):
+                    break
+            # The runs stopped by the shutdown are not complete
+            completed = [index for index, future in enumerate(futures) if future.done() and not future.cancelled()]
+        finally:
+            self.__shutdown_pool(executor, stop)
+        if len(completed) == 0:
+            return self.__stopped_result("Multistart Cut")
+        return self.__multistart_reduce([runs[index] for index in completed], [futures[index].result() for index in completed])
+
+    # ******** Anytime Cut ********
+
+    def __anytime_cut(self, progress=None) -> BPDataCutterResult:
+        """
+        Perform the anytime cutting operation, the greedy cutting operation followed
+        by local search until the time limit.
+
+        Args:
+            progress (callable, optional): Called as progress(name, fraction) at every
+                step, and as progress(name, fraction, result) with every improved
+                result, see cut_iter(). Defaults to None.
+
+        Returns:
+            BPDataCutterResult: The result of the cutting operation.
+        """
+        time_budget_s = 1.0 if self.__time_limit is None else self.__time_limit
+        start = time.monotonic()
+        deadline = start + time_budget_s
+        greedy_progress = None if progress is None else (
+            lambda name, fraction: progress("Anytime Cut", self.__time_progress(start, deadline))
+        )
+        greedy_result = yield from self.__greedy_cut(None, greedy_progress)
+        greedy_result.method = "Anytime Cut"
+        if progress is not None and progress("Anytime Cut", self.__time_progress(start, deadline), greedy_result):
+            yield
+        return (yield from self.__improve(greedy_result, max(0.0, deadline - time.monotonic()), 0, "Anytime Cut", progress))
+
+    def __improve(self, result: BPDataCutterResult, time_budget_s: float, seed: int, method: str, progress=None) -> BPDataCutterResult:
+        """
+        Improve a result iteratively by ruin and recreate moves, accepted by simulated
+        annealing. Each move removes a few boards, preferably those with the most
+        waste, and places their pieces together with the remaining demand again,
+        longest first in slightly random order, on the board with the least remainder
+        that fits, or on a new board of the stock length that the pieces fill best.
+        New boards are then moved to the shortest stock that holds their pieces.
+
+        The boards are kept as (stock length, load, pieces) tuples, where the load is
+        the length of the pieces including one cut each, so a move is evaluated by
+        the change in used stock length alone. BPDataCutStock objects are only
+        created for improved results.
+
+        Args:
+            result (BPDataCutterResult): The result to improve.
+            time_budget_s (float): The time budget in seconds.
+            seed (int): The seed of the random moves.
+            method (str): The method name of the improved results.
+            progress (callable, optional): Called as progress(name, fraction) every 100
+                moves, and as progress(name, fraction, result) with every improved
+                result, see cut_iter(). Defaults to None.
+
+        Returns:
+            BPDataCutterResult: The best result found.
+        """
+        start = time.monotonic()
+        deadline = start + time_budget_s
+        rng = random.Random(seed)
+        cut_width = self.__cut_width
+        boards = []
+        pool = {key: value for key, value in self.__problem_stock.iter_runs() if key > 0.0}
+        for cut_stock, amount in result.raw_cut_stock_list:
+            pieces = tuple(cut_stock.stock_pieces)
+            load = sum(piece + cut_width for piece in pieces)
+            boards += [(cut_stock.stock_length, load, pieces)] * amount
+            pool[cut_stock.stock_length] -= amount
+        unplaced = list(result.raw_remaining_demand)
+        stock_lengths = sorted(pool.keys())
+        # Any remaining piece costs more than a board of any length
+        penalty = 2.0 * stock_lengths[-1] if len(stock_lengths) > 0 else 1.0
+        temperature = 0.05 * (stock_lengths[-1] if len(stock_lengths) > 0 else 1.0)
+        cost = 0.0
+        best_cost = cost
+        best_result = result
+        iterations = 0
+
+        while len(boards) + len(unplaced) > 0 and time.monotonic() < deadline and not self.__stop_requested():
+            iterations += 1
+            if progress is not None and iterations % 100 == 0 and progress(method, self.__time_progress(start, deadline)):
+                yield
+
+            # Ruin
+            ruined = set()
+            if len(boards) > 0:
+                # Boards with more waste are more likely to be ruined
+                weights = [board[0] + cut_width - board[1] + 1.0 for board in boards]
+                ruined.update(rng.choices(range(len(boards)), weights, k=rng.randint(1, min(6, len(boards)))))
+            kept = [board for index, board in enumerate(boards) if index not in ruined]
+            new_pool = pool.copy()
+            delta = 0.0
+            pieces = list(unplaced)
+            for index in ruined:
+                new_pool[boards[index][0]] += 1
+                delta -= boards[index][0]
+                pieces += boards[index][2]
+            pieces.sort(key=lambda piece: piece * rng.uniform(0.9, 1.1), reverse=True)
+
+            # Recreate
+            opened = []
+            new_unplaced = []
+            for position, piece in enumerate(pieces):
+                best_index = None
+                best_free = None
+                for index in range(len(kept)):
+                    free = kept[index][0] - kept[index][1] - piece
+                    if free >= 0.0 and (best_free is None or free < best_free):
+                        best_index = index
+                        best_free = free
+                if best_index is None:
+                    stock_length = self.__improve_open(stock_lengths, new_pool, pieces[position:])
+                    if stock_length is None:
+                        new_unplaced.append(piece)
+                        continue
+                    new_pool[stock_length] -= 1
+                    kept.append((stock_length, 0.0, ()))
+                    opened.append(len(kept) - 1)
+                    best_index = len(kept) - 1
+                stock_length, load, board_pieces = kept[best_index]
+                kept[best_index] = (stock_length, load + piece + cut_width, board_pieces + (piece,))
+            for index in opened:
+                stock_length, load, board_pieces = kept[index]
+                new_pool[stock_length] += 1
+                stock_length = next(length for length in stock_lengths if load <= length + cut_width and new_pool[length] > 0)
+                new_pool[stock_length] -= 1
+                kept[index] = (stock_length, load, board_pieces)
+                delta += stock_length
+            delta += penalty * (len(new_unplaced) - len(unplaced))
+
+            # Accept
+            remaining_time = max(0.0, deadline - time.monotonic()) / time_budget_s if time_budget_s > 0.0 else 0.0
+            if delta <= 0.0 or rng.random() < math.exp(-delta / (temperature * remaining_time + 1e-9)):
+                boards = kept
+                pool = new_pool
+                unplaced = new_unplaced
+                cost += delta
+                if cost < best_cost:
+                    improved_result = self.__improve_result(result, boards, unplaced, method)
+                    if improved_result is not None:
+                        best_cost = cost
+                        best_result = improved_result
+                        if progress is not None and progress(method, self.__time_progress(start, deadline), best_result):
+                            yield
+                        if self.__target_reached(best_result):
+                            break
+
+        self.__log.debug("Local search iterations: " + str(iterations))
+        return best_result
+
+    def __improve_open(self, stock_lengths: list, pool: dict, pieces: list) -> float:
+        """
+        Select the stock length for a new board, the one with the least waste when
+        filled with the given pieces, longest first, as in the greedy cutting operation.
+
+        Args:
+            stock_lengths (list): The stock lengths, in ascending order.
+            pool (dict): The available amount of each stock length.
+            pieces (list): The pieces left to place, the first must fit the board.
+
+        Returns:
+            float: The stock length, or None if no available stock fits the first piece.
+        """
+        min_waste = None
+        optimal_length = None
+        for stock_length in stock_lengths:
+            if pool[stock_length] > 0 and stock_length >= pieces[0]:
+                remaining = stock_length
+                for piece in pieces:
+                    if remaining >= piece:
+                        remaining = remaining - piece - min(self.__cut_width, remaining - piece)
+                if min_waste is None or remaining < min_waste:
+                    min_waste = remaining
+                    optimal_length = stock_length
+        return optimal_length
+
+    def __improve_result(self, result: BPDataCutterResult, boards: list, unplaced: list, method: str) -> BPDataCutterResult:
+        """
+        Create a result from the boards of the local search.
+
+        Args:
+            result (BPDataCutterResult): The result being improved.
+            boards (list): The boards, as (stock length, load, pieces) tuples.
+            unplaced (list): The pieces not placed on any board.
+            method (str): The method name of the result.
+
+        Returns:
+            BPDataCutterResult: The result, or None if a board is not valid due to
+                rounding of fractional lengths.
+        """
+        improved_result = BPDataCutterResult(
+            precision=result.precision,
+            length_unit=result.length_unit,
+            original_length_unit=result.original_length_unit,
+            available_stock=self.__problem_stock,
+            tick_factor=result.tick_factor
+        )
+        # Identical boards are added once, with their amount
+        patterns = {}
+        for stock_length, load, pieces in boards:
+            pattern = (stock_length, tuple(sorted(pieces, reverse=True)))
+            patterns[pattern] = patterns.get(pattern, 0) + 1
+        for (stock_length, pieces), amount in patterns.items():
+            cut_stock = BPDataCutStock(stock_length, self.__cut_width, BPDataStockPieces.from_iterable(pieces))
+            if not cut_stock.is_valid:
+                return None
+            improved_result.append(cut_stock, amount)
+        improved_result.remaining_demand = BPDataStockPieces.from_iterable(unplaced)
+        improved_result.method = method
+        return improved_result
+
+    # ******** Dynamic Programming Greedy Cut ********
+
+    def __dp_greedy_unit(self) -> int:
+        """
+        Get the number of integer units per length unit, the smallest power of ten
+        that makes all stock lengths, demanded lengths and the cut width integral.
+
+        Returns:
+            int: The number of units per length unit.
+        """
+        lengths = list(self.__stock.keys()) + list(self.__demand.keys()) + [self.__cut_width]
+        for decimals in range(7):
+            unit = 10**decimals
+            if all(abs(length * unit - round(length * unit)) < 1e-6 for length in lengths):
+                return unit
+        return unit
+
+    def __dp_greedy_knapsack(self, capacity: int, weights: list, values: list, bounds: tuple) -> tuple:
+        """
+        Solve a bounded knapsack problem by dynamic programming over the reachable
+        weights, in integer units. Each length is split into chunks of 1, 2, 4, ...
+        pieces, which are then treated as 0/1 items. For every reachable weight only
+        the highest value is kept, together with the chunks leading to it.
+
+        Args:
+            capacity (int): The capacity of the knapsack.
+            weights (list): The weight of each item.
+            values (list): The value of each item.
+            bounds (tuple): The maximum number of each item.
+
+        Returns:
+            tuple: The number of each item in the best solution.
+        """
+        # Reachable weight -> (value, chain), where chain is a linked list of (item, amount, chain)
+        table = {0: (0, None)}
+        for item in range(len(weights)):
+            bound = bounds[item]
+            chunk = 1
+            while bound > 0:
+                amount = min(chunk, bound)
+                bound -= amount
+                chunk *= 2
+                weight = weights[item] * amount
+                value = values[item] * amount
+                for reached, (reached_value, chain) in list(table.items()):
+                    new_weight = reached + weight
+                    if new_weight <= capacity and (new_weight not in table or table[new_weight][0] < reached_value + value):
+                        table[new_weight] = (reached_value + value, (item, amount, chain))
+        best = max(table.items(), key=lambda entry: (entry[1][0], -entry[0]))
+        counts = [0] * len(weights)
+        chain = best[1][1]
+        while chain is not None:
+            counts[chain[0]] += chain[1]
+            chain = chain[2]
+        return tuple(counts)
+
+    def __dp_greedy_repeat(self, available: int, counts: list, pattern: tuple, relevant: dict) -> int:
+        """
+        Calculate how many times in a row the same pattern would be selected. The
+        pattern is repeated as long as there is stock for it, and as long as the
+        reduced demand leaves the relevant demand of every evaluated stock length
+        unchanged, so that the outcome is identical to one round per board.
+
+        Args:
+            available (int): The number of available stock pieces for the pattern.
+            counts (list): The demanded count for each length, before the pattern is applied.
+            pattern (tuple): The number of pieces of each length in the pattern.
+            relevant (dict): The relevant demand for each evaluated stock length.
+
+        Returns:
+            int: The number of times the pattern can be applied.
+        """
+        repeat = available
+        for index in range(len(pattern)):
+            if pattern[index] > 0:
+                for capped in relevant.values():
+                    repeat = min(repeat, (counts[index] - capped[index]) // pattern[index] + 1)
+        return max(1, repeat)
+
+    def __dp_greedy_cut(self, progress=None) -> BPDataCutterResult:
+        """
+        Perform the dynamic programming greedy cutting operation. Each
+        round, every available stock length is filled with the best pattern, and
+        the stock length whose pattern leaves the smallest fraction of it unused,
+        the cuts counted as used, is selected.
+
+        The value of a piece grows faster than its length, so of two patterns that
+        fill the stock equally a pattern of fewer, longer pieces is preferred and
+        the short pieces are kept to fill the remaining stock.
+
+        The patterns are memoized on the stock length and the relevant demand, the
+        demanded counts capped at the number of pieces that fit the stock length,
+        so a pattern is only recalculated when the demand it depends on has changed.
+
+        Args:
+            progress (callable, optional): Called as progress(name, fraction) at every
+                step, see cut_iter(). Defaults to None.
+
+        Returns:
+            BPDataCutterResult: The result of the cutting operation.
+        """
+        lengths = self.__demand.keys()
+        counts = self.__demand.values()
+        remaining = sum(counts)
+        total = max(1, remaining)
+        stock = self.__stock.copy()
+        dp_greedy_result = self.__new_result()
+        # Lengths in integer units, the kerf is added to every piece and to the stock
+        unit = self.__dp_greedy_unit()
+        cut = round(self.__cut_width * unit)
+        weights = [round(length * unit) + cut for length in lengths]
+        values = [round((weight - cut) ** 1.2) for weight in weights]
+        patterns = {}
+
+        while not self.__stop_requested():
+            relevant = {}
+            min_waste = math.inf
+            optimal_length = None
+            for stock_length in stock.keys():
+                if stock[stock_length] > 0:
+                    capacity = round(stock_length * unit) + cut
+                    capped = tuple(min(count, capacity // weight) if weight > 0 else 0 for count, weight in zip(counts, weights))
+                    relevant[stock_length] = capped
+                    if (stock_length, capped) not in patterns:
+                        patterns[(stock_length, capped)] = self.__dp_greedy_knapsack(capacity, weights, values, capped)
+                    pattern = patterns[(stock_length, capped)]
+                    if sum(pattern) > 0:
+                        waste = (capacity - sum(weight * amount for weight, amount in zip(weights, pattern))) / capacity
+                        if waste < min_waste:
+                            min_waste = waste
+                            optimal_length = stock_length
+                if progress is not None and progress("DP Greedy Cut", 1.0 - remaining / total):
+                    yield
+            if optimal_length == None:
+                break
+            pattern = patterns[(optimal_length, relevant[optimal_length])]
+            repeat = self.__dp_greedy_repeat(stock[optimal_length], counts, pattern, relevant)
+            for index in range(len(pattern)):
+                counts[index] -= pattern[index] * repeat
+                remaining -= pattern[index] * repeat
+            cut_stock = BPDataCutStock(
+                optimal_length,
+                self.__cut_width,
+                BPDataStockPieces.from_sorted_pairs((length, amount) for length, amount in zip(lengths, pattern) if amount > 0)
+            )
+            dp_greedy_result.append(cut_stock, repeat)
+            stock[optimal_length] -= repeat
+
+        dp_greedy_result.remaining_demand = BPDataStockPieces.from_sorted_pairs(
+            (length, count) for length, count in zip(lengths, counts) if count > 0
+        ) + self.__unplaceable
+        dp_greedy_result.method = "DP Greedy Cut"
+        return dp_greedy_result
+
+    # ******** Best Fit Decreasing Cut ********
+
+    def __bfd_cut_place(self, board: list, length: float, count: int) -> int:
+        """
+        Place pieces of one length on a board, as many as fit up to count.
+
+        Args:
+            board (list): The board, as [stock length, remaining, runs], where runs
+                are the placed pieces as [length, count] in descending order.
+            length (float): The length of the pieces.
+            count (int): The maximum number of pieces to place.
+
+        Returns:
+            int: The number of pieces placed.
+        """
+        remaining = board[1]
+        placed = 0
+        while placed < count and remaining >= length:
+            remaining = remaining - length - min(self.__cut_width, (remaining - length))
+            placed += 1
+        if placed > 0:
+            board[1] = remaining
+            if len(board[2]) > 0 and board[2][-1][0] == length:
+                board[2][-1][1] += placed
+            else:
+                board[2].append([length, placed])
+        return placed
+
+    def __bfd_cut(self, progress=None) -> BPDataCutterResult:
+        """
+        Perform the best fit decreasing cutting operation. The demand is
+        processed one length at a time, longest first. Each piece is placed on the
+        open board with the least remainder that fits it, and when no open board
+        fits, the shortest available stock that fits is opened and filled with as
+        many pieces of the length as possible, since no other open board can fit
+        them for the rest of the length.
+
+        Args:
+            progress (callable, optional): Called as progress(name, fraction) at every
+                step, see cut_iter(). Defaults to None.
+
+        Returns:
+            BPDataCutterResult: The result of the cutting operation.
+        """
+        bfd_result = self.__new_result()
+        # Available stock in ascending order, exhausted lengths are removed
+        stock_lengths = []
+        stock_counts = []
+        for key, value in sorted(self.__stock.iter_runs()):
+            if key > 0.0:
+                stock_lengths.append(key)
+                stock_counts.append(value)
+        min_length = self.__demand.min_length()
+        remaining_count = self.__demand.count()
+        total = max(1, remaining_count)
+        remaining_demand = []
+        boards = []
+        # Sorted (remaining, index) of the boards that can still fit a piece
+        open_boards = []
+
+        for length, count in self.__demand.iter_runs():
+            if progress is not None and progress("Best Fit Decreasing", 1.0 - remaining_count / total):
+                yield
+            while count > 0 and not self.__stop_requested():
+                position = bisect_left(open_boards, (length, -1))
+                if position < len(open_boards):
+                    index = open_boards.pop(position)[1]
+                else:
+                    position = bisect_left(stock_lengths, length)
+                    if position == len(stock_lengths):
+                        break
+                    boards.append([stock_lengths[position], stock_lengths[position], []])
+                    index = len(boards) - 1
+                    stock_counts[position] -= 1
+                    if stock_counts[position] == 0:
+                        del stock_lengths[position]
+                        del stock_counts[position]
+                placed = self.__bfd_cut_place(boards[index], length, count)
+                count -= placed
+                remaining_count -= placed
+                if boards[index][1] >= min_length:
+                    insort(open_boards, (boards[index][1], index))
+            if count > 0:
+                remaining_demand.append((length, count))
+
+        # Identical boards are added once, with their amount
+        patterns = {}
+        for stock_length, remaining, runs in boards:
+            pattern = (stock_length, tuple((length, count) for length, count in runs))
+            patterns[pattern] = patterns.get(pattern, 0) + 1
+        for (stock_length, runs), amount in patterns.items():
+            bfd_result.append(
+                BPDataCutStock(
+                    stock_length,
+                    self.__cut_width,
+                    BPDataStockPieces.from_sorted_pairs(runs)
+                ),
+                amount
+            )
+
+        bfd_result.remaining_demand = BPDataStockPieces.from_sorted_pairs(remaining_demand) + self.__unplaceable
+        bfd_result.method = "Best Fit Decreasing"
+
+        return bfd_result
+
+    # ******** Exact Cut ********
+
+    def __exact_cut(self, progress=None) -> BPDataCutterResult:
+        """
+        Perform the exact cutting operation, using Gilmore-Gomory column
+        generation. Patterns are generated until the linear relaxation is optimal,
+        or the time limit is reached, after which the integer problem is solved over
+        the generated patterns. The greedy result is used as incumbent, and is
+        returned if the integer problem does not give a better result in time.
+
+        Args:
+            progress (callable, optional): Called as progress(name, fraction) at every
+                step, see cut_iter(). Defaults to None.
+
+        Returns:
+            BPDataCutterResult: The result of the cutting operation.
+        """
+        start = time.monotonic()
+        deadline = min(self.__deadline, math.inf if self.__time_limit is None else start + self.__time_limit)
+        greedy_result = yield from self.__greedy_cut()
+        if self.__target_reached(greedy_result) or self.__stop_requested():
+            return greedy_result
+        stock = {key: value for key, value in self.__stock.iter_runs() if key > 0.0}
+        lengths = [key for key, value in self.__demand.iter_runs()]
+        demand = [value for key, value in self.__demand.iter_runs()]
+        cut_width = self.__cut_width
+
+        # Initial patterns: homogeneous, and one greedy fill of the whole demand per stock length
+        patterns = bp_column_generation.homogeneous_patterns(stock, lengths, demand, cut_width)
+        for stock_length in stock:
+            counts = demand.copy()
+            self.__greedy_cut_iteration(stock_length, lengths, counts, cut_width, [])
+            patterns.append((stock_length, tuple(d - c for d, c in zip(demand, counts))))
+        patterns = list(dict.fromkeys(pattern for pattern in patterns if sum(pattern[1]) > 0))
+
+        while time.monotonic() < deadline and not self.__stop_requested():
+            if progress is not None and progress("Exact Cut", self.__time_progress(start, deadline)):
+                yield
+            relaxation = bp_column_generation.solve_master(stock, lengths, demand, patterns, False, self.__remaining_time(deadline))
+            if relaxation is None or time.monotonic() >= deadline:
+                break
+            new_patterns, exact = bp_column_generation.price_patterns(stock, lengths, demand, cut_width, relaxation["demand_duals"], relaxation["stock_duals"])
+            new_patterns = [pattern for pattern in new_patterns if pattern not in patterns]
+            if len(new_patterns) == 0:
+                break
+            patterns += new_patterns
+        self.__log.debug("Exact cut patterns: " + str(len(patterns)))
+
+        # A stopped cut, or one out of time, keeps the incumbent without solving the integer problem
+        if self.__stop_requested() or time.monotonic() >= deadline:
+            return greedy_result
+        solution = bp_column_generation.solve_master(stock, lengths, demand, patterns, True, self.__remaining_time(deadline))
+        if solution is None:
+            self.__log.warning("Exact cut found no integer solution, using the greedy result")
+            return greedy_result
+
+        unmet = [int(round(value)) for value in solution["unmet"]]
+        plan = [
+            [patterns[j][0], patterns[j][1], int(round(solution["usage"][j]))]
+            for j in range(len(patterns)) if round(solution["usage"][j]) > 0
+        ]
+        plan = bp_column_generation.remove_surplus(plan, lengths, [d - u for d, u in zip(demand, unmet)])
+
+        exact_result = self.__new_result()
+        for stock_length, counts, amount in plan:
+            cut_stock = BPDataCutStock(
+                stock_length,
+                cut_width,
+                BPDataStockPieces.from_sorted_pairs((lengths[i], counts[i]) for i in range(len(lengths)) if counts[i] > 0)
+            )
+            if cut_stock.is_valid:
+                exact_result.append(cut_stock, amount)
+            else:
+                # Only possible from rounding of fractional lengths, the pieces are left as remaining demand
+                self.__log.warning("Exact cut produced an invalid pattern: " + str(cut_stock))
+                for i in range(len(lengths)):
+                    unmet[i] += counts[i] * amount
+        exact_result.remaining_demand = BPDataStockPieces.from_sorted_pairs(
+            (lengths[i], unmet[i]) for i in range(len(lengths)) if unmet[i] > 0
+        ) + self.__unplaceable
+        exact_result.method = "Exact Cut"
+
+        if (len(exact_result.remaining_demand), exact_result.total_waste) > (len(greedy_result.remaining_demand), greedy_result.total_waste):
+            self.__log.debug("Exact cut did not improve on the greedy result")
+            exact_result = greedy_result
+        return exact_result
+
+    def __time_progress(self, start: float, deadline: float) -> float:
+        """
+        Get the fraction of the time from start to a deadline that has passed, as
+        the progress of an engine running until the deadline.
+
+        Args:
+            start (float): The start from time.monotonic().
+            deadline (float): The deadline from time.monotonic(), or math.inf.
+
+        Returns:
+            float: The fraction passed, or 0.0 if there is no deadline.
+        """
+        if deadline == math.inf or deadline <= start:
+            return 0.0
+        return min(1.0, (time.monotonic() - start) / (deadline - start))
+
+    def __remaining_time(self, deadline: float) -> float:
+        """
+        Get the time left until a deadline.
+
+        Args:
+            deadline (float): The deadline from time.monotonic(), or math.inf.
+
+        Returns:
+            float: The remaining time in seconds, or None if there is no deadline.
+        """
+        return None if deadline == math.inf else max(0.0, deadline - time.monotonic())
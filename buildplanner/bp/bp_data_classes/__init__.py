@@ -1,4 +1,5 @@
 # bp Cutter Classes
 from .bp_data_stockpieces import BPDataStockPieces
+from .bp_data_stockpieces_array import BPDataStockPiecesArray
 from .bp_data_cutstock import BPDataCutStock
 from .bp_data_cutterresult import BPDataCutterResult
\ No newline at end of file
@@ -42,17 +42,18 @@ class BPDataCutStock:
     @property
     def remaining_stock(self) -> float:
         """Calculate the remaining stock after cuts."""
-        precision = max(len(str(length).split(".")[1]) for length in self.stock_pieces)
-        return round(max(0.0, self.stock_length - sum(self.stock_pieces) - self.number_of_cuts * self.cut_width), precision)
+        remaining_stock = max(0.0, self.stock_length - self.stock_pieces.total_length() - self.number_of_cuts * self.cut_width)
+        # Lengths in integer ticks are exact, only fractional lengths need rounding
+        if float(remaining_stock).is_integer():
+            return float(remaining_stock)
+        precision = max(len(str(length).split(".")[1]) for length in self.stock_pieces.keys())
+        return round(remaining_stock, precision)
     
     @property
     def number_of_cuts(self) -> int:
         """Calculate the total number of cuts."""
-        length = 0.0
-        cuts = 0
-        for piece in self.stock_pieces:
-            length += piece + self.cut_width
-            cuts += 1
+        cuts = self.stock_pieces.count()
+        length = self.stock_pieces.total_length() + cuts * self.cut_width
         if length > self.stock_length: 
             cuts -= 1
         return cuts
@@ -60,7 +61,7 @@ class BPDataCutStock:
     @property 
     def is_valid(self) -> bool:
         """Check if the cut stock data is valid."""
-        return (sum(self.stock_pieces) + self.number_of_cuts * self.cut_width) <= self.stock_length
+        return (self.stock_pieces.total_length() + self.number_of_cuts * self.cut_width) <= self.stock_length
 
     # Constructor
     def __init__(self, stock_length: float, cut_width: float, stock_pieces: BPDataStockPieces) -> None:
@@ -24,6 +24,8 @@
 #
 #------------------------------------------------------------------------------
 
+import math
+
 from bp.bp_data_classes import BPDataStockPieces, BPDataCutStock
 from bp.bp_type_check import type_check_class
 from bp.bp_defs import *
@@ -43,6 +45,8 @@ class BPDataCutterResult:
     __original_length_unit:str
     __stock_height: float
     __stock_width: float
+    __tick_factor: float
+    __lower_bound: float
     method : str
 
     @property
@@ -91,10 +95,24 @@ class BPDataCutterResult:
             raise ValueError(f"{value} is an invalid scale value. Must be one of {scale_values}")
         self.__scale = value
     
+    @property
+    def tick_factor(self) -> float:
+        return self.__tick_factor
+
     @property
     def messages(self) -> str:
         return "\n".join(self.__messages)
 
+    @property
+    def raw_cut_stock_list(self) -> list:
+        """The (cut_stock, amount) pairs as appended, in the lengths of the cutter, without scaling."""
+        return list(self.__cut_stock_list)
+
+    @property
+    def raw_remaining_demand(self) -> BPDataStockPieces:
+        """The remaining demand in the lengths of the cutter, without scaling."""
+        return self.__remaining_demand
+
     @property
     def used_stock(self) -> BPDataStockPieces:
         return self.__scale_stock_pieces(self.__used_stock)
@@ -126,23 +144,45 @@ class BPDataCutterResult:
     @property
     def completed(self) -> bool:
         return len(self.remaining_demand) == 0
+
+    @property
+    def lower_bound(self) -> float:
+        """The lower bound on the total waste of any result meeting all demand, or None if unknown."""
+        return None if math.isnan(self.__lower_bound) else float(self.__scale_float(self.__lower_bound))
+
+    @lower_bound.setter
+    def lower_bound(self, value: float):
+        self.__lower_bound = value
+
+    @property
+    def optimality_gap(self) -> float:
+        """
+        The largest possible excess of the used stock length over the optimal, as a 
+        fraction of the used stock length, 0.0 for a proven optimal result. None if 
+        there is no lower bound, or if not all demand is met.
+        """
+        if math.isnan(self.__lower_bound) or len(self.__remaining_demand) > 0:
+            return None
+        used = sum(cut_stock.stock_length * amount for cut_stock, amount in self.__cut_stock_list)
+        excess = self.__total_waste - self.__lower_bound
+        return 0.0 if used <= 0.0 or excess <= 1e-9 * used else excess / used
     
     @property
     def cut_stock_list(self) -> list:
         cut_stock_dict = {}
         max_width = 0
-        for cut_stock in self.__cut_stock_list:
+        for cut_stock, amount in self.__cut_stock_list:
             cut_stock_scaled = self.__scale_cut_stock(cut_stock)
             key = str(hash(str(cut_stock_scaled)))
             if (key in cut_stock_dict):
-                cut_stock_dict[key]["amount"] += 1
+                cut_stock_dict[key]["amount"] += amount
             else:
-                cut_stock_dict[key] = {"amount":1, "cut_stock" : cut_stock_scaled}
+                cut_stock_dict[key] = {"amount":amount, "cut_stock" : cut_stock_scaled}
                 if cut_stock_scaled.stock_length > max_width: max_width = cut_stock_scaled.stock_length
         cut_stock_list = [inner_dict for outer_dict in cut_stock_dict.values() for inner_dict in [outer_dict]]
         return sorted(cut_stock_list, key=lambda x: (-x['cut_stock']['stock_length'], -x['amount'], x['cut_stock']['remaining_stock']))
 
-    def __init__(self, precision : int = 0, length_unit : str = "NONE", original_length_unit : str = "NONE", available_stock : BPDataStockPieces = BPDataStockPieces() ) -> None:
+    def __init__(self, precision : int = 0, length_unit : str = "NONE", original_length_unit : str = "NONE", available_stock : BPDataStockPieces = BPDataStockPieces(), tick_factor : float = 1.0 ) -> None:
         self.__cut_stock_list = []
         self.__used_stock = BPDataStockPieces()
         self.__remaining_demand = BPDataStockPieces()
@@ -159,11 +199,16 @@ class BPDataCutterResult:
         self.__original_length_unit = original_length_unit
         self.__stock_width = 0.0
         self.__stock_height = 0.0
+        # Number of integer ticks per original length unit, when lengths are
+        # given in ticks (see BPCutter tick mode), otherwise 1.0
+        self.__tick_factor = tick_factor
+        # Lower bound on the total waste, in the lengths of the cutter, NaN if unknown
+        self.__lower_bound = math.nan
         self.method = ""
 
     def __scale_stock_pieces(self, stock_pieces:BPDataStockPieces) -> BPDataStockPieces:
         stock_pieces_scaled = BPDataStockPieces()
-        scale_factor = length_unit_scale_factor[self.__length_unit]/length_unit_scale_factor[self.__original_length_unit]
+        scale_factor = length_unit_scale_factor[self.__length_unit]/length_unit_scale_factor[self.__original_length_unit]/self.__tick_factor
         precision = self.precision 
         for key,value in stock_pieces.items():
             stock_pieces_scaled[float(round(key*scale_factor,precision))] = value
@@ -177,7 +222,7 @@ class BPDataCutterResult:
         return cut_stock_scaled
     
     def __scale_float(self, f:float) -> float:
-        scale_factor = length_unit_scale_factor[self.__length_unit]/length_unit_scale_factor[self.__original_length_unit]
+        scale_factor = length_unit_scale_factor[self.__length_unit]/length_unit_scale_factor[self.__original_length_unit]/self.__tick_factor
         precision = self.precision 
         return float(round(f*scale_factor,precision))
     
@@ -198,11 +243,15 @@ class BPDataCutterResult:
     def items(self):
         return dict(zip(self.keys(),self.values())).items()
 
-    def append(self,cut_stock : BPDataCutStock) -> 'BPDataCutterResult':
+    def append(self,cut_stock : BPDataCutStock, amount : int = 1) -> 'BPDataCutterResult':
         assert(cut_stock.is_valid), f"The BPDataCutStock object is not valid:\n{cut_stock}"
-        self.__cut_stock_list.append(cut_stock)
-        self.__used_stock.append(cut_stock["stock_length"])
-        self.__total_waste += cut_stock["remaining_stock"]+cut_stock["number_of_cuts"]*cut_stock["cut_width"]
+        # The cut stock is stored once, together with the number of times it is repeated
+        self.__cut_stock_list.append((cut_stock, amount))
+        if cut_stock.stock_length in self.__used_stock:
+            self.__used_stock[cut_stock.stock_length] += amount
+        else:
+            self.__used_stock[cut_stock.stock_length] = amount
+        self.__total_waste += (cut_stock.remaining_stock+cut_stock.number_of_cuts*cut_stock.cut_width)*amount
         return self
 
     def __repr__(self):
@@ -288,6 +337,37 @@ class BPDataCutterResult:
         return str_result
     
     def to_html(self) -> str:
+        return BPDataCutterResult.html_report({"": self})
+
+    @staticmethod
+    def html_report(results: dict) -> str:
+        """
+        Compile the results of several cuts, such as one per cross-section profile,
+        into one page, with one section for each result.
+
+        Args:
+            results (dict): The results, keyed by the title of their section. A result 
+                with an empty title gets no section header.
+
+        Returns:
+            str: The page.
+        """
+        if len(results) == 0:
+            results = {"": BPDataCutterResult()}
+        methods = []
+        for result in results.values():
+            if result.method not in methods:
+                methods.append(result.method)
+        first = next(iter(results.values()))
+        return BPDataCutterResult.__html.format(
+                svg_fav_icon = bp_svg.svg_icon(),
+                html_sections = "".join(result.__html_section(title) for title, result in results.items()),
+                svg_bp_logo = bp_svg.svg_logo(),
+                method = ", ".join(methods),
+                scale = "" if first.__length_unit == "None" else length_unit_suffix[first.__length_unit]
+            )
+
+    def __html_section(self, title: str) -> str:
         svg_cutting_instruction = self.to_svg()
         html_cut_stock = ""
 
@@ -322,15 +402,13 @@ class BPDataCutterResult:
                 html_remaining_list = html_remaining_list
             )
 
-        # The compiled page
-        return self.__html.format(
-                svg_fav_icon = bp_svg.svg_icon(),
+        # The compiled section
+        return self.__html_section_template.format(
+                html_title = "" if title == "" else self.__html_title.format(title = title),
                 html_stock = html_stock,
                 html_cut_stock = html_cut_stock,
                 svg_cutting_instruction = svg_cutting_instruction,
-                svg_bp_logo = bp_svg.svg_logo(),
                 html_remaining_demand = html_remaining_demand,
-                method = self.method,
                 scale = "" if self.__length_unit == "None" else length_unit_suffix[self.__length_unit] 
             )
     
@@ -473,31 +551,12 @@ class BPDataCutterResult:
     __html_warning_icon = """<span class="glyphicon glyphicon-exclamation-sign"></span>&nbsp;"""
 
 
-    __html = """<head>
-    <meta charset="utf-8">
-    <meta http-equiv="X-UA-Compatible" content="IE=edge">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <title>Build Planner - Cutter Result</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@3.4.1/dist/css/bootstrap.min.css"
-        integrity="sha384-HSMxcRTRxnN+Bdg0JdbxYKrThecOKuH5zCYotlSAcp1+c8xmyTe9GYg1l9a69psu" crossorigin="anonymous">
-    <link rel="icon"
-        href="data:image/svg+xml,{svg_fav_icon}"
-        type="image/svg+xml">
-    <style>
-        .container svg {{
-            width: 100%;
-            height: auto;
-        }}
-    </style>
-</head>
-
-<body>
-    <div class="jumbotron">
-        <div class="container">
-            <h1>Build Planner</h1>
-            <p>This page contains the Build Planner cutter result, using method {method}.</p>
+    __html_title = """<div class="container">
+            <h2 class="sub-header">{title}</h2>
         </div>
-        {html_remaining_demand}
+        """
+
+    __html_section_template = """{html_title}{html_remaining_demand}
         <div class="container">
             <h2 class="sub-header">Needed Stock</h2>
             <div class="table-responsive">
@@ -537,7 +596,33 @@ class BPDataCutterResult:
             <h2 class="sub-header">Cutting instruction</h2>
             {svg_cutting_instruction}
         </div>
-        <div class="container" style="text-align: right;">  
+"""
+
+    __html = """<head>
+    <meta charset="utf-8">
+    <meta http-equiv="X-UA-Compatible" content="IE=edge">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>Build Planner - Cutter Result</title>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@3.4.1/dist/css/bootstrap.min.css"
+        integrity="sha384-HSMxcRTRxnN+Bdg0JdbxYKrThecOKuH5zCYotlSAcp1+c8xmyTe9GYg1l9a69psu" crossorigin="anonymous">
+    <link rel="icon"
+        href="data:image/svg+xml,{svg_fav_icon}"
+        type="image/svg+xml">
+    <style>
+        .container svg {{
+            width: 100%;
+            height: auto;
+        }}
+    </style>
+</head>
+
+<body>
+    <div class="jumbotron">
+        <div class="container">
+            <h1>Build Planner</h1>
+            <p>This page contains the Build Planner cutter result, using method {method}.</p>
+        </div>
+        {html_sections}        <div class="container" style="text-align: right;">  
             <hr>
             <div style="width: 20%; margin-left: auto;">
                 {svg_bp_logo}
@@ -28,6 +28,8 @@
 #
 #------------------------------------------------------------------------------
 
+from bisect import bisect_left
+from collections import Counter
 from dataclasses import dataclass
 
 from bp.bp_type_check import *
@@ -37,18 +39,40 @@ from bp.bp_utils import *
 @dataclass
 class BPDataStockPieces:
 
-    __stock_pieces : list
+    # Length -> count, giving O(1) lookup, update and increment
+    __counts : dict
+    # The distinct lengths in ascending order, maintained lazily
+    __lengths : list
+    __lengths_sorted : bool
+    # Iteration order of keys(), values(), items() and __iter__()
+    __reverse : bool
+    # Running total of all counts, and cached bounds of lengths with a count
+    __count : int
+    __max_length : float
+    __min_length : float
+    __bounds_valid : bool
+    # Copy-on-write: storage shared with copies until the first mutation
+    __shared : bool
+    __frozen : bool
+    __hash_value : int
+    __hash_valid : bool
 
     def __init__(self,stock_pieces={}):
         stock_pieces_data_ok = True
+        self.__counts = {}
+        self.__lengths = []
+        self.__lengths_sorted = True
+        self.__reverse = True
+        self.__count = 0
+        self.__bounds_valid = False
+        self.__shared = False
+        self.__frozen = False
+        self.__hash_valid = False
         if isinstance(stock_pieces,BPDataStockPieces):
             self.__init__(dict(stock_pieces))
         elif isinstance(stock_pieces,dict):
             if dict_contains_number_keys_and_int_values(stock_pieces):
-                self.__stock_pieces=[]
-                for key, value in stock_pieces.items():
-                    self.__stock_pieces.append({float(key):value})
-                self.__stock_pieces = sorted(self.__stock_pieces, key=lambda d: list(d.keys())[0],reverse=True)
+                self.__assign(convert_keys_to_float(stock_pieces), False)
             else:
                 stock_pieces_data_ok = False
         elif isinstance(stock_pieces,list):
@@ -56,7 +80,6 @@ class BPDataStockPieces:
                 self.__init__(make_list_quantitative_dict(stock_pieces))
             elif list_contains_dicts(stock_pieces):
                 if all(dict_contains_number_keys_and_int_values(dict(items)) for items in stock_pieces):
-                    self.__stock_pieces=[]
                     for item in stock_pieces:
                         self.update(BPDataStockPieces(item))
             else:
@@ -67,6 +90,101 @@ class BPDataStockPieces:
             stock_pieces_data_ok = False
         assert stock_pieces_data_ok, "Parameter 'stock_pieces' must be either a dict[float,int], a list[float], an int, or a float."
 
+    @classmethod
+    def from_counts(cls, lengths, counts) -> 'BPDataStockPieces':
+        """
+        Create an instance from parallel sequences of lengths and counts, without
+        validation. The lengths must be unique floats and the counts ints.
+
+        Args:
+            lengths: The piece lengths.
+            counts: The number of pieces for each length.
+
+        Returns:
+            BPDataStockPieces: The new instance.
+        """
+        stock_pieces = cls.__new__(cls)
+        stock_pieces.__assign(dict(zip(lengths, counts)), False)
+        return stock_pieces
+
+    @classmethod
+    def from_iterable(cls, stream) -> 'BPDataStockPieces':
+        """
+        Create an instance from an iterable of piece lengths in a single pass, 
+        without validation. The lengths must be floats.
+
+        Args:
+            stream: The piece lengths, one element per piece.
+
+        Returns:
+            BPDataStockPieces: The new instance.
+        """
+        stock_pieces = cls.__new__(cls)
+        stock_pieces.__assign(dict(Counter(stream)), False)
+        return stock_pieces
+
+    @classmethod
+    def from_sorted_pairs(cls, pairs, reverse: bool = True) -> 'BPDataStockPieces':
+        """
+        Create an instance from (length, count) pairs already sorted by unique
+        length, without validation or sorting.
+
+        Args:
+            pairs: The (length, count) pairs.
+            reverse (bool, optional): True if the pairs are in descending order. 
+                Defaults to True.
+
+        Returns:
+            BPDataStockPieces: The new instance.
+        """
+        stock_pieces = cls.__new__(cls)
+        stock_pieces.__assign(dict(pairs), True, reverse)
+        return stock_pieces
+
+    def __assign(self, counts: dict, is_sorted: bool, reverse: bool = True) -> None:
+        """Set the internal data from a length -> count dict in insertion order."""
+        self.__counts = counts
+        self.__lengths = list(counts)
+        if is_sorted and reverse:
+            self.__lengths.reverse()
+        self.__lengths_sorted = is_sorted
+        self.__reverse = True
+        self.__count = sum(counts.values())
+        self.__bounds_valid = False
+        self.__shared = False
+        self.__frozen = False
+        self.__hash_valid = False
+
+    def __prepare_mutation(self) -> None:
+        """Make the storage private to this instance before it is modified."""
+        assert not self.__frozen, "This instance of BPDataStockPieces is frozen and can not be modified"
+        if self.__shared:
+            self.__counts = self.__counts.copy()
+            self.__lengths = self.__lengths.copy()
+            self.__shared = False
+        self.__hash_valid = False
+
+    def freeze(self) -> 'BPDataStockPieces':
+        """Make this instance immutable, which also makes its hash cached."""
+        self.__frozen = True
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        return self.__frozen
+
+    def __sorted_lengths(self) -> list:
+        """Return the distinct lengths in ascending order, sorting only if needed."""
+        if not self.__lengths_sorted:
+            self.__lengths.sort()
+            self.__lengths_sorted = True
+        return self.__lengths
+
+    def __ordered_lengths(self) -> list:
+        """Return the distinct lengths in the current iteration order."""
+        lengths = self.__sorted_lengths()
+        return lengths[::-1] if self.__reverse else list(lengths)
+
     def __repr__(self):
         return str(dict(self))
     
@@ -74,16 +192,34 @@ class BPDataStockPieces:
         return str(dict(self))
     
     def keys(self):
-        return [list(d.keys())[0] for d in self.__stock_pieces]
+        return self.__ordered_lengths()
     
     def values(self):
-        return [list(d.values())[0] for d in self.__stock_pieces]
+        counts = self.__counts
+        return [counts[key] for key in self.__ordered_lengths()]
     
     def items(self):
-        return dict(zip(self.keys(),self.values())).items()
+        counts = self.__counts
+        return {key:counts[key] for key in self.__ordered_lengths()}.items()
     
     def copy(self):
-        return BPDataStockPieces(dict(zip(self.keys(),self.values())))
+        # The copy is an O(1) snapshot, sharing storage with this instance until 
+        # either of them is modified
+        stock_pieces = BPDataStockPieces.__new__(BPDataStockPieces)
+        stock_pieces.__counts = self.__counts
+        stock_pieces.__lengths = self.__lengths
+        stock_pieces.__lengths_sorted = self.__lengths_sorted
+        stock_pieces.__reverse = True
+        stock_pieces.__count = self.__count
+        stock_pieces.__bounds_valid = False
+        stock_pieces.__shared = True
+        stock_pieces.__frozen = False
+        stock_pieces.__hash_valid = False
+        self.__shared = True
+        return stock_pieces
+
+    def __contains__(self, key) -> bool:
+        return self.__counts.get(key,0) > 0
 
     def __getitem__(self, key) -> int: # As no annotation, the type check does not "kick in" 
         if isinstance(key,int):
@@ -92,82 +228,149 @@ class BPDataStockPieces:
             return list(self)[key]
         elif not isinstance(key,float):
             raise TypeError(f"Argument 'key' should be of type <class 'float'> but was {type(key)}")
-        elif not key in self.keys(): 
+        elif not key in self.__counts: 
             raise KeyError(f"The key '{key}' does not exists in this instance of BPDataStockPieces")
-        return dict(zip(self.keys(),self.values()))[key]
+        return self.__counts[key]
     
     def __setitem__(self, key : float, value : int) -> None:
-        for i in range(len(self.__stock_pieces)):
-            if key in self.__stock_pieces[i].keys():
-                self.__stock_pieces[i][key] = value
-                return None
-        new_item = {key:value}
-        self.__stock_pieces.append(new_item)
-        self.sort()
+        self.__prepare_mutation()
+        if key not in self.__counts:
+            if self.__lengths_sorted:
+                self.__lengths.insert(bisect_left(self.__lengths, key), key)
+            else:
+                self.__lengths.append(key)
+            self.__reverse = True
+            self.__count += value
+        else:
+            self.__count += value - self.__counts[key]
+        self.__counts[key] = value
+        self.__bounds_valid = False
 
     def append(self, piece_length : float):
-        if piece_length in self.keys(): self[piece_length] +=1
+        if piece_length in self.__counts: 
+            self.__prepare_mutation()
+            self.__counts[piece_length] += 1
+            self.__count += 1
+            self.__bounds_valid = False
         else: self[piece_length] = 1
 
     def update(self, stock_pieces : 'BPDataStockPieces') -> 'BPDataStockPieces':
-        for key in stock_pieces.keys():
-            self.__setitem__(key,stock_pieces[key])
+        for key, value in stock_pieces.items():
+            self.__setitem__(key,value)
         return self
 
     def __len__(self):
-        return sum(self.values())
+        return self.__count
     
     def __iter__(self):
-        for key in self.keys():
-            for i in range(self[key]):
+        counts = self.__counts
+        for key in self.__ordered_lengths():
+            for i in range(counts[key]):
                 yield key
 
+    def __update_bounds(self) -> None:
+        """Find the longest and shortest lengths with a positive count."""
+        counts = self.__counts
+        lengths = self.__sorted_lengths()
+        self.__max_length = next((key for key in reversed(lengths) if counts[key] > 0), 0.0)
+        self.__min_length = next((key for key in lengths if counts[key] > 0), 0.0)
+        self.__bounds_valid = True
+
     def max_length(self):
-        return max(self.keys()) if len(self)>0 else 0.0
+        if not self.__bounds_valid: self.__update_bounds()
+        return self.__max_length
     
     def min_length(self):
-        return min(self.keys()) if len(self)>0 else 0.0
+        if not self.__bounds_valid: self.__update_bounds()
+        return self.__min_length
+
+    def count(self) -> int:
+        """Return the total number of pieces, in O(1)."""
+        return self.__count
+
+    def iter_runs(self):
+        """Yield (length, count) for each length with pieces, in iteration order."""
+        counts = self.__counts
+        for key in self.__ordered_lengths():
+            if counts[key] > 0:
+                yield key, counts[key]
+
+    def weighted_sum(self, weight=None) -> float:
+        """
+        Return the sum of weight(length) over all pieces, computed per distinct 
+        length without expanding the pieces.
+
+        Args:
+            weight (optional): A function of the length. Defaults to the length itself.
+        """
+        if weight is None:
+            return sum((key * value for key, value in self.__counts.items() if value > 0), 0.0)
+        return sum((weight(key) * value for key, value in self.__counts.items() if value > 0), 0.0)
+
+    def total_length(self) -> float:
+        """Return the sum of the lengths of all pieces."""
+        return self.weighted_sum()
     
     def sort(self, reverse:bool=True) -> 'BPDataStockPieces':
-        self.__stock_pieces = sorted(self.__stock_pieces, key=lambda d: list(d.keys())[0],reverse=reverse)
+        # The order is part of the hash, so a frozen instance can not be sorted
+        self.__prepare_mutation()
+        self.__reverse = reverse
         return self
     
     def clean(self, min_value:float = 0.0) -> 'BPDataStockPieces':
-        self.__stock_pieces = [d for d in self.__stock_pieces if list(d.values())[0] > 0]
-        self.__stock_pieces = [d for d in self.__stock_pieces if list(d.keys())[0] >= min_value]
+        counts = self.__counts
+        removed = [key for key, value in counts.items() if value <= 0 or key < min_value]
+        if len(removed) > 0:
+            self.__prepare_mutation()
+            counts = self.__counts
+            for key in removed:
+                self.__count -= counts[key]
+                del counts[key]
+            self.__bounds_valid = False
+            self.__lengths = [key for key in self.__lengths if key in counts]
         return self
     
     def __iadd__(self, bp_data_stock_pieces : 'BPDataStockPieces') -> 'BPDataStockPieces':
+        self.__prepare_mutation()
         for key, value in bp_data_stock_pieces.items():
-            if key in self.keys():
-                self[key] += value
+            if key in self.__counts:
+                self.__counts[key] += value
+                self.__count += value
             else:
                 self[key] = value
+        self.__bounds_valid = False
         return self
 
     def __add__(self, bp_data_stock_pieces : 'BPDataStockPieces') -> 'BPDataStockPieces':
-        bp_data_stock_pieces_new = BPDataStockPieces(self)
-        for key, value in bp_data_stock_pieces.items():
-            if key in bp_data_stock_pieces_new.keys():
-                bp_data_stock_pieces_new[key] += value
-            else:
-                bp_data_stock_pieces_new[key] = value
+        bp_data_stock_pieces_new = self.copy()
+        bp_data_stock_pieces_new += bp_data_stock_pieces
         return bp_data_stock_pieces_new
     
     def __isub__(self, bp_data_stock_pieces : 'BPDataStockPieces') -> 'BPDataStockPieces':
+        self.__prepare_mutation()
+        counts = self.__counts
         for key, value in bp_data_stock_pieces.items():
-            if key in self.keys():
-                self[key] = max(0,self[key]-value)
+            if key in counts:
+                new_value = max(0,counts[key]-value)
+                self.__count += new_value - counts[key]
+                counts[key] = new_value
+        self.__bounds_valid = False
         return self
 
     def __sub__(self, bp_data_stock_pieces : 'BPDataStockPieces') -> 'BPDataStockPieces':
-        bp_data_stock_pieces_new = BPDataStockPieces(self)
-        for key, value in bp_data_stock_pieces.items():
-            if key in bp_data_stock_pieces_new.keys():
-                bp_data_stock_pieces_new[key] = max(0,bp_data_stock_pieces_new[key]-value)
+        bp_data_stock_pieces_new = self.copy()
+        bp_data_stock_pieces_new -= bp_data_stock_pieces
         return bp_data_stock_pieces_new
 
+    def __eq__(self, other):
+        if not isinstance(other,BPDataStockPieces):
+            return NotImplemented
+        return list(self.items()) == list(other.items())
+
     def __hash__(self):
-        return hash(str(self.__stock_pieces))
+        if not self.__hash_valid:
+            self.__hash_value = hash(tuple(self.items()))
+            self.__hash_valid = True
+        return self.__hash_value
 
 
@@ -0,0 +1,280 @@
+# SPDX-FileCopyrightText: 2023-2024 Magnus Pettersson
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#------------------------------------------------------------------------------
+#
+# File: bp_data_stockpieces_array.py
+# Author: Magnus Pettersson
+#
+# This module defines the BPDataStockPiecesArray class, a columnar variant of
+# BPDataStockPieces backed by two parallel NumPy arrays: the sorted unique
+# piece lengths and their counts. It has the same interface as
+# BPDataStockPieces, but the set algebra (addition, subtraction and cleaning)
+# as well as the length and count aggregates are done as vectorized merges
+# and masks instead of Python loops.
+#
+# The class is intended for large demands, with many thousands of distinct
+# lengths, and lets other layers access the underlying arrays without
+# copying. BPCutter takes it as stock or demand, converting it once, with the
+# tick quantization done on the arrays. NumPy is bundled with Blender, but
+# is an optional dependency outside of it.
+#
+#------------------------------------------------------------------------------
+
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+    ndarray = np.ndarray
+except ImportError:
+    np = None
+    ndarray = object
+
+from bp.bp_type_check import *
+from bp.bp_utils import *
+from bp.bp_data_classes import BPDataStockPieces
+
+@type_check_class
+@dataclass
+class BPDataStockPiecesArray:
+
+    # Unique lengths in ascending order, and the count for each length
+    __lengths : ndarray
+    __counts : ndarray
+    # Iteration order of keys(), values(), items() and __iter__()
+    __reverse : bool
+
+    def __init__(self,stock_pieces={}):
+        if np is None:
+            raise ImportError("BPDataStockPiecesArray requires numpy")
+        self.__reverse = True
+        if isinstance(stock_pieces,BPDataStockPiecesArray):
+            self.__lengths = stock_pieces.lengths.copy()
+            self.__counts = stock_pieces.counts.copy()
+        elif isinstance(stock_pieces,list) and list_contains_numbers(stock_pieces):
+            self.__lengths, self.__counts = np.unique(np.asarray(stock_pieces,dtype=np.float64),return_counts=True)
+            self.__counts = self.__counts.astype(np.int64)
+        else:
+            # Validation and conversion of all other formats are the same as for BPDataStockPieces
+            stock_pieces = BPDataStockPieces(stock_pieces)
+            lengths = np.fromiter(stock_pieces.keys(),dtype=np.float64,count=len(stock_pieces.keys()))
+            counts = np.fromiter(stock_pieces.values(),dtype=np.int64,count=len(lengths))
+            order = np.argsort(lengths,kind="stable")
+            self.__lengths = lengths[order]
+            self.__counts = counts[order]
+
+    @classmethod
+    def from_counts(cls, lengths, counts) -> 'BPDataStockPiecesArray':
+        """Create an instance from parallel sequences of unique lengths and counts, without validation."""
+        lengths = np.asarray(lengths,dtype=np.float64)
+        order = np.argsort(lengths,kind="stable")
+        return cls.__from_sorted_arrays(lengths[order],np.asarray(counts,dtype=np.int64)[order],True)
+
+    @classmethod
+    def from_iterable(cls, stream) -> 'BPDataStockPiecesArray':
+        """Create an instance from an iterable of piece lengths, without validation."""
+        lengths, counts = np.unique(np.fromiter(stream,dtype=np.float64),return_counts=True)
+        return cls.__from_sorted_arrays(lengths,counts.astype(np.int64),True)
+
+    @classmethod
+    def from_sorted_pairs(cls, pairs, reverse: bool = True) -> 'BPDataStockPiecesArray':
+        """Create an instance from (length, count) pairs sorted by unique length, without validation."""
+        pairs = list(pairs)
+        lengths = np.fromiter((pair[0] for pair in pairs),dtype=np.float64,count=len(pairs))
+        counts = np.fromiter((pair[1] for pair in pairs),dtype=np.int64,count=len(pairs))
+        if reverse:
+            lengths, counts = lengths[::-1].copy(), counts[::-1].copy()
+        return cls.__from_sorted_arrays(lengths,counts,True)
+
+    @property
+    def lengths(self) -> ndarray:
+        """Read only view of the unique lengths, in ascending order."""
+        view = self.__lengths.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def counts(self) -> ndarray:
+        """Read only view of the counts, matching lengths."""
+        view = self.__counts.view()
+        view.flags.writeable = False
+        return view
+
+    @classmethod
+    def __from_sorted_arrays(cls, lengths, counts, reverse: bool) -> 'BPDataStockPiecesArray':
+        """Create an instance from sorted arrays, taken as they are, without running __init__."""
+        bp_data_stock_pieces_new = cls.__new__(cls)
+        bp_data_stock_pieces_new.__lengths = lengths
+        bp_data_stock_pieces_new.__counts = counts
+        bp_data_stock_pieces_new.__reverse = reverse
+        return bp_data_stock_pieces_new
+
+    def __from_arrays(self, lengths, counts) -> 'BPDataStockPiecesArray':
+        """Create a new instance sharing the iteration order, from sorted arrays."""
+        return self.__from_sorted_arrays(lengths,counts,self.__reverse)
+
+    def to_stock_pieces(self) -> BPDataStockPieces:
+        """Return the pieces as a BPDataStockPieces, built from the arrays in one pass without validation."""
+        return BPDataStockPieces.from_sorted_pairs(zip(self.__lengths.tolist(),self.__counts.tolist()),False)
+
+    def quantized(self, factor: float) -> 'BPDataStockPiecesArray':
+        """Return the pieces with every length multiplied by factor and rounded, merging equal lengths."""
+        lengths, inverse = np.unique(np.round(self.__lengths*factor),return_inverse=True)
+        counts = np.bincount(inverse.ravel(),weights=self.__counts,minlength=len(lengths)).astype(np.int64)
+        return self.__from_sorted_arrays(lengths,counts,True)
+
+    def __index(self, key) -> int:
+        """Return the index of a length, or -1 if it does not exist."""
+        index = int(np.searchsorted(self.__lengths,key))
+        if index < len(self.__lengths) and self.__lengths[index] == key:
+            return index
+        return -1
+
+    def __repr__(self):
+        return str(dict(self))
+
+    def __str__(self):
+        return str(dict(self))
+
+    def keys(self):
+        return self.__lengths[::-1].tolist() if self.__reverse else self.__lengths.tolist()
+
+    def values(self):
+        return self.__counts[::-1].tolist() if self.__reverse else self.__counts.tolist()
+
+    def items(self):
+        return dict(zip(self.keys(),self.values())).items()
+
+    def copy(self):
+        return self.__from_arrays(self.__lengths.copy(),self.__counts.copy())
+
+    def __contains__(self, key) -> bool:
+        index = self.__index(key)
+        return index >= 0 and self.__counts[index] > 0
+
+    def __getitem__(self, key) -> int: # As no annotation, the type check does not "kick in"
+        if isinstance(key,int):
+            return list(self)[key]
+        elif isinstance(key,slice):
+            return list(self)[key]
+        elif not isinstance(key,float):
+            raise TypeError(f"Argument 'key' should be of type <class 'float'> but was {type(key)}")
+        index = self.__index(key)
+        if index < 0:
+            raise KeyError(f"The key '{key}' does not exists in this instance of BPDataStockPiecesArray")
+        return int(self.__counts[index])
+
+    def __setitem__(self, key : float, value : int) -> None:
+        index = self.__index(key)
+        if index >= 0:
+            self.__counts[index] = value
+        else:
+            index = int(np.searchsorted(self.__lengths,key))
+            self.__lengths = np.insert(self.__lengths,index,key)
+            self.__counts = np.insert(self.__counts,index,value)
+            self.__reverse = True
+
+    def append(self, piece_length : float):
+        index = self.__index(piece_length)
+        if index >= 0: self.__counts[index] += 1
+        else: self[piece_length] = 1
+
+    def update(self, stock_pieces) -> 'BPDataStockPiecesArray':
+        for key, value in stock_pieces.items():
+            self.__setitem__(key,value)
+        return self
+
+    def __len__(self):
+        return int(self.__counts.sum())
+
+    def __iter__(self):
+        for key, value in zip(self.keys(),self.values()):
+            for i in range(value):
+                yield key
+
+    def max_length(self):
+        lengths = self.__lengths[self.__counts > 0]
+        return float(lengths[-1]) if len(lengths)>0 else 0.0
+
+    def min_length(self):
+        lengths = self.__lengths[self.__counts > 0]
+        return float(lengths[0]) if len(lengths)>0 else 0.0
+
+    def count(self) -> int:
+        """Return the total number of pieces."""
+        return len(self)
+
+    def iter_runs(self):
+        """Yield (length, count) for each length with pieces, in iteration order."""
+        for key, value in zip(self.keys(),self.values()):
+            if value > 0:
+                yield key, value
+
+    def weighted_sum(self, weight=None) -> float:
+        """Return the sum of weight(length) over all pieces. The weight function is applied to the length array."""
+        mask = self.__counts > 0
+        lengths = self.__lengths[mask] if weight is None else weight(self.__lengths[mask])
+        return float(np.dot(lengths,self.__counts[mask]))
+
+    def total_length(self) -> float:
+        """Return the sum of the lengths of all pieces."""
+        return self.weighted_sum()
+
+    def sort(self, reverse:bool=True) -> 'BPDataStockPiecesArray':
+        self.__reverse = reverse
+        return self
+
+    def clean(self, min_value:float = 0.0) -> 'BPDataStockPiecesArray':
+        mask = (self.__counts > 0) & (self.__lengths >= min_value)
+        self.__lengths = self.__lengths[mask]
+        self.__counts = self.__counts[mask]
+        return self
+
+    def __merge(self, bp_data_stock_pieces):
+        """Return the union of the lengths, and both count arrays aligned to it."""
+        other = bp_data_stock_pieces if isinstance(bp_data_stock_pieces,BPDataStockPiecesArray) else BPDataStockPiecesArray(bp_data_stock_pieces)
+        lengths = np.union1d(self.__lengths,other.lengths)
+        counts_self = np.zeros(len(lengths),dtype=np.int64)
+        counts_other = np.zeros(len(lengths),dtype=np.int64)
+        counts_self[np.searchsorted(lengths,self.__lengths)] = self.__counts
+        counts_other[np.searchsorted(lengths,other.lengths)] = other.counts
+        return lengths, counts_self, counts_other
+
+    def __subtracted_counts(self, bp_data_stock_pieces):
+        """Return the counts after subtraction, ignoring lengths that do not exist in self."""
+        other = bp_data_stock_pieces if isinstance(bp_data_stock_pieces,BPDataStockPiecesArray) else BPDataStockPiecesArray(bp_data_stock_pieces)
+        counts = self.__counts.copy()
+        if len(self.__lengths) > 0 and len(other.lengths) > 0:
+            index = np.minimum(np.searchsorted(self.__lengths,other.lengths),len(self.__lengths)-1)
+            found = self.__lengths[index] == other.lengths
+            counts[index[found]] -= other.counts[found]
+        return np.maximum(counts,0)
+
+    def __iadd__(self, bp_data_stock_pieces) -> 'BPDataStockPiecesArray':
+        lengths, counts_self, counts_other = self.__merge(bp_data_stock_pieces)
+        if len(lengths) != len(self.__lengths):
+            self.__reverse = True
+        self.__lengths = lengths
+        self.__counts = counts_self + counts_other
+        return self
+
+    def __add__(self, bp_data_stock_pieces) -> 'BPDataStockPiecesArray':
+        bp_data_stock_pieces_new = self.copy()
+        bp_data_stock_pieces_new += bp_data_stock_pieces
+        return bp_data_stock_pieces_new
+
+    def __isub__(self, bp_data_stock_pieces) -> 'BPDataStockPiecesArray':
+        self.__counts = self.__subtracted_counts(bp_data_stock_pieces)
+        return self
+
+    def __sub__(self, bp_data_stock_pieces) -> 'BPDataStockPiecesArray':
+        return self.__from_arrays(self.__lengths.copy(),self.__subtracted_counts(bp_data_stock_pieces))
+
+    def __eq__(self, other):
+        if not isinstance(other,(BPDataStockPiecesArray,BPDataStockPieces)):
+            return NotImplemented
+        return list(self.items()) == list(other.items())
+
+    def __hash__(self):
+        return hash(tuple(self.items()))
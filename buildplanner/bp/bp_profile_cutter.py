@@ -0,0 +1,272 @@
+# SPDX-FileCopyrightText: 2023-2024 Magnus Pettersson
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#------------------------------------------------------------------------------
+#
+# File: bp_profile_cutter.py
+# Author: Magnus Pettersson
+#
+# This module provides a class for cutting demand of several cross-section
+# profiles, such as 45x95 studs and 22x145 deck boards, where each profile
+# can only be cut from stock of the same profile.
+#
+# The demand and the stock are grouped by profile, and each group is cut as
+# an independent BPCutter job. The jobs are run in a pool of processes, and
+# the results are kept per profile and compiled into one report. Besides
+# being correct, this splits one large search into many small ones.
+#
+#------------------------------------------------------------------------------
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from bp.bp_data_classes import BPDataStockPieces, BPDataCutterResult
+from bp.bp_cutter import BPCutter
+from bp.bp_cache import BPCache
+from bp.bp_cancel_token import BPCancelToken
+from bp.bp_defs import length_unit_suffix
+from bp.bp_log import BPLog
+
+from bp.bp_type_check import type_check_class
+
+# The shared token cancelling the cuts of a worker process, set once per process
+_profile_cancel = None
+
+def _profile_init(cancel: BPCancelToken) -> None:
+    """Set the shared cancellation token of a worker process."""
+    global _profile_cancel
+    _profile_cancel = cancel
+
+def _profile_cut(cutter: BPCutter, method: BPCutter.METHOD, deadline: float) -> BPDataCutterResult:
+    """Cut the demand of one profile before a deadline in a worker process, and return the result."""
+    cutter.cut(method, deadline=deadline, cancel=_profile_cancel)
+    return cutter.result
+
+@type_check_class
+class BPProfileCutter:
+    """
+    Class for cutting the demand of several cross-section profiles, each from its own stock.
+    """
+
+    @property
+    def results(self) -> dict:
+        """The result of each profile, in the order of the demand."""
+        return self.__results
+
+    @property
+    def completed(self) -> bool:
+        return all(result.completed for result in self.__results.values())
+
+    def __init__(
+            self,
+            stock: dict,
+            demand: dict,
+            cut_width: float = 0.0,
+            method: BPCutter.METHOD = BPCutter.METHOD.OPT,
+            length_unit: str = "NONE",
+            original_length_unit: str = "NONE",
+            precision: int = 0,
+            tick: bool = False,
+            cache: BPCache = None
+            ) -> None:
+        """
+        Initializes the BPProfileCutter instance.
+
+        Args:
+            stock (dict): The available stock pieces (BPDataStockPieces) of each profile.
+                A profile is a tuple of its cross-section dimensions, such as (95.0, 45.0).
+            demand (dict): The demand for stock pieces (BPDataStockPieces) of each profile.
+                The demand of a profile without stock is left as remaining demand.
+            cut_width (float, optional): The width to be cut from stock pieces. Defaults to 0.0.
+            method (BPCutter.METHOD, optional): The cutting method to be used. Defaults to BPCutter.METHOD.OPT.
+            length_unit (str, optional): The unit of length for stock pieces. Defaults to "NONE".
+            original_length_unit (str, optional): The original unit of length for stock pieces. Defaults to "NONE".
+            precision (int, optional): The precision for calculations. Defaults to 0.
+            tick (bool, optional): If True, lengths are cut in integer ticks, see BPCutter. Defaults to False.
+            cache (BPCache, optional): A cache of the result of each profile, see BPCutter. Defaults to None.
+        """
+        options = {} if cache is None else {"cache": cache}
+        self.__cutters = {
+            profile: BPCutter(
+                stock.get(profile, BPDataStockPieces()),
+                profile_demand,
+                cut_width,
+                method,
+                length_unit=length_unit,
+                original_length_unit=original_length_unit,
+                precision=precision,
+                tick=tick,
+                **options
+            )
+            for profile, profile_demand in demand.items()
+        }
+        self.__demand = demand
+        self.__method = method
+        self.__length_unit = length_unit
+        self.__results = {profile: cutter.result for profile, cutter in self.__cutters.items()}
+        self.__log = BPLog()
+
+    def cut(self, parallel: bool = True, workers: int = None, deadline: float = None, cancel: BPCancelToken = None) -> None:
+        """
+        Cuts the demand of every profile.
+
+        Args:
+            parallel (bool, optional): If True, and there is more than one profile, the
+                profiles are cut in parallel processes. Defaults to True.
+            workers (int, optional): The number of processes when parallel. Defaults
+                to None, meaning one per profile, at most the number of CPUs.
+            deadline (float, optional): The time, from time.monotonic(), when every
+                cut stops, see BPCutter.cut(). Defaults to None, meaning no deadline.
+            cancel (BPCancelToken, optional): A token to cancel the cuts. Defaults to None.
+        """
+        deadline = math.inf if deadline is None else deadline
+        cancel = BPCancelToken() if cancel is None else cancel
+        if parallel and len(self.__cutters) > 1:
+            for step in self.__parallel_cut_iter(workers or min(len(self.__cutters), os.cpu_count() or 1), deadline, cancel):
+                pass
+        else:
+            for profile, cutter in self.__cutters.items():
+                cutter.cut(deadline=deadline, cancel=cancel)
+                self.__results[profile] = cutter.result
+        return None
+
+    def cut_iter(
+            self,
+            parallel: bool = True,
+            workers: int = None,
+            deadline: float = None,
+            cancel: BPCancelToken = None,
+            yield_interval_ms: float = 0.0,
+            yield_every: int = 1
+            ) -> None:
+        """
+        Cuts the demand of every profile iteratively, yielding progress as the steps
+        of BPCutter.cut_iter, with the profile added to the name, and the progress
+        of all profiles. When parallel, only the completion of each profile is
+        yielded, together with regular steps while waiting, so that the caller can
+        stay responsive.
+
+        Args:
+            parallel (bool, optional): If True, and there is more than one profile, the
+                profiles are cut in parallel processes. Defaults to True.
+            workers (int, optional): The number of processes when parallel. Defaults
+                to None, meaning one per profile, at most the number of CPUs.
+            deadline (float, optional): The time, from time.monotonic(), when every
+                cut stops, see BPCutter.cut(). Defaults to None, meaning no deadline.
+            cancel (BPCancelToken, optional): A token to cancel the cuts. Defaults to None.
+            yield_interval_ms (float, optional): The least time between the steps
+                yielded when not parallel, see BPCutter.cut_iter. Defaults to 0.0.
+            yield_every (int, optional): The least number of engine steps between the
+                steps yielded when not parallel, see BPCutter.cut_iter. Defaults to 1.
+        """
+        deadline = math.inf if deadline is None else deadline
+        cancel = BPCancelToken() if cancel is None else cancel
+        if parallel and len(self.__cutters) > 1:
+            for step in self.__parallel_cut_iter(workers or min(len(self.__cutters), os.cpu_count() or 1), deadline, cancel):
+                yield step
+        else:
+            for index, (profile, cutter) in enumerate(self.__cutters.items()):
+                for step in cutter.cut_iter(deadline=deadline, cancel=cancel, yield_interval_ms=yield_interval_ms, yield_every=yield_every):
+                    yield (False, self.profile_title(profile) + ": " + step[1], step[2], (index + step[3]) / len(self.__cutters))
+                self.__results[profile] = cutter.result
+        yield (True, "Profiles", None, 1.0)
+
+    def __parallel_cut_iter(self, workers: int, deadline: float, cancel: BPCancelToken) -> None:
+        """
+        Cut the profiles in a pool of processes, yielding the completion of each
+        profile, and regular steps while waiting. The processes see the deadline, but
+        not the cancellation token, so when cancelled, the processes are stopped by a
+        shared token, and the profiles not yet cut are cut again with the token, which
+        stops them at once with only the presolved stock pieces.
+
+        Args:
+            workers (int): The number of processes.
+            deadline (float): The deadline from time.monotonic(), or math.inf.
+            cancel (BPCancelToken): The cancellation token.
+        """
+        stop = BPCancelToken(shared=True)
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_profile_init, initargs=(stop,))
+        try:
+            futures = {executor.submit(_profile_cut, cutter, self.__method, deadline): profile for profile, cutter in self.__cutters.items()}
+            pending = set(futures.keys())
+            while len(pending) > 0 and not cancel.cancelled:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    profile = futures[future]
+                    self.__results[profile] = future.result()
+                    self.__log.debug("Cut profile " + self.profile_title(profile) + " using " + self.__results[profile].method)
+                    yield (False, self.profile_title(profile), self.__results[profile], 1.0 - len(pending) / len(futures))
+                if len(done) == 0:
+                    yield (False, "Profiles", None, 1.0 - len(pending) / len(futures))
+        finally:
+            stop.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+        for future in pending:
+            profile = futures[future]
+            self.__cutters[profile].cut(cancel=cancel)
+            self.__results[profile] = self.__cutters[profile].result
+
+    def resolve(self, previous_results: dict) -> None:
+        """
+        Cuts the demand of every profile, starting from the previous result of the
+        profile if there is one, see BPCutter.resolve. Profiles without a previous
+        result are cut from scratch.
+
+        Args:
+            previous_results (dict): The previous result of each profile, produced with
+                the same stock and settings.
+        """
+        for profile, cutter in self.__cutters.items():
+            if profile in previous_results:
+                cutter.resolve(previous_results[profile], self.__demand[profile])
+            else:
+                cutter.cut()
+            self.__results[profile] = cutter.result
+        return None
+
+    @staticmethod
+    def split_stock(stock: BPDataStockPieces, demand: dict) -> dict:
+        """
+        Divide one stock shared by all profiles between the profiles, for stock that
+        can be used for any profile. Each stock length is divided in proportion to
+        the demanded length of each profile, the boards left by rounding going to
+        the largest remainders. A single profile gets all of the stock.
+
+        Args:
+            stock (BPDataStockPieces): The shared stock.
+            demand (dict): The demand for stock pieces (BPDataStockPieces) of each profile.
+
+        Returns:
+            dict: The stock pieces (BPDataStockPieces) of each profile.
+        """
+        profiles = list(demand.keys())
+        weights = [demand[profile].total_length() for profile in profiles]
+        total = sum(weights)
+        if total <= 0.0:
+            weights = [1.0] * len(profiles)
+            total = float(len(profiles))
+        counts = {profile: {} for profile in profiles}
+        for length, amount in stock.iter_runs():
+            shares = [amount * weight / total for weight in weights]
+            split = [math.floor(share) for share in shares]
+            by_remainder = sorted(range(len(profiles)), key=lambda index: split[index] - shares[index])
+            for index in by_remainder[:amount - sum(split)]:
+                split[index] += 1
+            for profile, count in zip(profiles, split):
+                if count > 0:
+                    counts[profile][length] = count
+        return {profile: BPDataStockPieces(counts[profile]) for profile in profiles}
+
+    def profile_title(self, profile: tuple) -> str:
+        """Return the title of a profile, its dimensions separated by x, with the length unit."""
+        suffix = length_unit_suffix[self.__length_unit]
+        return " x ".join(f"{dimension}{suffix}" for dimension in profile)
+
+    def to_html(self) -> str:
+        """Compile the results of all profiles into one page, with one section per profile."""
+        return BPDataCutterResult.html_report({self.profile_title(profile): result for profile, result in self.__results.items()})
+
+    def __str__(self) -> str:
+        return "".join("\n" + self.profile_title(profile) + "\n" + str(result) for profile, result in self.__results.items())
@@ -0,0 +1,248 @@
+# SPDX-FileCopyrightText: 2023-2024 Magnus Pettersson
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+#------------------------------------------------------------------------------
+#
+# File: bp_streaming_cutter.py
+# Author: Magnus Pettersson
+#
+# This module provides a class for cutting a stream of demanded pieces, such
+# as the piece lists a prefabrication line receives continuously, where the
+# full demand is never known.
+#
+# The pieces are placed on open boards as they arrive, by a bounded-space
+# online algorithm, keeping at most a fixed number of boards open:
+# - Best Fit places a piece on the open board with the least remainder that
+#   fits it. When no open board fits, and the limit is reached, the fullest
+#   open board is closed before a new board is opened.
+# - Harmonic divides the pieces into classes by length, pieces longer than
+#   1/2, 1/3, ... of the longest stock length available, and the shortest
+#   pieces. Each class has one open board, only holding pieces of its class,
+#   which is closed when the next piece of the class does not fit. When the
+#   longest stock length runs out, the classes follow the next longest.
+#
+# Closed boards are returned as finished BPDataCutStock objects, so that the
+# memory used is proportional to the number of open boards, and not to the
+# total demand. Only the totals of the closed boards are kept.
+#
+#------------------------------------------------------------------------------
+
+from enum import Enum, auto
+
+from bp.bp_data_classes import BPDataStockPieces, BPDataCutStock
+from bp.bp_log import BPLog
+
+from bp.bp_type_check import type_check_class
+
+@type_check_class
+class BPStreamingCutter:
+    """
+    Class for cutting a stream of demanded pieces with a bounded number of open boards.
+    """
+
+    class METHOD(Enum):
+        BEST_FIT = auto()
+        HARMONIC = auto()
+
+    @property
+    def used_stock(self) -> BPDataStockPieces:
+        """The stock of all boards opened, closed or not."""
+        return self.__used_stock
+
+    @property
+    def remaining_demand(self) -> BPDataStockPieces:
+        """The pieces that could not be placed, as no stock fits them."""
+        return self.__remaining_demand
+
+    @property
+    def open_boards(self) -> int:
+        return len(self.__boards)
+
+    @property
+    def total_waste(self) -> float:
+        """The waste of the closed boards, the remaining stock and the cuts."""
+        return self.__total_waste
+
+    def __init__(
+            self,
+            stock: BPDataStockPieces,
+            cut_width: float = 0.0,
+            method: METHOD = METHOD.BEST_FIT,
+            max_open: int = 8,
+            min_length: float = 0.0
+            ) -> None:
+        """
+        Initializes the BPStreamingCutter instance.
+
+        Args:
+            stock (BPDataStockPieces): The available stock pieces. New boards are
+                taken from the longest stock length available that fits the piece.
+            cut_width (float, optional): The width to be cut from stock pieces. Defaults to 0.0.
+            method (METHOD, optional): The online algorithm. Defaults to METHOD.BEST_FIT.
+            max_open (int, optional): The maximum number of open boards. For
+                METHOD.HARMONIC it is the number of length classes. Defaults to 8.
+            min_length (float, optional): The shortest piece expected. A board with a
+                remainder shorter than this can no longer be improved, and is closed
+                at once. Defaults to 0.0, meaning only boards without any remainder
+                are closed at once.
+        """
+        self.__stock = stock.copy()
+        self.__stock.clean()
+        self.__cut_width = cut_width
+        self.__method = method
+        self.__max_open = max(1, max_open)
+        self.__min_length = min_length
+        # The open boards as [stock length, remainder, pieces, class]
+        self.__boards = []
+        self.__used_stock = BPDataStockPieces()
+        self.__remaining_demand = BPDataStockPieces()
+        self.__total_waste = 0.0
+        self.__class_length = self.__stock.max_length() if len(self.__stock) > 0 else 0.0
+        self.__log = BPLog()
+
+    def feed(self, pieces) -> list:
+        """
+        Place one piece, or a batch of pieces in the order given, on the open boards.
+
+        Args:
+            pieces (float, list or BPDataStockPieces): The piece length, or the batch
+                of piece lengths.
+
+        Returns:
+            list: The boards closed, as BPDataCutStock objects.
+        """
+        closed = []
+        for piece in [pieces] if isinstance(pieces, (int, float)) else pieces:
+            piece = float(piece)
+            if self.__method == self.METHOD.HARMONIC:
+                self.__place_harmonic(piece, closed)
+            else:
+                self.__place_best_fit(piece, closed)
+        return closed
+
+    def flush(self) -> list:
+        """
+        Close all open boards, at the end of the stream.
+
+        Returns:
+            list: The boards closed, as BPDataCutStock objects.
+        """
+        closed = []
+        while len(self.__boards) > 0:
+            closed.append(self.__close(0))
+        return closed
+
+    def __place_best_fit(self, piece: float, closed: list) -> None:
+        """
+        Place a piece on the open board with the least remainder that fits it, or
+        on a new board, closing the fullest open board when the limit is reached.
+
+        Args:
+            piece (float): The piece length.
+            closed (list): The list to add closed boards to.
+        """
+        best_index = None
+        for index, board in enumerate(self.__boards):
+            if piece <= board[1] and (best_index is None or board[1] < self.__boards[best_index][1]):
+                best_index = index
+        if best_index is None:
+            if len(self.__boards) >= self.__max_open and self.__fits_stock(piece):
+                closed.append(self.__close(min(range(len(self.__boards)), key=lambda index: self.__boards[index][1])))
+            best_index = self.__open(piece, 0)
+            if best_index is None:
+                return None
+        self.__add(best_index, piece, closed)
+        return None
+
+    def __place_harmonic(self, piece: float, closed: list) -> None:
+        """
+        Place a piece on the open board of its length class, closing the board and
+        opening a new one when the piece does not fit.
+
+        Args:
+            piece (float): The piece length.
+            closed (list): The list to add closed boards to.
+        """
+        # Class i holds pieces longer than 1/(i + 1) of the longest stock length, with the cut
+        # included, the last class holds the rest
+        length_class = self.__max_open
+        for i in range(1, self.__max_open):
+            if piece + self.__cut_width > (self.__class_length + self.__cut_width) / (i + 1):
+                length_class = i
+                break
+        index = next((index for index, board in enumerate(self.__boards) if board[3] == length_class), None)
+        if index is not None and piece > self.__boards[index][1]:
+            if not self.__fits_stock(piece):
+                self.__remaining_demand.append(piece)
+                return None
+            closed.append(self.__close(index))
+            index = None
+        if index is None:
+            index = self.__open(piece, length_class)
+            if index is None:
+                return None
+        self.__add(index, piece, closed)
+        return None
+
+    def __fits_stock(self, piece: float) -> bool:
+        """Check if any available stock length fits a piece."""
+        return any(length >= piece and count > 0 for length, count in self.__stock.iter_runs())
+
+    def __open(self, piece: float, length_class: int) -> int:
+        """
+        Open a new board of the longest available stock length that fits a piece.
+        A piece that no stock fits is added to the remaining demand.
+
+        Args:
+            piece (float): The piece length.
+            length_class (int): The length class of the board, 0 for none.
+
+        Returns:
+            int: The index of the new board, or None if no stock fits the piece.
+        """
+        lengths = [length for length, count in self.__stock.iter_runs() if length >= piece and count > 0]
+        if len(lengths) == 0:
+            self.__log.debug(f"No stock for piece {piece}")
+            self.__remaining_demand.append(piece)
+            return None
+        stock_length = max(lengths)
+        self.__stock[stock_length] -= 1
+        if stock_length == self.__class_length and self.__stock[stock_length] == 0:
+            # The new boards of every class are taken from the next longest stock length
+            self.__class_length = max((length for length, count in self.__stock.iter_runs() if count > 0), default=stock_length)
+        self.__used_stock.append(stock_length)
+        self.__boards.append([stock_length, stock_length, [], length_class])
+        return len(self.__boards) - 1
+
+    def __add(self, index: int, piece: float, closed: list) -> None:
+        """
+        Add a piece to an open board, closing the board if its remainder is now
+        shorter than the shortest piece expected.
+
+        Args:
+            index (int): The index of the board.
+            piece (float): The piece length.
+            closed (list): The list to add closed boards to.
+        """
+        board = self.__boards[index]
+        board[1] = max(0.0, board[1] - (piece + self.__cut_width))
+        board[2].append(piece)
+        if board[1] <= 0.0 or board[1] < self.__min_length:
+            closed.append(self.__close(index))
+        return None
+
+    def __close(self, index: int) -> BPDataCutStock:
+        """
+        Close an open board.
+
+        Args:
+            index (int): The index of the board.
+
+        Returns:
+            BPDataCutStock: The finished board.
+        """
+        stock_length, remainder, pieces, length_class = self.__boards.pop(index)
+        cut_stock = BPDataCutStock(stock_length, self.__cut_width, BPDataStockPieces.from_iterable(pieces))
+        self.__total_waste += stock_length - cut_stock.stock_pieces.total_length()
+        return cut_stock
@@ -25,7 +25,7 @@ import bpy
 import bmesh
 import mathutils
 
-from bp import BPCutter, BPDataStockPieces
+from bp import BPCutter, BPProfileCutter, BPCache, BPCancelToken, BPDataStockPieces
 from bp import bp_defs
 from bp.bp_utils import sround, vround
 
@@ -55,6 +55,7 @@ class BuildPlanner_OT_bp_ResetCutWood(bpy.types.Operator):
     def execute(self, context):
         bp = BPBlender.cutter_data
         bp["html"] = None
+        bp["bp_cutter_previous"] = None
         bp["bp_cutter_state"]["HAS_DATA"] = False
         return {'FINISHED'}
 
@@ -62,6 +63,7 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
     bl_idname = "wm.bp_cutwood"
     bl_label = "Cut Wood Modal"
     _willcont = None
+    _cancel = None
 
     def refine_dimensions(self, dimensions):
         result = []  # List to store the refined dimensions
@@ -140,25 +142,18 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
         yield (True, f"{count_1}/{number_of_wood} - {count_2}/{number_of_wood}", result)
     
     def get_demand(self, dimensions, precision):
-        raw_demand = {}
+        # Count the demand on lengths rounded based on blender units and the 
+        # precision set in addon preferences, in a single pass, grouped by the
+        # cross-section profile (width, height), as pieces can only be cut from
+        # stock of the same profile
         demand = {}
         for wood in dimensions:
-            key = wood[0]
-            if key in raw_demand: 
-                raw_demand[key] += 1
-            else:
-                raw_demand[key] = 1
-        #print(raw_demand)
-        sorted_keys = sorted(raw_demand.keys(), reverse=True)
-        for key in sorted_keys:
-            demand[key] = raw_demand[key]
-        
-        # Round the demand based on blender units and the precision set in addon preferences
-        rounded_demand = {}
-        for key,value in demand.items():
-            rounded_demand[round(key,precision)]=value
+            profile = (round(max(wood[1],wood[2]),precision), round(min(wood[1],wood[2]),precision))
+            profile_demand = demand.setdefault(profile,{})
+            key = round(wood[0],precision)
+            profile_demand[key] = profile_demand.get(key,0) + 1
 
-        return BPDataStockPieces(rounded_demand)
+        return {profile: BPDataStockPieces.from_counts(profile_demand.keys(),profile_demand.values()) for profile, profile_demand in demand.items()}
 
     def calculate_max_distance(self,vertices):
         # Calculate the maximum distance between the aligned vertices
@@ -315,7 +310,6 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
         # Get cut_with and stock_inf, multiplied by unit_scale, rounded by precision
         cut_width = round(context.scene.build_planner.bp_cut_width * unit_scale, precision)
         
-        stock_inf_amount = dict(zip(stock_inf,stock_amount))
     
         #
         # Step one 
@@ -331,6 +325,8 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
         nwoods = 0
         woods = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH' and obj.name.startswith(prefix)]
         for wood in woods:
+            if self._cancel.cancelled:
+                yield False
             nwoods += 1
             vertices_count = len(wood.data.vertices)
             if (vertices_count>complexity):
@@ -359,6 +355,8 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
         wood_info = []
 
         for wood in woods:
+            if self._cancel.cancelled:
+                yield False
             # Toggle progress to blink (0/1)
             bp["progress_step"][1] = (bp["progress_step"][1] + 1) % 2
             wood_info.append(self.align_and_calculate_max_distance(wood,precision))
@@ -386,6 +384,8 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
         #
 
         for result in self.refine_dimensions(dimensions):
+            if self._cancel.cancelled:
+                yield False
             yield True
             if not result[0]:
                 # Toggle progress to blink (0/1)
@@ -401,42 +401,75 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
         # Step four
         # Cut the wood
 
-        # Scale the demand to unit_scale
+        # Scale the demand, and the profiles, to unit_scale
         if (unit_scale!=1.0):
-            scaled_demand = BPDataStockPieces()
-            for key,value in demand.items():
-                scaled_demand[round(key*unit_scale,precision)] = value
-            demand = scaled_demand
-
-        stock = BPDataStockPieces()
-        for length, amount in stock_inf_amount.items():
-            if length in stock:
-                stock[length] += amount 
-            else:
-                stock[length] = amount
-            
-  
-        bp_cutter = BPCutter(stock,demand,cut_width,length_unit=length_unit, precision=precision)
-
-        method = {"BOTH":BPCutter.METHOD.OPT,
+            scaled_demand = {}
+            for profile,profile_demand in demand.items():
+                scaled_profile = tuple(round(dimension*unit_scale,precision) for dimension in profile)
+                scaled_profile_demand = scaled_demand.setdefault(scaled_profile,{})
+                for key,value in profile_demand.items():
+                    scaled_key = round(key*unit_scale,precision)
+                    scaled_profile_demand[scaled_key] = scaled_profile_demand.get(scaled_key,0) + value
+            demand = {profile: BPDataStockPieces.from_counts(scaled_profile_demand.keys(),scaled_profile_demand.values()) for profile, scaled_profile_demand in scaled_demand.items()}
+
+        stock_amount_total = {}
+        for length, amount in zip(stock_inf,stock_amount):
+            stock_amount_total[float(length)] = stock_amount_total.get(float(length),0) + amount
+
+        # The panel has one stock list for all profiles, which is divided between
+        # the profiles by their demanded length, so that the profiles together never
+        # use more stock than entered. A single profile gets all of the stock
+        stock = BPProfileCutter.split_stock(BPDataStockPieces.from_counts(stock_amount_total.keys(),stock_amount_total.values()),demand)
+
+        method = {"BFD":BPCutter.METHOD.BFD,
+                  "BOTH":BPCutter.METHOD.OPT,
                   "GREEDY":BPCutter.METHOD.GREEDY,
                   "EXPERIMENTAL":BPCutter.METHOD.EXPERIMENTAL
                   }[context.preferences.addons["buildplanner"].preferences.method]
 
-        for result in bp_cutter.cut_iter(method):
-            bp["progress_step"][3] = (bp["progress_step"][3] + 1) % 2
-            bp["progress"][3] = f"Cutting ({result[1]}): {result[3]}"
+        # Results of problems cut before are kept in a cache in the user configuration
+        cache_path = str(Path(bpy.utils.user_resource('CONFIG', path="buildplanner", create=True)) / "cutter_cache.sqlite")
+
+        # Each profile is cut as an independent job
+        bp_cutter = BPProfileCutter(stock,demand,cut_width,method,length_unit=length_unit, precision=precision, cache=BPCache(cache_path))
+
+        # With the same stock and settings as the previous cut, only the changed demand is cut.
+        # As the stock is divided by the demand, a profile is only resolved with its previous
+        # result if its part of the stock is unchanged
+        settings = (tuple(stock_amount_total.items()), cut_width, method, length_unit, precision)
+        previous = bp.get("bp_cutter_previous")
+        if previous is not None and previous["settings"] == settings:
+            bp_cutter.resolve({profile: result for profile, result in previous["results"].items() if previous["stock"].get(profile) == stock[profile]})
+            bp["progress"][3] = "Cutting (changes only)"
             yield True
+        else:
+            # Cancelling with ESC stops the cut, keeping the best result so far. The
+            # steps are batched, to return to the UI a few times a second only. No
+            # processes are started from within Blender
+            for result in bp_cutter.cut_iter(parallel=False, cancel=self._cancel, yield_interval_ms=50.0, yield_every=16):
+                bp["progress_step"][3] = (bp["progress_step"][3] + 1) % 2
+                bp["progress"][3] = f"Cutting ({result[1]}): {result[3]:.0%}"
+                yield True
+        # A stopped result is partial, and not a start for the next cut
+        if self._cancel.cancelled:
+            bp["bp_cutter_previous"] = None
+        else:
+            bp["bp_cutter_previous"] = {"settings": settings, "stock": stock, "results": bp_cutter.results}
+
+        # Warn when the stock of a profile is not enough for its demand
+        incomplete = [bp_cutter.profile_title(profile) for profile, profile_result in bp_cutter.results.items() if not profile_result.completed]
+        if len(incomplete) > 0:
+            self.report({"WARNING"},f"Build Planner: Not enough stock for all pieces of: {', '.join(incomplete)}. The stock is divided between the profiles by their demanded length")
 
         # Set step 4 to done (2)
         bp["progress_step"][3] = 2
         
         bp["progress_step"][4] = 2
-        bp["progress"][4] = f"Done, using {bp_cutter.result.method}"
+        bp["progress"][4] = f"{'Done' if bp_cutter.completed else 'Done, not all pieces cut'}, using {', '.join(sorted(set(result.method for result in bp_cutter.results.values())))}"
         self.report({"INFO"},"Build Planner: Cutting finished")
-        self.report({"INFO"},str(result[2]))
+        self.report({"INFO"},str(bp_cutter))
 
-        bp["html"] = bp_cutter.result.to_html()
+        bp["html"] = bp_cutter.to_html()
 
         bp["bp_cutter_state"]["HAS_DATA"] = True
 
@@ -474,7 +507,8 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
             bp["progress"][i] = ""
             bp["progress_step"][i] = 0
 
-        # Define iterator for execution of cutter
+        # Define a token to stop the cutter when cancelled, and the iterator for execution of cutter
+        self._cancel = BPCancelToken()
         self._willcont = iter(self.orchestrator(context))
 
         # Initiate modal - making it possible to cacel the operation by clicking ESC
@@ -500,7 +534,7 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
             else:
                 bp["bp_cutter_state"]["RUNNING"] = False
                 return None
-        except ReferenceError:
+        except (ReferenceError, StopIteration):
             bp["bp_cutter_state"]["RUNNING"] = False
             return None
 
@@ -510,6 +544,15 @@ class BuildPlanner_OT_bp_CutWood(bpy.types.Operator):
         # bp data
         bp = BPBlender.cutter_data
 
+        # Stop the cutter, and finish the steps left, to report the best result so far
+        self._cancel.cancel()
+        try:
+            for running in self._willcont:
+                if not running:
+                    break
+        except ReferenceError:
+            pass
+
         # Update operation state to not running and redraw area
         bp["bp_cutter_state"]["RUNNING"] = False
 
@@ -38,6 +38,7 @@ class BuildPlannerPreferences(AddonPreferences):
             ("GREEDY", "Greedy Cut", "Use the Greedy Cut only"),
             ("EXPERIMENTAL", "Experimental Cut", "Use the Experimental Cut only"),
             ("BOTH", "Both", "Use both Greedy and Experimental Cut and select the best result"),
+            ("BFD", "Best Fit Decreasing", "Use the fast Best Fit Decreasing, for interactive planning"),
         ],
         default="BOTH"  
     )
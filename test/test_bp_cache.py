@@ -0,0 +1,84 @@
+import sys
+import math
+import unittest
+import tempfile
+from pathlib import Path
+
+PROJECT_DIR = Path(str(Path(__file__).parents[1])+"/buildplanner")
+sys.path.append(str(PROJECT_DIR))
+
+import bp_debug # Import to activate type check as first bp import
+
+from bp import *
+
+class TestBPCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp_dir.name) / "cache.sqlite")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key(self):
+        key = BPCache.key(BPDataStockPieces({3600:2,4200:1}),BPDataStockPieces({600:3,1200:1}),3.0,"OPT",1,"MILLIMETERS","NONE",{"seed":0})
+        self.assertEqual(key,BPCache.key(BPDataStockPieces({4200:1,3600:2}),BPDataStockPieces([1200,600,600,600]),3.0,"OPT",1,"MILLIMETERS","NONE",{"seed":0}))
+        self.assertNotEqual(key,BPCache.key(BPDataStockPieces({3600:2,4200:1}),BPDataStockPieces({600:3,1200:1}),5.0,"OPT",1,"MILLIMETERS","NONE",{"seed":0}))
+        self.assertNotEqual(key,BPCache.key(BPDataStockPieces({3600:2,4200:1}),BPDataStockPieces({600:3,1200:1}),3.0,"GREEDY",1,"MILLIMETERS","NONE",{"seed":0}))
+        self.assertNotEqual(key,BPCache.key(BPDataStockPieces({3600:2,4200:1}),BPDataStockPieces({600:3,1200:1}),3.0,"OPT",1,"MILLIMETERS","NONE",{"seed":1}))
+
+    def test_get_put(self):
+        bp_cache = BPCache(self.path)
+        self.assertEqual(len(bp_cache),0)
+        self.assertIsNone(bp_cache.get("a"))
+        result = BPDataCutterResult(precision=1)
+        result.append(BPDataCutStock(2400.0,5.0,BPDataStockPieces([600,600,1000])))
+        result.method = "Cached"
+        bp_cache.put("a",result)
+        cached = BPCache(self.path).get("a")
+        self.assertEqual(cached.method,"Cached")
+        self.assertEqual(str(cached),str(result))
+        # Entries of other versions are never returned
+        self.assertIsNone(BPCache(self.path,version="other").get("a"))
+        bp_cache.clear()
+        self.assertEqual(len(bp_cache),0)
+
+    def test_lru(self):
+        bp_cache = BPCache(self.path,max_entries=2)
+        for key in ("a","b"):
+            bp_cache.put(key,BPDataCutterResult())
+        bp_cache.get("a")
+        bp_cache.put("c",BPDataCutterResult())
+        self.assertEqual(len(bp_cache),2)
+        self.assertIsNotNone(bp_cache.get("a"))
+        self.assertIsNone(bp_cache.get("b"))
+        self.assertIsNotNone(bp_cache.get("c"))
+
+    def test_cutter(self):
+        bp_cache = BPCache(self.path)
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        bp_oc = BPCutter(stock,demand,3.0,cache=bp_cache)
+        bp_oc.cut()
+        self.assertEqual(len(bp_cache),1)
+        bp_cached = BPCutter(stock,demand,3.0,cache=bp_cache)
+        steps = list(bp_cached.cut_iter())
+        self.assertEqual(len(steps),1)
+        self.assertEqual(str(bp_cached.result),str(bp_oc.result))
+        self.assertEqual(bp_cached.result.lower_bound,bp_oc.result.lower_bound)
+        # Another method is cut, and cached
+        bp_greedy = BPCutter(stock,demand,3.0,cache=bp_cache)
+        bp_greedy.cut(BPCutter.METHOD.BFD)
+        self.assertEqual(bp_greedy.result.method,"Best Fit Decreasing")
+        self.assertEqual(len(bp_cache),2)
+        # A cut stopped at the waste target is not the result of a full cut
+        bp_cache.clear()
+        bp_target = BPCutter(stock,demand,3.0,cache=bp_cache)
+        bp_target.cut(waste_target=math.inf)
+        bp_full = BPCutter(stock,demand,3.0,cache=bp_cache)
+        bp_full.cut()
+        self.assertEqual(str(bp_full.result),str(bp_oc.result))
+        self.assertEqual(len(bp_cache),2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,9 @@ import sys
 import os
 import unittest
 import hashlib
+import math
+import multiprocessing
+import time
 from pathlib import Path
 
 PROJECT_DIR = Path(str(Path(__file__).parents[1])+"/buildplanner")
@@ -10,6 +13,7 @@ sys.path.append(str(PROJECT_DIR))
 import bp_debug # Import to activate type check as first bp import
 
 from bp import *
+from bp import bp_column_generation
 
 class TestBPCutter(unittest.TestCase):
 
@@ -108,6 +112,23 @@ class TestBPCutter(unittest.TestCase):
         with open(test_output_file, 'w') as test_file:
             test_file.write(str_html)
 
+    def test_tick(self):
+        stock = BPDataStockPieces({4200:10,3600:10})
+        demand = BPDataStockPieces({4200:5,3600:5,1200:10,600:10})
+        cut_width = 5.0
+        bp_oc = BPCutter(stock,demand,cut_width,length_unit="MILLIMETERS",original_length_unit="MILLIMETERS",precision=1,tick=True)
+        bp_oc.cut()
+        str_txt= str(bp_oc.result)
+        self.assertEqual(hashlib.md5(str_txt.encode()).hexdigest(), "516d205b547a7aa51d4fbbeb9a0ccba9")
+
+        stock = BPDataStockPieces({4.2:10,3.6:50,3:10})
+        demand = BPDataStockPieces({4.2:5,3.6:2,1.2:10,0.4:5,0.6:10,0.21:5,0.5:25,0.1:13,0.9:10})
+        bp_oc = BPCutter(stock,demand,0.005,length_unit="MILLIMETERS",original_length_unit="NONE",precision=1,tick=True)
+        bp_oc.cut()
+        self.assertEqual(str(bp_oc.result.used_stock),"{4200.0: 10, 3600.0: 8, 3000.0: 1}")
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{}")
+        self.assertEqual(bp_oc.result.total_waste,1750.0)
+
     def test_iteration(self):
         stock = BPDataStockPieces({4200:10,3600:10})
         demand = BPDataStockPieces({4200:5,3600:2,1200:10,400:5,600:10,210:50,50:30})
@@ -117,7 +138,362 @@ class TestBPCutter(unittest.TestCase):
         for step in bp_oc.cut_iter():
             pass
         s = str(step) # Only check last step
-        self.assertEqual(hashlib.md5(s.encode()).hexdigest(), "7e3abfead069c9beb1626139688d12ef",s)
+        self.assertEqual(hashlib.md5(s.encode()).hexdigest(), "84093a4f5272c427a031cc783c6dad6c",s)
+
+    def test_iteration_batched(self):
+        stock = BPDataStockPieces({4200:10,3600:10})
+        demand = BPDataStockPieces({4200:5,3600:2,1200:10,400:5,600:10,210:50,50:30})
+        bp_oc = BPCutter(stock,demand,5.0)
+        steps = list(bp_oc.cut_iter())
+        progress = [step[3] for step in steps]
+        self.assertEqual(progress,sorted(progress))
+        self.assertEqual(progress[-1],1.0)
+        self.assertTrue(all(0.0 <= fraction <= 1.0 for fraction in progress))
+        self.assertEqual(str(steps[-1][2]),str(bp_oc.result))
+        # The steps are the same on every run
+        self.assertEqual(len(list(BPCutter(stock,demand,5.0).cut_iter())),len(steps))
+        # Steps without a result are batched, the results are the same
+        bp_batched = BPCutter(stock,demand,5.0)
+        batched = list(bp_batched.cut_iter(yield_every=10))
+        self.assertLess(len(batched),len(steps))
+        self.assertEqual(str(bp_batched.result),str(bp_oc.result))
+        # The results of the engines are always yielded
+        for options in ({"yield_every":10**9},{"yield_interval_ms":60000.0}):
+            bp_batched = BPCutter(stock,demand,5.0)
+            batched = list(bp_batched.cut_iter(**options))
+            self.assertEqual([(step[0],step[1]) for step in batched],[(False,"Greedy Cut"),(False,"Experimental Cut"),(True,"Experimental Cut")])
+            self.assertTrue(all(step[2] is not None for step in batched))
+            self.assertEqual(str(bp_batched.result),str(bp_oc.result))
+        # The result is the same as without steps
+        bp_cut = BPCutter(stock,demand,5.0)
+        bp_cut.cut()
+        self.assertEqual(str(bp_cut.result),str(bp_oc.result))
+
+    def test_lower_bound(self):
+        # The continuous bound proves the greedy result optimal
+        bp_oc = BPCutter(BPDataStockPieces({1000:10}),BPDataStockPieces({500:4}),presolve=False)
+        methods = set(step[1] for step in bp_oc.cut_iter())
+        self.assertEqual(methods,{"Greedy Cut"})
+        self.assertEqual(bp_oc.result.lower_bound,0.0)
+        self.assertEqual(bp_oc.result.optimality_gap,0.0)
+
+        # The L2 bound proves the greedy result optimal
+        bp_oc = BPCutter(BPDataStockPieces({1000:10}),BPDataStockPieces({600:3}))
+        bp_oc.cut()
+        self.assertEqual(bp_oc.result.lower_bound,1200.0)
+        self.assertEqual(bp_oc.result.optimality_gap,0.0)
+
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        bp_oc = BPCutter(stock,demand,3.0)
+        methods = set(step[1] for step in bp_oc.cut_iter())
+        self.assertEqual(methods,{"Greedy Cut","Experimental Cut"})
+        self.assertEqual(bp_oc.result.lower_bound,92.0)
+        self.assertGreater(bp_oc.result.optimality_gap,0.0)
+
+        # No gap when the demand is not met
+        bp_oc = BPCutter(BPDataStockPieces([500,1000,2000]),BPDataStockPieces([1000,2000,3000]))
+        bp_oc.cut()
+        self.assertIsNone(bp_oc.result.optimality_gap)
+
+    @unittest.skipIf(bp_column_generation.pulp is None, "PuLP is not installed")
+    def test_lp_bound(self):
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        bp_oc = BPCutter(stock,demand,3.0,time_limit=10.0)
+        bp_oc.cut()
+        self.assertEqual(bp_oc.result.lower_bound,3476.0)
+        self.assertLess(bp_oc.result.optimality_gap,0.02)
+
+    def test_parallel(self):
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        bp_serial = BPCutter(stock,demand,3.0)
+        bp_serial.cut()
+        bp_oc = BPCutter(stock,demand,3.0)
+        bp_oc.cut(parallel=True,workers=2)
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{}")
+        self.assertLessEqual(bp_oc.result.total_waste,bp_serial.result.total_waste)
+        self.assertEqual(bp_oc.result.lower_bound,bp_serial.result.lower_bound)
+
+        bp_oc = BPCutter(BPDataStockPieces({1000:10}),BPDataStockPieces({600:3}))
+        bp_oc.cut(parallel=True)
+        self.assertEqual(bp_oc.result.total_waste,1200.0)
+        self.assertEqual(bp_oc.result.optimality_gap,0.0)
+        # The methods still running when a final result is received are stopped
+        self.assertEqual(multiprocessing.active_children(),[])
+        bp_oc = BPCutter(BPDataStockPieces({6000:500}),BPDataStockPieces({2950:150,1950:150,1450:200,950:250,550:300}),3.0)
+        bp_oc.cut(parallel=True,workers=2,waste_target=math.inf)
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{}")
+        self.assertEqual(multiprocessing.active_children(),[])
+
+    def test_multistart(self):
+        stock = BPDataStockPieces({4800:40,3000:60})
+        demand = BPDataStockPieces({2550:7,1900:12,1450:9,1150:22,700:15,350:30})
+        cut_width = 3.0
+        bp_opt = BPCutter(stock,demand,cut_width)
+        bp_opt.cut()
+        bp_oc = BPCutter(stock,demand,cut_width,BPCutter.METHOD.MULTISTART,restarts=4,seed=10)
+        for step in bp_oc.cut_iter():
+            pass
+        self.assertTrue(bp_oc.result.method.startswith("Multistart"))
+        self.assertEqual(len(bp_oc.statistics),10)
+        self.assertEqual([(x["method"],x["seed"]) for x in bp_oc.statistics[:4]],[("GREEDY",None),("EXPERIMENTAL",None),("GREEDY",10),("EXPERIMENTAL",10)])
+        self.assertEqual(bp_oc.result.total_waste,min(x["total_waste"] for x in bp_oc.statistics if x["remaining_demand"] == 0))
+        self.assertLessEqual(bp_oc.result.total_waste,bp_opt.result.total_waste)
+
+        # The same seeds give the same result, also in parallel
+        bp_parallel = BPCutter(stock,demand,cut_width,BPCutter.METHOD.MULTISTART,restarts=4,seed=10)
+        bp_parallel.cut(parallel=True,workers=2)
+        self.assertEqual(str(bp_parallel.result),str(bp_oc.result))
+        self.assertEqual(bp_parallel.statistics,bp_oc.statistics)
+        self.assertEqual(multiprocessing.active_children(),[])
+
+        bp_seeded = BPCutter(stock,demand,cut_width,BPCutter.METHOD.GREEDY)
+        bp_seeded.cut(seed=11)
+        self.assertEqual(bp_seeded.result.method,"Greedy Cut (seed 11)")
+        self.assertEqual(bp_seeded.result.total_waste,bp_oc.statistics[4]["total_waste"])
+        # Methods without a randomized variant ignore the seed
+        bp_seeded = BPCutter(stock,demand,cut_width,BPCutter.METHOD.BFD)
+        bp_seeded.cut(seed=5)
+        self.assertEqual(bp_seeded.result.method,"Best Fit Decreasing")
+
+    def test_bfd(self):
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        bp_oc = BPCutter(stock,demand,3.0,BPCutter.METHOD.BFD)
+        for step in bp_oc.cut_iter():
+            pass
+        self.assertEqual(bp_oc.result.method,"Best Fit Decreasing")
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{}")
+        self.assertEqual(str(bp_oc.result.used_stock),"{3600.0: 25}")
+        self.assertEqual(bp_oc.result.total_waste,12950.0)
+        self.assertTrue(all(item["cut_stock"].is_valid for item in bp_oc.result.cut_stock_list))
+
+        stock = BPDataStockPieces([500,1000,2000])
+        demand = BPDataStockPieces([1000,2000,3000])
+        bp_oc = BPCutter(stock,demand,method=BPCutter.METHOD.BFD)
+        bp_oc.cut()
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{3000.0: 1}")
+        self.assertEqual(str(bp_oc.result.remaining_stock),"{500.0: 1}")
+
+    def test_presolve(self):
+        # Exact matches, exact pairs and pieces longer than all stock are presolved
+        stock = BPDataStockPieces({1000:3,800:2})
+        demand = BPDataStockPieces({1200:1,1000:1,800:1,500:1,495:1})
+        bp_oc = BPCutter(stock,demand,5.0)
+        methods = set(step[1] for step in bp_oc.cut_iter())
+        self.assertEqual(methods,set())
+        self.assertEqual(bp_oc.result.method,"Presolve")
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{1200.0: 1}")
+        self.assertEqual(bp_oc.result.total_waste,5.0)
+        self.assertEqual(len(bp_oc.result.cut_stock_list),3)
+
+        # The methods cut the rest, and get the same or a better result than without presolve
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({7000:2,4200:3,3600:2,3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        for method in BPCutter.METHOD:
+            if method == BPCutter.METHOD.EXACT and bp_column_generation.pulp is None:
+                continue
+            bp_oc = BPCutter(stock,demand,3.0,method,time_limit=0.2)
+            bp_oc.cut()
+            bp_nopre = BPCutter(stock,demand,3.0,method,time_limit=0.2,presolve=False)
+            bp_nopre.cut()
+            self.assertEqual(str(bp_oc.result.remaining_demand),"{7000.0: 2}",method)
+            self.assertEqual(str(bp_nopre.result.remaining_demand),"{7000.0: 2}",method)
+            self.assertTrue(all(item["cut_stock"].is_valid for item in bp_oc.result.cut_stock_list))
+            self.assertLessEqual(len(bp_oc.result.used_stock),len(bp_nopre.result.used_stock),method)
+
+    def test_resolve(self):
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        bp_oc = BPCutter(stock,demand,3.0,length_unit="MILLIMETERS",original_length_unit="MILLIMETERS",precision=1,tick=True)
+        bp_oc.cut()
+        previous_result = bp_oc.result
+        new_demand = BPDataStockPieces({3300:4,2400:6,1800:9,1200:14,950:11,600:8,500:2})
+        bp_oc.resolve(previous_result,new_demand)
+        self.assertEqual(bp_oc.result.method,"Greedy Cut (resolved)")
+        self.assertTrue(bp_oc.result.completed)
+        cut_pieces = BPDataStockPieces()
+        for item in bp_oc.result.cut_stock_list:
+            for i in range(item["amount"]):
+                cut_pieces += item["cut_stock"].stock_pieces
+        self.assertEqual(cut_pieces,new_demand)
+        # Stock pieces without the removed 2400 are kept
+        kept = [(cut_stock, amount) for cut_stock, amount in previous_result.raw_cut_stock_list if 24000.0 not in cut_stock.stock_pieces]
+        for cut_stock, amount in kept:
+            self.assertIn((cut_stock, amount),bp_oc.result.raw_cut_stock_list)
+
+        # An unchanged demand keeps the previous result
+        bp_oc.resolve(previous_result,demand)
+        self.assertEqual(bp_oc.result.raw_cut_stock_list,previous_result.raw_cut_stock_list)
+        self.assertEqual(bp_oc.result.total_waste,previous_result.total_waste)
+
+    def test_dp_greedy(self):
+        stock = BPDataStockPieces({1000:1})
+        demand = BPDataStockPieces({600:1,500:2})
+        bp_greedy = BPCutter(stock,demand,method=BPCutter.METHOD.GREEDY,presolve=False)
+        bp_greedy.cut()
+        self.assertEqual(str(bp_greedy.result.remaining_demand),"{500.0: 2}")
+        bp_oc = BPCutter(stock,demand,method=BPCutter.METHOD.DP_GREEDY,presolve=False)
+        bp_oc.cut()
+        self.assertEqual(bp_oc.result.method,"DP Greedy Cut")
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{600.0: 1}")
+        self.assertEqual(bp_oc.result.total_waste,0.0)
+
+        stock = BPDataStockPieces({4.2:10,3.6:50,3:10})
+        demand = BPDataStockPieces({4.2:5,3.6:2,1.2:10,0.4:5,0.6:10,0.21:5,0.5:25,0.1:13,0.9:10})
+        bp_oc = BPCutter(stock,demand,0.005,BPCutter.METHOD.DP_GREEDY,length_unit="MILLIMETERS",original_length_unit="NONE",precision=1,tick=True)
+        for step in bp_oc.cut_iter():
+            pass
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{}")
+        self.assertTrue(all(item["cut_stock"].is_valid for item in bp_oc.result.cut_stock_list))
+        self.assertLessEqual(bp_oc.result.total_waste,1750.0)
+
+        # The kerf counts as used stock, and the result is at least as good as the greedy cut
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        bp_greedy = BPCutter(stock,demand,3.0,BPCutter.METHOD.GREEDY)
+        bp_greedy.cut()
+        bp_oc = BPCutter(stock,demand,3.0,BPCutter.METHOD.DP_GREEDY)
+        bp_oc.cut()
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{}")
+        self.assertTrue(all(item["cut_stock"].is_valid for item in bp_oc.result.cut_stock_list))
+        self.assertLessEqual(bp_oc.result.total_waste,bp_greedy.result.total_waste)
+
+    def test_anytime(self):
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        cut_width = 3.0
+        bp_greedy = BPCutter(stock,demand,cut_width,BPCutter.METHOD.GREEDY)
+        bp_greedy.cut()
+        bp_oc = BPCutter(stock,demand,cut_width,BPCutter.METHOD.ANYTIME,time_limit=0.5)
+        incumbents = []
+        for step in bp_oc.cut_iter():
+            if not step[0] and step[2] != None:
+                incumbents.append(step[2].total_waste)
+        self.assertEqual(bp_oc.result.method,"Anytime Cut")
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{}")
+        self.assertEqual(incumbents[0],bp_greedy.result.total_waste)
+        self.assertEqual(incumbents,sorted(incumbents,reverse=True))
+        self.assertLessEqual(bp_oc.result.total_waste,bp_greedy.result.total_waste)
+        self.assertTrue(all(item["cut_stock"].is_valid for item in bp_oc.result.cut_stock_list))
+
+        # The local search is bounded by time, so the improvement is not guaranteed
+        result = bp_greedy.improve(bp_greedy.result,time_budget_s=0.5)
+        self.assertIn(result.method,["Greedy Cut","Greedy Cut + Local Search"])
+        self.assertEqual(str(result.remaining_demand),"{}")
+        self.assertLessEqual(result.total_waste,bp_greedy.result.total_waste)
+
+    def test_stop(self):
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        for method in BPCutter.METHOD:
+            if method == BPCutter.METHOD.EXACT and bp_column_generation.pulp is None:
+                continue
+            bp_cancel = BPCancelToken()
+            bp_cancel.cancel()
+            bp_oc = BPCutter(stock,demand,3.0,method)
+            bp_oc.cut(cancel=bp_cancel)
+            self.assertTrue(bp_oc.result.method.endswith(" (stopped)"),method)
+            self.assertGreater(bp_oc.result.remaining_demand.count(),0)
+            self.assertFalse(bp_oc.result.completed)
+        # A deadline passed stops the cut as well, also in parallel
+        for parallel in (False, True):
+            bp_oc = BPCutter(stock,demand,3.0)
+            bp_oc.cut(parallel=parallel,deadline=time.monotonic())
+            self.assertTrue(bp_oc.result.method.endswith(" (stopped)"))
+            self.assertGreater(bp_oc.result.remaining_demand.count(),0)
+        # Steps are yielded until the cut stops
+        bp_cancel = BPCancelToken()
+        bp_oc = BPCutter(stock,demand,3.0,BPCutter.METHOD.GREEDY)
+        for step in bp_oc.cut_iter(cancel=bp_cancel):
+            bp_cancel.cancel()
+        self.assertTrue(step[0])
+        self.assertTrue(bp_oc.result.method.endswith(" (stopped)"))
+        self.assertTrue(step[2].method.endswith(" (stopped)"))
+        # Closing the generator stops the cut
+        bp_oc = BPCutter(stock,demand,3.0,BPCutter.METHOD.ANYTIME,time_limit=60.0)
+        steps = bp_oc.cut_iter()
+        next(steps)
+        steps.close()
+        self.assertTrue(bp_oc.result.method.endswith(" (stopped)"))
+
+    def test_waste_target(self):
+        stock = BPDataStockPieces({4800:40,3000:60})
+        demand = BPDataStockPieces({2550:7,1900:12,1450:9,1150:22,700:15,350:30})
+        bp_oc = BPCutter(stock,demand,3.0,BPCutter.METHOD.MULTISTART,restarts=4,seed=10)
+        bp_oc.cut()
+        bp_target = BPCutter(stock,demand,3.0,BPCutter.METHOD.MULTISTART,restarts=4,seed=10)
+        bp_target.cut(waste_target=math.inf)
+        self.assertEqual(len(bp_target.statistics),1)
+        self.assertEqual(str(bp_target.result.remaining_demand),"{}")
+        self.assertFalse(bp_target.result.method.endswith(" (stopped)"))
+        self.assertGreaterEqual(bp_target.result.total_waste,bp_oc.result.total_waste)
+
+    def test_cut_many(self):
+        problems = [
+            (BPDataStockPieces({6000:50,4200:50,3600:50}),BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8}),3.0),
+            (BPDataStockPieces({4200:10}),BPDataStockPieces({2000:4}),0.0),
+            (BPDataStockPieces({3600:10}),BPDataStockPieces({1800:4,1200:3}),3.0),
+            (BPDataStockPieces({4200:10}),BPDataStockPieces([2000,2000,2000,2000]),0),
+        ]
+        expected = []
+        for stock, demand, cut_width in problems:
+            bp_oc = BPCutter(stock,demand,float(cut_width),BPCutter.METHOD.BFD)
+            bp_oc.cut()
+            expected.append(str(bp_oc.result))
+        for workers in (1, 2):
+            results = list(BPCutter.cut_many(problems,workers=workers,method=BPCutter.METHOD.BFD))
+            self.assertEqual([str(result) for result in results],expected)
+            # Identical problems are cut once
+            self.assertIs(results[1],results[3])
+        self.assertEqual(list(BPCutter.cut_many([])),[])
+        # Closing the generator early stops the processes
+        results = BPCutter.cut_many(problems*4,workers=2)
+        next(results)
+        results.close()
+        self.assertEqual(multiprocessing.active_children(),[])
+
+    def test_knapsack(self):
+        value, counts, optimal = bp_column_generation.knapsack(3600.0,[1203.0,1803.0,603.0],[1200.0,1800.0,600.0],[2,1,3])
+        self.assertEqual((value,counts,optimal),(3000.0,[1,1,0],True))
+        # The search depth is the number of items, which must not be limited by recursion
+        value, counts, optimal = bp_column_generation.knapsack(6e6,[6000.0+i for i in range(1500)],[1.0]*1500,[1]*1500,node_limit=20000)
+        self.assertGreater(value,0.0)
+        self.assertFalse(optimal)
+
+    @unittest.skipIf(bp_column_generation.pulp is None, "PuLP is not installed")
+    def test_exact(self):
+        stock = BPDataStockPieces({6000:50,4200:50,3600:50})
+        demand = BPDataStockPieces({3300:4,2400:7,1800:9,1200:13,950:11,600:8})
+        cut_width = 3.0
+        bp_greedy = BPCutter(stock,demand,cut_width,BPCutter.METHOD.GREEDY)
+        bp_greedy.cut()
+        bp_exact = BPCutter(stock,demand,cut_width,BPCutter.METHOD.EXACT,time_limit=30.0)
+        for step in bp_exact.cut_iter():
+            pass
+        self.assertEqual(str(bp_exact.result.remaining_demand),"{}")
+        self.assertEqual(bp_exact.result.method,"Exact Cut")
+        self.assertLess(bp_exact.result.total_waste,bp_greedy.result.total_waste)
+        self.assertTrue(all(item["cut_stock"].is_valid for item in bp_exact.result.cut_stock_list))
+
+        # A time limit below one second is kept, and the incumbent is returned once it has passed
+        bp_exact = BPCutter(stock,demand,cut_width,BPCutter.METHOD.EXACT,time_limit=0.05)
+        start = time.monotonic()
+        bp_exact.cut()
+        self.assertLess(time.monotonic() - start,0.5)
+        self.assertEqual(str(bp_exact.result.remaining_demand),"{}")
+        self.assertLessEqual(bp_exact.result.total_waste,bp_greedy.result.total_waste)
+
+    @unittest.skipIf(bp_column_generation.pulp is None, "PuLP is not installed")
+    def test_exact_remaining(self):
+        stock = BPDataStockPieces([500,1000,2000])
+        demand = BPDataStockPieces([1000,2000,3000])
+        bp_oc = BPCutter(stock,demand,method=BPCutter.METHOD.EXACT)
+        bp_oc.cut()
+        self.assertEqual(str(bp_oc.result.remaining_demand),"{3000.0: 1}")
+        self.assertEqual(str(bp_oc.result.remaining_stock),"{500.0: 1}")
 
 
 if __name__ == "__main__":
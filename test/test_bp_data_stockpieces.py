@@ -80,6 +80,49 @@ class TestBPDataStockPieces(unittest.TestCase):
 
         self.assertIsNot(bp_data_stock_pieces_a,bp_data_stock_pieces_b)
 
+    def test_from(self):
+
+        bp_data_stock_pieces_a = BPDataStockPieces.from_counts([3600.0,4200.0],[2,4])
+        s1 = str(bp_data_stock_pieces_a)
+        self.assertEqual(s1,"{4200.0: 4, 3600.0: 2}")
+
+        bp_data_stock_pieces_b = BPDataStockPieces.from_iterable(iter([3600.0,4200.0,3600.0,4200.0,4200.0,4200.0]))
+        s2 = str(bp_data_stock_pieces_b)
+        self.assertEqual(s2,"{4200.0: 4, 3600.0: 2}")
+
+        bp_data_stock_pieces_c = BPDataStockPieces.from_sorted_pairs([(4200.0,4),(3600.0,2)])
+        bp_data_stock_pieces_d = BPDataStockPieces.from_sorted_pairs([(3600.0,2),(4200.0,4)],reverse=False)
+        bp_data_stock_pieces_d.append(1200.0)
+        s3 = str(bp_data_stock_pieces_c)
+        s4 = str(bp_data_stock_pieces_d)
+        self.assertEqual(s3,"{4200.0: 4, 3600.0: 2}")
+        self.assertEqual(s4,"{4200.0: 4, 3600.0: 2, 1200.0: 1}")
+        self.assertEqual(hash(bp_data_stock_pieces_a),hash(bp_data_stock_pieces_c))
+
+    def test_copy_on_write(self):
+
+        bp_data_stock_pieces_a = BPDataStockPieces({2400.0:2,4200.0:8}).freeze()
+        bp_data_stock_pieces_b = bp_data_stock_pieces_a.copy()
+        bp_data_stock_pieces_c = bp_data_stock_pieces_b.copy()
+        bp_data_stock_pieces_b -= BPDataStockPieces({4200.0:1})
+        bp_data_stock_pieces_c.append(1200.0)
+        self.assertEqual(str(bp_data_stock_pieces_a),"{4200.0: 8, 2400.0: 2}")
+        self.assertEqual(str(bp_data_stock_pieces_b),"{4200.0: 7, 2400.0: 2}")
+        self.assertEqual(str(bp_data_stock_pieces_c),"{4200.0: 8, 2400.0: 2, 1200.0: 1}")
+        self.assertTrue(bp_data_stock_pieces_a.frozen)
+        self.assertFalse(bp_data_stock_pieces_b.frozen)
+        self.assertEqual(hash(bp_data_stock_pieces_a),hash(BPDataStockPieces({2400.0:2,4200.0:8})))
+
+        with self.assertRaises(AssertionError) as e:
+            bp_data_stock_pieces_a[4200.0] = 1
+        self.assertEqual(str(e.exception),"This instance of BPDataStockPieces is frozen and can not be modified")
+
+        frozen_hash = hash(bp_data_stock_pieces_a)
+        with self.assertRaises(AssertionError):
+            bp_data_stock_pieces_a.sort(False)
+        self.assertEqual(hash(bp_data_stock_pieces_a),frozen_hash)
+        self.assertEqual(str(bp_data_stock_pieces_a),"{4200.0: 8, 2400.0: 2}")
+
     def test_clean(self):
         
         bp_data_stock_pieces_a = BPDataStockPieces([{2400.0:2},{4200.0:8}])
@@ -168,12 +211,47 @@ class TestBPDataStockPieces(unittest.TestCase):
         self.assertNotEqual(i2,i3)
         self.assertIsInstance(i1,int)
 
+    def test_lookup(self):
+
+        bp_data_stock_pieces = BPDataStockPieces({3600:2,4200:4})
+        bp_data_stock_pieces[4200.0] = 0
+        self.assertEqual(bp_data_stock_pieces[3600.0],2)
+        self.assertNotIn(4200.0,bp_data_stock_pieces)
+        self.assertIn(3600.0,bp_data_stock_pieces)
+        with self.assertRaises(KeyError):
+            bp_data_stock_pieces[1200.0]
+
+        bp_data_stock_pieces.sort(reverse=False)
+        s1 = str(bp_data_stock_pieces)
+        self.assertEqual(s1,"{3600.0: 2, 4200.0: 0}")
+        bp_data_stock_pieces[1200.0] = 1
+        bp_data_stock_pieces[5400.0] = 1
+        s2 = str(bp_data_stock_pieces)
+        self.assertEqual(s2,"{5400.0: 1, 4200.0: 0, 3600.0: 2, 1200.0: 1}")
+        self.assertEqual(bp_data_stock_pieces.max_length(),5400.0)
+        self.assertEqual(bp_data_stock_pieces.min_length(),1200.0)
+
     def test_len(self):
 
         bp_data_stock_pieces = BPDataStockPieces({3600:2,4200:4})
         i1 = len(bp_data_stock_pieces)
         self.assertEqual(i1,6)
 
+    def test_aggregates(self):
+
+        bp_data_stock_pieces = BPDataStockPieces({3600:2,4200:4,1200:0})
+        self.assertEqual(bp_data_stock_pieces.count(),6)
+        self.assertEqual(bp_data_stock_pieces.total_length(),24000.0)
+        self.assertEqual(bp_data_stock_pieces.weighted_sum(lambda length: length + 5.0),24030.0)
+        self.assertEqual(list(bp_data_stock_pieces.iter_runs()),[(4200.0,4),(3600.0,2)])
+        self.assertEqual(bp_data_stock_pieces.min_length(),3600.0)
+        bp_data_stock_pieces[4200.0] = 0
+        self.assertEqual(bp_data_stock_pieces.max_length(),3600.0)
+        bp_data_stock_pieces -= BPDataStockPieces({3600:1})
+        self.assertEqual(bp_data_stock_pieces.count(),1)
+        self.assertEqual(len(bp_data_stock_pieces.clean()),1)
+        self.assertEqual(BPDataStockPieces().max_length(),0.0)
+
     def test_min_max(self):
 
         bp_data_stock_pieces = BPDataStockPieces({3600:2,4200:4})
@@ -0,0 +1,136 @@
+import sys
+import unittest
+from pathlib import Path
+
+PROJECT_DIR = Path(str(Path(__file__).parents[1])+"/buildplanner")
+sys.path.append(str(PROJECT_DIR))
+
+import bp_debug # Import to activate type check as first bp import
+
+from bp import BPDataStockPieces, BPDataStockPiecesArray, BPCutter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestBPDataStockPiecesArray(unittest.TestCase):
+
+    def test_init(self):
+
+        bp_data_stock_pieces = BPDataStockPiecesArray(1000)
+        s1 = str(bp_data_stock_pieces)
+        self.assertEqual(s1,"{1000.0: 1}")
+
+        bp_data_stock_pieces = BPDataStockPiecesArray({3600:2,4200:5})
+        s2 = str(bp_data_stock_pieces)
+        self.assertEqual(s2,"{4200.0: 5, 3600.0: 2}")
+
+        bp_data_stock_pieces = BPDataStockPiecesArray([3600,4200,3600,3600.0,3600,4200,1200.0,1200,0.0,0])
+        s3 = str(bp_data_stock_pieces)
+        self.assertEqual(s3,"{4200.0: 2, 3600.0: 4, 1200.0: 2, 0.0: 2}")
+
+        bp_data_stock_pieces = BPDataStockPiecesArray(BPDataStockPieces({3600:2,4200:5}))
+        s4 = str(bp_data_stock_pieces)
+        self.assertEqual(s4,"{4200.0: 5, 3600.0: 2}")
+
+        with self.assertRaises(Exception) as e:
+            bp_data_stock_pieces = BPDataStockPiecesArray("Text")
+        self.assertEqual(str(e.exception),"Parameter 'stock_pieces' must be either a dict[float,int], a list[float], an int, or a float.")
+
+    def test_from(self):
+
+        bp_data_stock_pieces_a = BPDataStockPiecesArray.from_counts([3600.0,4200.0],[2,4])
+        bp_data_stock_pieces_b = BPDataStockPiecesArray.from_iterable([3600.0,4200.0,3600.0,4200.0,4200.0,4200.0])
+        bp_data_stock_pieces_c = BPDataStockPiecesArray.from_sorted_pairs([(4200.0,4),(3600.0,2)])
+        self.assertEqual(str(bp_data_stock_pieces_a),"{4200.0: 4, 3600.0: 2}")
+        self.assertEqual(str(bp_data_stock_pieces_b),"{4200.0: 4, 3600.0: 2}")
+        self.assertEqual(str(bp_data_stock_pieces_c),"{4200.0: 4, 3600.0: 2}")
+        # The trusted constructors do not run the validating constructor
+        init = BPDataStockPiecesArray.__init__
+        def failing_init(self, stock_pieces={}):
+            raise AssertionError("__init__ called")
+        BPDataStockPiecesArray.__init__ = failing_init
+        try:
+            bp_data_stock_pieces_d = BPDataStockPiecesArray.from_counts([3600.0,4200.0],[2,4])
+            bp_data_stock_pieces_d = bp_data_stock_pieces_d - BPDataStockPiecesArray.from_sorted_pairs([(3600.0,1)])
+        finally:
+            BPDataStockPiecesArray.__init__ = init
+        self.assertEqual(str(bp_data_stock_pieces_d),"{4200.0: 4, 3600.0: 1}")
+
+    def test_modify(self):
+
+        bp_data_stock_pieces_a = BPDataStockPiecesArray({2400.0:2,4200.0:8})
+        bp_data_stock_pieces_b = bp_data_stock_pieces_a.copy()
+        bp_data_stock_pieces_a[4200.0] = 2
+        bp_data_stock_pieces_a.append(3600.0)
+        s1 = str(bp_data_stock_pieces_a)
+        s2 = str(bp_data_stock_pieces_b)
+        self.assertEqual(s1,"{4200.0: 2, 3600.0: 1, 2400.0: 2}")
+        self.assertEqual(s2,"{4200.0: 8, 2400.0: 2}")
+        self.assertEqual(bp_data_stock_pieces_a[3600.0],1)
+        with self.assertRaises(KeyError):
+            bp_data_stock_pieces_a[1200.0]
+
+    def test_clean(self):
+
+        bp_data_stock_pieces = BPDataStockPiecesArray({2400.0:2,4200.0:0,600.0:5})
+        bp_data_stock_pieces.clean(1000.0)
+        s1 = str(bp_data_stock_pieces)
+        self.assertEqual(s1,"{2400.0: 2}")
+
+    def test_add(self):
+
+        bp_data_stock_pieces_a = BPDataStockPiecesArray({3600:2,4200:4})
+        bp_data_stock_pieces_b = BPDataStockPiecesArray({3600:1,4200:2,1200:2})
+
+        bp_data_stock_pieces_c = bp_data_stock_pieces_a + bp_data_stock_pieces_b
+        s1 = str(bp_data_stock_pieces_c)
+        self.assertEqual(s1,"{4200.0: 6, 3600.0: 3, 1200.0: 2}")
+
+        bp_data_stock_pieces_a += BPDataStockPieces({3600:1,4200:2,1200:2})
+        s2 = str(bp_data_stock_pieces_a)
+        self.assertEqual(s2,"{4200.0: 6, 3600.0: 3, 1200.0: 2}")
+
+    def test_sub(self):
+
+        bp_data_stock_pieces_a = BPDataStockPiecesArray({3600:2,4200:4})
+        bp_data_stock_pieces_b = BPDataStockPiecesArray({3600:1,4200:2,1200:2})
+
+        bp_data_stock_pieces_c = bp_data_stock_pieces_a - bp_data_stock_pieces_b
+        s1 = str(bp_data_stock_pieces_c)
+        self.assertEqual(s1,"{4200.0: 2, 3600.0: 1}")
+
+        bp_data_stock_pieces_a -= bp_data_stock_pieces_b
+        bp_data_stock_pieces_a -= BPDataStockPiecesArray({4200.0:10,1000.0:2,5000.0:1})
+        s2 = str(bp_data_stock_pieces_a)
+        self.assertEqual(s2,"{4200.0: 0, 3600.0: 1}")
+
+    def test_aggregates(self):
+
+        bp_data_stock_pieces = BPDataStockPiecesArray({3600:2,4200:4})
+        self.assertEqual(len(bp_data_stock_pieces),6)
+        self.assertEqual(bp_data_stock_pieces.max_length(),4200.0)
+        self.assertEqual(bp_data_stock_pieces.min_length(),3600.0)
+        self.assertEqual(list(bp_data_stock_pieces),[4200.0,4200.0,4200.0,4200.0,3600.0,3600.0])
+        self.assertEqual(hash(bp_data_stock_pieces),hash(BPDataStockPieces({3600:2,4200:4})))
+        self.assertEqual(bp_data_stock_pieces,BPDataStockPieces({3600:2,4200:4}))
+        with self.assertRaises(ValueError):
+            bp_data_stock_pieces.counts[0] = 1
+
+    def test_cutter(self):
+        stock = {6000.0:50,4200.0:50,3600.0:50}
+        demand = {3300.0:4,2400.0:7,1800.0:9,1200.0:13,950.0:11,600.0:8}
+        self.assertEqual(str(BPDataStockPiecesArray(demand).to_stock_pieces()),str(BPDataStockPieces(demand)))
+        self.assertEqual(str(BPDataStockPiecesArray([1200.04,1199.96,600.0]).quantized(10.0)),"{12000.0: 2, 6000.0: 1}")
+        # The cutter takes the columnar stock pieces, also quantized into ticks
+        for tick in (False, True):
+            bp_oc = BPCutter(BPDataStockPieces(stock),BPDataStockPieces(demand),3.0,length_unit="MILLIMETERS",original_length_unit="MILLIMETERS",precision=1,tick=tick)
+            bp_oc.cut()
+            bp_array = BPCutter(BPDataStockPiecesArray(stock),BPDataStockPiecesArray(demand),3.0,length_unit="MILLIMETERS",original_length_unit="MILLIMETERS",precision=1,tick=tick)
+            bp_array.cut()
+            self.assertEqual(str(bp_array.result),str(bp_oc.result))
+
+if __name__ == '__main__':
+    unittest.main()
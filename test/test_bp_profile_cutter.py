@@ -0,0 +1,104 @@
+import sys
+import multiprocessing
+import unittest
+from pathlib import Path
+
+PROJECT_DIR = Path(str(Path(__file__).parents[1])+"/buildplanner")
+sys.path.append(str(PROJECT_DIR))
+
+import bp_debug # Import to activate type check as first bp import
+
+from bp import *
+
+class TestBPProfileCutter(unittest.TestCase):
+
+    def test_init(self):
+        bp_pc = BPProfileCutter({},{})
+        self.assertEqual(str(type(bp_pc)),"<class 'bp.bp_profile_cutter.BPProfileCutter'>")
+        self.assertEqual(bp_pc.results,{})
+        self.assertIsInstance(bp_pc.to_html(),str)
+
+    def test_profiles(self):
+        stud = (95.0,45.0)
+        deck = (145.0,22.0)
+        stock = {stud: BPDataStockPieces({3600:10}), deck: BPDataStockPieces({4200:10})}
+        demand = {stud: BPDataStockPieces({1800:4,1200:3}), deck: BPDataStockPieces({2100:4,4000:1}), (45.0,45.0): BPDataStockPieces({900:2})}
+        for parallel in (False, True):
+            bp_pc = BPProfileCutter(stock,demand,length_unit="MILLIMETERS",original_length_unit="MILLIMETERS")
+            bp_pc.cut(parallel=parallel)
+            results = bp_pc.results
+            self.assertEqual(list(results.keys()),[stud,deck,(45.0,45.0)])
+            self.assertEqual(str(results[stud].used_stock),"{3600.0: 3}")
+            self.assertEqual(str(results[deck].used_stock),"{4200.0: 3}")
+            self.assertEqual(str(results[(45.0,45.0)].remaining_demand),"{900.0: 2}")
+            self.assertFalse(bp_pc.completed)
+            html = bp_pc.to_html()
+            self.assertIn("95.0mm x 45.0mm",html)
+            self.assertIn("145.0mm x 22.0mm",html)
+
+    def test_cut_iter(self):
+        stock = {(95.0,45.0): BPDataStockPieces({3600:10}), (145.0,22.0): BPDataStockPieces({4200:10})}
+        demand = {(95.0,45.0): BPDataStockPieces({1800:4,1200:3}), (145.0,22.0): BPDataStockPieces({2000:4})}
+        for parallel in (False, True):
+            bp_pc = BPProfileCutter(stock,demand,method=BPCutter.METHOD.BFD)
+            steps = list(bp_pc.cut_iter(parallel=parallel))
+            self.assertTrue(steps[-1][0])
+            self.assertTrue(all(not step[0] for step in steps[:-1]))
+            self.assertTrue(bp_pc.completed)
+            self.assertEqual(bp_pc.results[(145.0,22.0)].method,"Best Fit Decreasing")
+
+    def test_cancel(self):
+        stock = {(95.0,45.0): BPDataStockPieces({3600:10}), (145.0,22.0): BPDataStockPieces({4200:10})}
+        demand = {(95.0,45.0): BPDataStockPieces({1800:4,1200:3}), (145.0,22.0): BPDataStockPieces({2000:4})}
+        bp_cancel = BPCancelToken()
+        bp_pc = BPProfileCutter(stock,demand)
+        for step in bp_pc.cut_iter(parallel=False,cancel=bp_cancel):
+            bp_cancel.cancel()
+        self.assertTrue(step[0])
+        self.assertFalse(bp_pc.completed)
+        self.assertTrue(all(result.method.endswith(" (stopped)") for result in bp_pc.results.values()))
+        # Profiles not cut in the processes when cancelled are stopped at once
+        bp_pc = BPProfileCutter(stock,demand)
+        bp_pc.cut(parallel=True,cancel=bp_cancel)
+        self.assertTrue(all(result.method.endswith(" (stopped)") for result in bp_pc.results.values()))
+        self.assertEqual(multiprocessing.active_children(),[])
+
+    def test_split_stock(self):
+        stud = (95.0,45.0)
+        deck = (145.0,22.0)
+        stock = BPDataStockPieces({3600:10,4200:3})
+        demand = {stud: BPDataStockPieces({1800:4,1200:3}), deck: BPDataStockPieces({2000:4})}
+        split = BPProfileCutter.split_stock(stock,demand)
+        self.assertEqual(list(split.keys()),[stud,deck])
+        self.assertEqual(str(split[stud]),"{4200.0: 2, 3600.0: 6}")
+        self.assertEqual(str(split[deck]),"{4200.0: 1, 3600.0: 4}")
+        self.assertEqual(split[stud]+split[deck],stock)
+        # A single profile gets all of the stock
+        self.assertEqual(BPProfileCutter.split_stock(stock,{stud: demand[stud]})[stud],stock)
+        # The profiles together use no more stock than available
+        bp_pc = BPProfileCutter(split,demand)
+        bp_pc.cut(parallel=False)
+        self.assertTrue(bp_pc.completed)
+        used = BPDataStockPieces()
+        for result in bp_pc.results.values():
+            used += result.used_stock
+        self.assertTrue(all(used[length] <= stock[length] for length in used.keys()))
+
+    def test_resolve(self):
+        stud = (95.0,45.0)
+        deck = (145.0,22.0)
+        stock = {stud: BPDataStockPieces({3600:10}), deck: BPDataStockPieces({4200:10})}
+        demand = {stud: BPDataStockPieces({1800:4,1200:3})}
+        bp_pc = BPProfileCutter(stock,demand)
+        bp_pc.cut(parallel=False)
+        new_demand = {stud: BPDataStockPieces({1800:4,1200:2}), deck: BPDataStockPieces({2000:4})}
+        bp_new = BPProfileCutter(stock,new_demand)
+        bp_new.resolve(bp_pc.results)
+        self.assertTrue(bp_new.completed)
+        self.assertTrue(bp_new.results[stud].method.endswith(" (resolved)"))
+        self.assertFalse(bp_new.results[deck].method.endswith(" (resolved)"))
+        self.assertEqual(str(bp_new.results[stud].used_stock),"{3600.0: 3}")
+        self.assertEqual(str(bp_new.results[deck].used_stock),"{4200.0: 2}")
+
+if __name__ == "__main__":
+    unittest.main()
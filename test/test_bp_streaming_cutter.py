@@ -0,0 +1,80 @@
+import sys
+import random
+import unittest
+from pathlib import Path
+
+PROJECT_DIR = Path(str(Path(__file__).parents[1])+"/buildplanner")
+sys.path.append(str(PROJECT_DIR))
+
+import bp_debug # Import to activate type check as first bp import
+
+from bp import *
+
+class TestBPStreamingCutter(unittest.TestCase):
+
+    def test_init(self):
+        bp_sc = BPStreamingCutter(BPDataStockPieces({3600:10}))
+        self.assertEqual(str(type(bp_sc)),"<class 'bp.bp_streaming_cutter.BPStreamingCutter'>")
+        self.assertEqual(bp_sc.open_boards,0)
+        self.assertEqual(bp_sc.flush(),[])
+
+    def test_best_fit(self):
+        bp_sc = BPStreamingCutter(BPDataStockPieces({3600:10}),3.0,max_open=2)
+        closed = bp_sc.feed(1800.0)
+        closed += bp_sc.feed([2400,1797,1200])
+        # The 1797 fills the first board, which is closed at once
+        self.assertEqual([str(cut_stock.stock_pieces) for cut_stock in closed],["{1800.0: 1, 1797.0: 1}"])
+        self.assertEqual(bp_sc.open_boards,2)
+        closed = bp_sc.feed(BPDataStockPieces([3000,600]))
+        # A third open board exceeds the limit, so the fullest open board is closed
+        self.assertEqual([str(cut_stock.stock_pieces) for cut_stock in closed],["{2400.0: 1}"])
+        self.assertEqual(bp_sc.open_boards,2)
+        closed = bp_sc.flush()
+        self.assertEqual([str(cut_stock.stock_pieces) for cut_stock in closed],["{1200.0: 1, 600.0: 1}","{3000.0: 1}"])
+        self.assertEqual(str(bp_sc.used_stock),"{3600.0: 4}")
+        self.assertEqual(bp_sc.open_boards,0)
+
+    def test_harmonic(self):
+        bp_sc = BPStreamingCutter(BPDataStockPieces({3600:10}),method=BPStreamingCutter.METHOD.HARMONIC,max_open=3)
+        closed = bp_sc.feed([2000,1500,300,1000,1900,400])
+        # Pieces longer than half the stock length get a board each, as do pairs longer than a third
+        self.assertEqual([str(cut_stock.stock_pieces) for cut_stock in closed],["{2000.0: 1}"])
+        self.assertEqual(bp_sc.open_boards,3)
+        closed = bp_sc.flush()
+        self.assertEqual(sorted(str(cut_stock.stock_pieces) for cut_stock in closed),["{1000.0: 1, 400.0: 1, 300.0: 1}","{1500.0: 1}","{1900.0: 1}"])
+        # When the longest stock runs out, the classes follow the next longest
+        bp_sc = BPStreamingCutter(BPDataStockPieces({6000:1,2000:10}),method=BPStreamingCutter.METHOD.HARMONIC,max_open=2)
+        closed = bp_sc.feed([5000,1200])
+        # Pieces longer than half of 2000 are in the class of the 6000 board, which they do not fit
+        self.assertEqual([(cut_stock.stock_length,str(cut_stock.stock_pieces)) for cut_stock in closed],[(6000.0,"{5000.0: 1}")])
+        closed = bp_sc.feed([1200])
+        self.assertEqual([(cut_stock.stock_length,str(cut_stock.stock_pieces)) for cut_stock in closed],[(2000.0,"{1200.0: 1}")])
+        self.assertEqual(bp_sc.open_boards,1)
+        self.assertEqual(str(bp_sc.used_stock),"{6000.0: 1, 2000.0: 2}")
+
+    def test_stream(self):
+        rng = random.Random(1)
+        stock = BPDataStockPieces({4200:1000,3600:1000})
+        for method in BPStreamingCutter.METHOD:
+            bp_sc = BPStreamingCutter(stock,5.0,method,max_open=4,min_length=300.0)
+            pieces = BPDataStockPieces()
+            placed = BPDataStockPieces()
+            closed = []
+            for batch in range(20):
+                lengths = [rng.choice([300,450,600,900,1200,1800,2400,5000]) for _ in range(50)]
+                for length in lengths:
+                    pieces.append(float(length))
+                closed += bp_sc.feed(lengths)
+                self.assertLessEqual(bp_sc.open_boards,4)
+            closed += bp_sc.flush()
+            for cut_stock in closed:
+                self.assertTrue(cut_stock.is_valid)
+                placed += cut_stock.stock_pieces
+            # Every piece is placed, except the pieces longer than all stock
+            self.assertEqual(str(placed + bp_sc.remaining_demand),str(pieces.sort()))
+            self.assertEqual(list(bp_sc.remaining_demand.keys()),[5000.0])
+            self.assertEqual(bp_sc.used_stock.count(),len(closed))
+            self.assertAlmostEqual(bp_sc.total_waste,bp_sc.used_stock.total_length()-placed.total_length())
+
+if __name__ == "__main__":
+    unittest.main()